@@ -1,32 +1,952 @@
 import os
+import re
+import stat
+import sqlite3
 import subprocess
-import schedule
 import time
 import json
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
+import logging.handlers
+import gzip
+import shutil
+import copy
+import shlex
+import tempfile
+import atexit
 import threading
-import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+import itertools
+import codecs
+import queue
+import heapq
+import hashlib
 import sys
 from enum import Enum
-import queue
+from collections import namedtuple, deque
+import signal
+import argparse
+import random
+import select
+import struct
+import ctypes
+import ctypes.util
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, ExitStack
 
 class CommitStatus(Enum):
     PENDING = "pending"
     IN_PROGRESS = "in_progress"
+    PUSH_PENDING = "push_pending"
     SUCCESS = "success"
     FAILED = "failed"
+    TIMED_OUT = "timed_out"
     SKIPPED = "skipped"
 
+# Entrée de git status --porcelain=v2: kind vaut '1' (modifié), '2' (renommé),
+# 'u' (conflit) ou '?' (non suivi); orig_path n'est renseigné que pour '2'
+FileChange = namedtuple('FileChange', ['kind', 'xy', 'path', 'orig_path'])
+
+# Commandes git qui rafraîchissent l'index (lecture/stat de tout l'arbre)
+INDEX_REFRESH_COMMANDS = {'status', 'add', 'commit'}
+
+# Statuts finaux d'un dépôt, accompagnés de ses mesures
+FINAL_STATUSES = {CommitStatus.PUSH_PENDING, CommitStatus.SUCCESS, CommitStatus.FAILED, CommitStatus.TIMED_OUT,
+                  CommitStatus.SKIPPED}
+
+# Statuts comptés comme des échecs
+FAILED_STATUSES = (CommitStatus.FAILED, CommitStatus.TIMED_OUT)
+
+# Les processus git ne doivent jamais attendre une saisie: pas d'invite
+# d'identifiants dans le terminal ni de fenêtre de Git Credential Manager
+GIT_NONINTERACTIVE_ENV = {"GIT_TERMINAL_PROMPT": "0", "GCM_INTERACTIVE": "never"}
+
+# Paramètre de délai maximal d'une commande git selon la phase en cours
+GIT_TIMEOUT_KEYS = {"status": "timeout_status", "add": "timeout_add", "commit": "timeout_commit",
+                    "push": "timeout_push", "pull": "timeout_push"}
+
+# Délai (secondes) laissé à git pour retirer ses verrous après SIGTERM, avant SIGKILL
+KILL_GRACE = 2.0
+
+# Octets lus en tête de fichier pour reconnaître un contenu binaire (même heuristique que git)
+BINARY_SNIFF_BYTES = 8000
+
+# Fichier écarté par les limites de taille: raison lisible et si le fichier
+# doit simplement attendre un prochain commit (budget du commit atteint)
+SkippedFile = namedtuple('SkippedFile', ['change', 'size', 'reason', 'deferred'])
+
 class StatusUpdate:
-    def __init__(self, repo_name, status, message="", timestamp=None):
+    def __init__(self, repo_name, status, message="", timestamp=None, metrics=None, progress=None):
         self.repo_name = repo_name
         self.status = status
         self.message = message
         self.timestamp = timestamp or datetime.now()
+        self.metrics = metrics
+        # Pourcentage de l'étape en cours (push, pull), None si inconnu
+        self.progress = progress
+
+class PhaseMetrics:
+    """Mesures d'une phase (status, add, commit, push) du traitement d'un dépôt"""
+    
+    def __init__(self, name):
+        self.name = name
+        self.duration = 0.0
+        self.exit_code = None
+        self.output_bytes = 0
+        self.output_lines = 0
+        self.subprocesses = 0
+    
+    def to_dict(self):
+        return {
+            "phase": self.name,
+            "duration": round(self.duration, 4),
+            "exit_code": self.exit_code,
+            "output_bytes": self.output_bytes,
+            "output_lines": self.output_lines,
+            "subprocesses": self.subprocesses
+        }
+
+class RepoMetrics:
+    """Mesures par phase du traitement d'un dépôt"""
+    
+    def __init__(self, repo_name):
+        self.repo_name = repo_name
+        self.status = None
+        self.phases = []
+        self.current_phase = None
+        self.subprocesses = 0
+        self.index_refreshes = 0
+        self.files_changed = 0
+        self.files_skipped = 0
+        self.bytes_pushed = 0
+        self.bytes_fetched = 0
+        # La dernière commande git a été arrêtée à son délai
+        self.timed_out = False
+    
+    @contextmanager
+    def phase(self, name):
+        """Chronomètre une phase; les processus git lancés y sont rattachés"""
+        phase = PhaseMetrics(name)
+        self.phases.append(phase)
+        previous, self.current_phase = self.current_phase, phase
+        start = time.perf_counter()
+        try:
+            yield phase
+        finally:
+            phase.duration = time.perf_counter() - start
+            self.current_phase = previous
+    
+    def record_process(self, command):
+        self.subprocesses += 1
+        if len(command) > 1 and command[1] in INDEX_REFRESH_COMMANDS:
+            self.index_refreshes += 1
+        if self.current_phase is not None:
+            self.current_phase.subprocesses += 1
+    
+    def record_result(self, exit_code, output_bytes, output_lines=0):
+        if self.current_phase is not None:
+            self.current_phase.exit_code = exit_code
+            self.current_phase.output_bytes += output_bytes
+            self.current_phase.output_lines += output_lines
+    
+    @property
+    def duration(self):
+        return sum(phase.duration for phase in self.phases)
+    
+    def phase_duration(self, name):
+        """Durée cumulée des phases de ce nom"""
+        return sum(phase.duration for phase in self.phases if phase.name == name)
+    
+    def to_dict(self):
+        return {
+            "repo": self.repo_name,
+            "status": self.status.value if self.status else None,
+            "duration": round(self.duration, 4),
+            "subprocesses": self.subprocesses,
+            "index_refreshes": self.index_refreshes,
+            "files_changed": self.files_changed,
+            "files_skipped": self.files_skipped,
+            "bytes_pushed": self.bytes_pushed,
+            "bytes_fetched": self.bytes_fetched,
+            "phases": [phase.to_dict() for phase in self.phases]
+        }
+
+class RunMetrics:
+    """Agrégat des mesures d'un run de commit_all_repositories"""
+    
+    def __init__(self):
+        self.started_at = datetime.now()
+        self.wall_time = 0.0
+        self.repos = []
+    
+    def phase_totals(self):
+        totals = {}
+        for repo in self.repos:
+            for phase in repo.phases:
+                total = totals.setdefault(phase.name, {"count": 0, "duration": 0.0, "subprocesses": 0})
+                total["count"] += 1
+                total["duration"] += phase.duration
+                total["subprocesses"] += phase.subprocesses
+        return totals
+    
+    def status_counts(self):
+        counts = {}
+        for repo in self.repos:
+            status = repo.status.value if repo.status else "unknown"
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+    
+    def slowest(self, count=5):
+        return sorted(self.repos, key=lambda repo: repo.duration, reverse=True)[:count]
+    
+    def to_dict(self):
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_time": round(self.wall_time, 4),
+            "summed_time": round(sum(repo.duration for repo in self.repos), 4),
+            "repositories": len(self.repos),
+            "subprocesses": sum(repo.subprocesses for repo in self.repos),
+            "bytes_pushed": sum(repo.bytes_pushed for repo in self.repos),
+            "bytes_fetched": sum(repo.bytes_fetched for repo in self.repos),
+            "statuses": self.status_counts(),
+            "phases": {name: dict(total, duration=round(total["duration"], 4))
+                       for name, total in self.phase_totals().items()}
+        }
+
+class MetricsExporter:
+    """Exporte les mesures de chaque run
+    
+    - fichier JSON lines avec rotation par taille (une ligne par dépôt et une par run)
+    - texte au format Prometheus, écrit dans un fichier et/ou servi sur 127.0.0.1
+    """
+    
+    def __init__(self, metrics_file, max_bytes, backup_count, prometheus_file=None,
+                 prometheus_port=0, logger=None):
+        self.logger = logger or logging.getLogger(__name__)
+        self.handler = None
+        if metrics_file:
+            self.handler = logging.handlers.RotatingFileHandler(
+                metrics_file, maxBytes=max_bytes, backupCount=backup_count,
+                encoding='utf-8', delay=True
+            )
+            self.handler.setFormatter(logging.Formatter('%(message)s'))
+        self.prometheus_file = prometheus_file
+        self.prometheus_text = ""
+        self.server = None
+        if prometheus_port:
+            self.start_server(prometheus_port)
+    
+    def start_server(self, port):
+        # Import différé: le serveur HTTP n'est utile que si un port est configuré
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        exporter = self
+        
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != '/metrics':
+                    self.send_error(404)
+                    return
+                body = exporter.prometheus_text.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        try:
+            self.server = ThreadingHTTPServer(('127.0.0.1', port), MetricsHandler)
+        except OSError as e:
+            self.logger.warning(f"Impossible d'ouvrir le port des métriques {port}: {e}")
+            return
+        threading.Thread(target=self.server.serve_forever, daemon=True, name="metrics-http").start()
+        self.logger.info(f"Métriques Prometheus disponibles sur http://127.0.0.1:{port}/metrics")
+    
+    def write_line(self, data):
+        self.handler.handle(logging.makeLogRecord({"msg": json.dumps(data, ensure_ascii=False)}))
+    
+    def export(self, run):
+        """Écrit les mesures d'un run terminé"""
+        if self.handler is not None:
+            started_at = run.started_at.isoformat(timespec="seconds")
+            for repo in run.repos:
+                self.write_line(dict(repo.to_dict(), type="repo", run=started_at))
+            self.write_line(dict(run.to_dict(), type="run"))
+        
+        self.prometheus_text = self.render_prometheus(run)
+        if self.prometheus_file:
+            tmp_file = self.prometheus_file + ".tmp"
+            try:
+                with open(tmp_file, 'w', encoding='utf-8') as f:
+                    f.write(self.prometheus_text)
+                os.replace(tmp_file, self.prometheus_file)
+            except OSError as e:
+                self.logger.warning(f"Impossible d'écrire les métriques Prometheus: {e}")
+    
+    def render_prometheus(self, run):
+        """Texte au format d'exposition Prometheus pour le dernier run"""
+        def label(value):
+            return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        
+        lines = []
+        def metric(name, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} gauge")
+            for labels, value in samples:
+                labels_text = ",".join(f'{key}="{label(val)}"' for key, val in labels.items())
+                lines.append(f"{name}{{{labels_text}}} {value}" if labels_text else f"{name} {value}")
+        
+        metric("autogit_last_run_timestamp_seconds", "Début du dernier run",
+               [({}, run.started_at.timestamp())])
+        metric("autogit_run_duration_seconds", "Durée réelle du dernier run", [({}, run.wall_time)])
+        metric("autogit_run_repositories", "Dépôts du dernier run par statut",
+               [({"status": status}, count) for status, count in run.status_counts().items()])
+        totals = run.phase_totals()
+        metric("autogit_phase_duration_seconds", "Durée cumulée de chaque phase",
+               [({"phase": name}, total["duration"]) for name, total in totals.items()])
+        metric("autogit_phase_subprocesses", "Processus git lancés par phase",
+               [({"phase": name}, total["subprocesses"]) for name, total in totals.items()])
+        metric("autogit_repo_duration_seconds", "Durée de traitement de chaque dépôt",
+               [({"repo": repo.repo_name}, repo.duration) for repo in run.repos])
+        metric("autogit_run_transfer_bytes", "Octets échangés avec les dépôts distants au dernier run",
+               [({"direction": "push"}, sum(repo.bytes_pushed for repo in run.repos)),
+                ({"direction": "fetch"}, sum(repo.bytes_fetched for repo in run.repos))])
+        return "\n".join(lines) + "\n"
+    
+    def close(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.handler is not None:
+            self.handler.close()
+
+
+
+def log_fields(repo, phase=None, status=None, duration=None):
+    """Champs structurés d'un message de log, à passer en extra (repris par le format JSON)"""
+    fields = {"repo": repo, "phase": phase,
+              "status": status.value if isinstance(status, CommitStatus) else status,
+              "duration": round(duration, 4) if duration is not None else None}
+    return {key: value for key, value in fields.items() if value is not None}
+
+# Champs structurés copiés dans chaque ligne JSON lorsqu'ils sont présents
+LOG_FIELDS = ("repo", "phase", "status", "duration")
+
+class JsonLogFormatter(logging.Formatter):
+    """Une ligne JSON par message: horodatage, niveau, message et champs structurés"""
+    
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        for field in LOG_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+def compress_rotated_log(source, dest):
+    """Rotateur des handlers de log: le segment archivé est compressé en gzip"""
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+def create_log_file_handler(log_file, max_bytes, backup_count, rotate_when="", compress=True):
+    """Handler du fichier de log avec rotation par taille, ou par date si rotate_when est défini"""
+    if rotate_when:
+        handler = logging.handlers.TimedRotatingFileHandler(
+            log_file, when=rotate_when, backupCount=backup_count, encoding='utf-8')
+    else:
+        handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    if compress:
+        handler.namer = lambda name: name + ".gz"
+        handler.rotator = compress_rotated_log
+    return handler
+
+class RunHistory:
+    """Historique persistant des runs et du résultat de chaque dépôt (SQLite)
+    
+    Une ligne par run et une ligne par dépôt traité; les index sur
+    (repo, started_at) et (status, started_at) gardent rapides les requêtes
+    sur une période. Chaque opération ouvre sa propre connexion, ce qui
+    permet de l'utiliser depuis les workers comme depuis l'interface.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS runs (
+            id INTEGER PRIMARY KEY,
+            started_at REAL NOT NULL,
+            wall_time REAL NOT NULL,
+            repositories INTEGER NOT NULL,
+            succeeded INTEGER NOT NULL,
+            failed INTEGER NOT NULL,
+            skipped INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS repo_runs (
+            run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+            repo TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            status TEXT,
+            duration REAL NOT NULL,
+            push_duration REAL,
+            files_changed INTEGER NOT NULL,
+            bytes_pushed INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS runs_started_at ON runs(started_at);
+        CREATE INDEX IF NOT EXISTS repo_runs_repo ON repo_runs(repo, started_at);
+        CREATE INDEX IF NOT EXISTS repo_runs_status ON repo_runs(status, started_at);
+        CREATE INDEX IF NOT EXISTS repo_runs_run ON repo_runs(run_id);
+    """
+    
+    def __init__(self, history_file):
+        self.history_file = history_file
+        with self.connect() as connection:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(self.SCHEMA)
+    
+    @contextmanager
+    def connect(self):
+        connection = sqlite3.connect(self.history_file, timeout=10)
+        try:
+            connection.execute("PRAGMA foreign_keys=ON")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+    
+    def record_run(self, run):
+        """Enregistre un run terminé et retourne son identifiant"""
+        started_at = run.started_at.timestamp()
+        counts = run.status_counts()
+        with self.connect() as connection:
+            cursor = connection.execute(
+                "INSERT INTO runs (started_at, wall_time, repositories, succeeded, failed, skipped) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (started_at, run.wall_time, len(run.repos),
+                 counts.get(CommitStatus.SUCCESS.value, 0) + counts.get(CommitStatus.PUSH_PENDING.value, 0),
+                 sum(counts.get(status.value, 0) for status in FAILED_STATUSES),
+                 counts.get(CommitStatus.SKIPPED.value, 0))
+            )
+            run_id = cursor.lastrowid
+            connection.executemany(
+                "INSERT INTO repo_runs (run_id, repo, started_at, status, duration, push_duration, "
+                "files_changed, bytes_pushed) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(run_id, repo.repo_name, started_at, repo.status.value if repo.status else None,
+                  repo.duration,
+                  repo.phase_duration("push") if any(phase.name == "push" for phase in repo.phases) else None,
+                  repo.files_changed, repo.bytes_pushed)
+                 for repo in run.repos]
+            )
+        return run_id
+    
+    def prune(self, retention_days):
+        """Supprime les runs plus anciens que retention_days jours"""
+        cutoff = time.time() - retention_days * 86400
+        with self.connect() as connection:
+            return connection.execute("DELETE FROM runs WHERE started_at < ?", (cutoff,)).rowcount
+    
+    def recent_runs(self, limit=20):
+        """Derniers runs, du plus récent au plus ancien"""
+        with self.connect() as connection:
+            rows = connection.execute(
+                "SELECT id, started_at, wall_time, repositories, succeeded, failed, skipped "
+                "FROM runs ORDER BY started_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [{"id": row[0], "started_at": datetime.fromtimestamp(row[1]), "wall_time": row[2],
+                 "repositories": row[3], "succeeded": row[4], "failed": row[5], "skipped": row[6]}
+                for row in rows]
+    
+    def failed_repositories(self, days=7):
+        """Dépôts en échec sur la période: [(dépôt, nombre d'échecs, dernier échec)]"""
+        cutoff = time.time() - days * 86400
+        with self.connect() as connection:
+            rows = connection.execute(
+                "SELECT repo, COUNT(*), MAX(started_at) FROM repo_runs "
+                "WHERE status IN (?, ?) AND started_at >= ? GROUP BY repo ORDER BY COUNT(*) DESC, repo",
+                (*(status.value for status in FAILED_STATUSES), cutoff)
+            ).fetchall()
+        return [(repo, count, datetime.fromtimestamp(last)) for repo, count, last in rows]
+    
+    def change_counts(self, days=30):
+        """Par dépôt, nombre de vérifications et de runs avec fichiers commités: {dépôt: (runs, changements)}"""
+        cutoff = time.time() - days * 86400
+        with self.connect() as connection:
+            rows = connection.execute(
+                "SELECT repo, COUNT(*), SUM(files_changed > 0) FROM repo_runs "
+                "WHERE started_at >= ? GROUP BY repo", (cutoff,)
+            ).fetchall()
+        return {repo: (runs, changes) for repo, runs, changes in rows}
+    
+    def repo_statistics(self, days=30):
+        """Statistiques par dépôt sur la période, dont les p95 de durée et de push"""
+        cutoff = time.time() - days * 86400
+        with self.connect() as connection:
+            rows = connection.execute(
+                "SELECT repo, status, duration, push_duration, files_changed, bytes_pushed "
+                "FROM repo_runs WHERE started_at >= ? ORDER BY repo", (cutoff,)
+            ).fetchall()
+        
+        stats = {}
+        for repo, status, duration, push_duration, files_changed, bytes_pushed in rows:
+            entry = stats.setdefault(repo, {"repo": repo, "runs": 0, "succeeded": 0, "failed": 0,
+                                            "durations": [], "push_durations": [],
+                                            "files_changed": 0, "bytes_pushed": 0})
+            entry["runs"] += 1
+            entry["succeeded"] += status == CommitStatus.SUCCESS.value
+            entry["failed"] += status in (CommitStatus.FAILED.value, CommitStatus.TIMED_OUT.value)
+            entry["durations"].append(duration)
+            if push_duration is not None:
+                entry["push_durations"].append(push_duration)
+            entry["files_changed"] += files_changed
+            entry["bytes_pushed"] += bytes_pushed
+        
+        for entry in stats.values():
+            durations = entry.pop("durations")
+            push_durations = entry.pop("push_durations")
+            entry["avg_duration"] = sum(durations) / len(durations)
+            entry["p95_duration"] = percentile(durations, 95)
+            entry["p95_push"] = percentile(push_durations, 95) if push_durations else None
+        return list(stats.values())
+    
+    def repo_history(self, repo, limit=50):
+        """Derniers résultats d'un dépôt"""
+        with self.connect() as connection:
+            rows = connection.execute(
+                "SELECT started_at, status, duration, push_duration, files_changed, bytes_pushed "
+                "FROM repo_runs WHERE repo = ? ORDER BY started_at DESC LIMIT ?", (repo, limit)
+            ).fetchall()
+        return [{"started_at": datetime.fromtimestamp(row[0]), "status": row[1], "duration": row[2],
+                 "push_duration": row[3], "files_changed": row[4], "bytes_pushed": row[5]}
+                for row in rows]
+
+class RunJournal:
+    """Journal d'écriture anticipée du run en cours (JSON lines)
+    
+    Le fichier est réécrit au début de chaque run avec la liste des dépôts,
+    puis chaque transition de phase d'un dépôt y est ajoutée et synchronisée
+    sur disque (fsync) avant que la phase ne commence. Un journal sans ligne
+    de fin signale un run interrompu (fermeture de l'application, arrêt de la
+    machine): la dernière phase de chaque dépôt indique ce qui reste à faire.
+    """
+    
+    # Indexation ou commit commencés: l'index peut être partiellement rempli
+    STAGING_PHASES = ("add", "commit")
+    # Commit local réalisé, push restant à faire
+    PUSH_PHASE = "committed"
+    FINAL_PHASES = ("done", "failed")
+    
+    def __init__(self, journal_file, logger=None):
+        self.journal_file = journal_file
+        self.logger = logger or logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        self.file = None
+        # Début (time.time()) du run interrompu lu par load_interrupted
+        self.interrupted_started_at = None
+    
+    def begin(self, repositories):
+        """Commence le journal d'un nouveau run"""
+        with self.lock:
+            self.close()
+            try:
+                self.file = open(self.journal_file, 'w', encoding='utf-8')
+            except OSError as e:
+                self.logger.warning(f"Journal des runs désactivé pour ce run: {e}")
+                return
+            self.write({"event": "start", "time": time.time(), "repos": list(repositories)})
+    
+    def record(self, repo_path, phase):
+        """Enregistre le passage d'un dépôt à une phase"""
+        with self.lock:
+            if self.file is not None:
+                self.write({"repo": repo_path, "phase": phase})
+    
+    def finish(self):
+        """Marque le run comme terminé"""
+        with self.lock:
+            if self.file is not None:
+                self.write({"event": "end", "time": time.time()})
+            self.close()
+    
+    def write(self, entry):
+        try:
+            self.file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.file.flush()
+            os.fsync(self.file.fileno())
+        except OSError as e:
+            self.logger.warning(f"Écriture du journal des runs impossible, journal désactivé pour ce run: {e}")
+            self.close()
+    
+    def close(self):
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+    
+    def load_interrupted(self):
+        """Dernière phase de chaque dépôt du run interrompu, ou None si le dernier run est terminé
+        
+        Le début du run interrompu est conservé dans interrupted_started_at.
+        """
+        try:
+            with open(self.journal_file, 'r', encoding='utf-8') as f:
+                lines = f.readlines()
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as e:
+            self.logger.warning(f"Journal des runs illisible: {e}")
+            return None
+        
+        phases = None
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                # Dernière ligne tronquée par l'interruption
+                break
+            if entry.get("event") == "start":
+                phases = dict.fromkeys(entry.get("repos", []), "pending")
+                self.interrupted_started_at = entry.get("time")
+            elif entry.get("event") == "end":
+                phases = None
+                self.interrupted_started_at = None
+            elif phases is not None and "repo" in entry:
+                phases[entry["repo"]] = entry.get("phase")
+        return phases
+
+# Âge minimal (secondes) d'un verrou d'index pour le considérer abandonné
+# par le run interrompu plutôt que détenu par une commande git en cours
+STALE_INDEX_LOCK_AGE = 300
+
+# Sortie conservée d'une commande git: premières et dernières lignes, celles
+# du milieu sont seulement comptées; lignes tronquées au-delà de OUTPUT_MAX_LINE
+OUTPUT_HEAD_LINES = 100
+OUTPUT_TAIL_LINES = 100
+OUTPUT_MAX_LINE = 2000
+OUTPUT_CHUNK_BYTES = 64 * 1024
+# Progression de git, précédée de "remote: " pour celle du serveur
+PROGRESS_PATTERN = re.compile(r'(?:remote: )?([A-Z][A-Za-z ]*): +(\d+)% \(')
+# Intervalle minimal (secondes) entre deux statuts de progression d'un dépôt
+PROGRESS_INTERVAL = 0.25
+
+# Dernière ligne de progression de git push: "Writing objects: 100% (3/3), 49.11 KiB | ..."
+PUSH_SIZE_PATTERN = re.compile(r'Writing objects: 100% \(\d+/\d+\), ([\d.]+) (bytes|KiB|MiB|GiB)')
+# Selon le nombre d'objets reçus, git indique la taille sur la ligne Receiving ou Unpacking
+FETCH_SIZE_PATTERN = re.compile(r'(?:Receiving|Unpacking) objects: 100% \(\d+/\d+\), ([\d.]+) (bytes|KiB|MiB|GiB)')
+SIZE_UNITS = {'bytes': 1, 'KiB': 1024, 'MiB': 1024 ** 2, 'GiB': 1024 ** 3}
+
+def parse_transfer_bytes(pattern, output):
+    matches = pattern.findall(output or "")
+    if not matches:
+        return 0
+    value, unit = matches[-1]
+    return int(float(value) * SIZE_UNITS[unit])
+
+def parse_pushed_bytes(output):
+    """Octets envoyés d'après la sortie de git push --progress (0 si rien n'a été envoyé)"""
+    return parse_transfer_bytes(PUSH_SIZE_PATTERN, output)
+
+def parse_fetched_bytes(output):
+    """Octets reçus d'après la sortie de git fetch/pull --progress"""
+    return parse_transfer_bytes(FETCH_SIZE_PATTERN, output)
+
+def is_non_fast_forward(output):
+    """Indique si un push a été refusé parce que la branche distante a avancé"""
+    output = output or ""
+    return "[rejected]" in output and ("non-fast-forward" in output or "fetch first" in output)
 
+# Erreurs de push qu'une nouvelle tentative reproduirait à l'identique
+PERMANENT_PUSH_ERRORS = (
+    "No configured push destination",
+    "has no upstream branch",
+    "does not appear to be a git repository",
+    "Repository not found",
+    "Permission denied",
+    "Authentication failed",
+    "could not read Username",
+    "does not match any"
+)
 
+def is_permanent_push_error(output):
+    """Indique si un push a échoué pour une raison de configuration ou d'accès, sans espoir de réessai"""
+    output = output or ""
+    return any(marker in output for marker in PERMANENT_PUSH_ERRORS)
+
+# Clés de configuration git qui déterminent la destination du push et sa commande ssh
+REMOTE_CONFIG_PATTERN = (r'^(core\.sshcommand|remote\.pushdefault|remote\..*\.(url|pushurl)'
+                         r'|branch\..*\.(remote|pushremote)|url\..*\.(insteadof|pushinsteadof))$')
+
+def read_head_branch(repo_path):
+    """Branche courante lue dans HEAD, sans lancer git (None si HEAD est détaché)"""
+    git_dir = os.path.join(repo_path, '.git')
+    try:
+        if os.path.isfile(git_dir):
+            # Worktree ou sous-module: .git contient "gitdir: <chemin>"
+            with open(git_dir, 'r', encoding='utf-8') as f:
+                git_dir = os.path.join(repo_path, f.read().strip()[len('gitdir:'):].strip())
+        with open(os.path.join(git_dir, 'HEAD'), 'r', encoding='utf-8') as f:
+            head = f.read().strip()
+    except (OSError, UnicodeDecodeError):
+        return None
+    if head.startswith('ref: refs/heads/'):
+        return head[len('ref: refs/heads/'):]
+    return None
+
+def parse_remote_config(output, branch):
+    """(URL de push, core.sshCommand) d'après git config -z --get-regexp REMOTE_CONFIG_PATTERN
+    
+    Reprend la résolution de git push: remote de push de la branche, sinon
+    remote.pushDefault, sinon remote suivi, sinon origin; pushurl avant url,
+    puis réécritures pushInsteadOf/insteadOf par le plus long préfixe.
+    """
+    values = {}
+    rewrites = {}
+    for entry in output.split('\0'):
+        key, _, value = entry.partition('\n')
+        if not key:
+            continue
+        # git met en minuscules la section et le nom de la clé, pas la sous-section
+        section, _, rest = key.partition('.')
+        subsection, _, name = rest.rpartition('.')
+        if section == 'url' and name in ('insteadof', 'pushinsteadof'):
+            rewrites.setdefault(name, []).append((value, subsection))
+        else:
+            values.setdefault((section, subsection, name), value)
+    
+    remote = (values.get(('branch', branch, 'pushremote')) or values.get(('remote', '', 'pushdefault'))
+              or values.get(('branch', branch, 'remote')) or 'origin')
+    url = values.get(('remote', remote, 'pushurl'))
+    if url is None:
+        url = values.get(('remote', remote, 'url'))
+        for name in ('pushinsteadof', 'insteadof'):
+            matches = [(prefix, base) for prefix, base in rewrites.get(name, []) if url and url.startswith(prefix)]
+            if matches:
+                prefix, base = max(matches, key=lambda match: len(match[0]))
+                url = base + url[len(prefix):]
+                break
+    if url is None:
+        # Sans remote configuré, branch.<nom>.remote peut être directement une URL ou un chemin
+        url = remote if remote != 'origin' else ""
+    return url, values.get(('core', '', 'sshcommand'))
+
+def get_url_host(url, repo_path=None):
+    """Hôte d'une URL de dépôt distant ("local" pour un chemin)
+    
+    Un chemin relatif est résolu depuis repo_path, comme le fait git.
+    """
+    if "://" in url:
+        return urlparse(url).hostname or "local"
+    if ":" in url and not os.path.exists(os.path.join(repo_path or "", url)):
+        # Syntaxe scp: git@github.com:user/repo.git
+        return url.split(":", 1)[0].split("@")[-1]
+    return "local"
+
+def is_ssh_url(url, repo_path=None):
+    if "://" in url:
+        return urlparse(url).scheme in ("ssh", "git+ssh", "ssh+git")
+    return get_url_host(url, repo_path) != "local"
+
+def is_binary_file(path):
+    """Un fichier est binaire s'il contient un octet nul dans ses premiers octets"""
+    try:
+        with open(path, 'rb') as f:
+            return b'\0' in f.read(BINARY_SNIFF_BYTES)
+    except OSError:
+        return False
+
+def skipped_note(metrics):
+    """Complément du message de statut quand des fichiers ont été écartés par apply_size_limits"""
+    if metrics is None or not metrics.files_skipped:
+        return ""
+    return f" ({metrics.files_skipped} fichier(s) écarté(s) par les limites de taille)"
+
+def popen_session_args():
+    """Arguments de Popen qui placent le processus dans son propre groupe de processus"""
+    if os.name == 'nt':
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+    return {"start_new_session": True}
+
+def signal_process_group(process, sig):
+    try:
+        os.killpg(process.pid, sig)
+    except OSError:
+        pass
+
+def kill_process_trees(processes, grace=KILL_GRACE):
+    """Arrête des processus lancés par popen_session_args et tous leurs enfants (ssh, helpers, hooks)
+    
+    SIGTERM d'abord, pour que git retire ses fichiers de verrou, puis SIGKILL
+    du groupe après grace secondes.
+    """
+    if os.name == 'nt':
+        for process in processes:
+            try:
+                subprocess.run(['taskkill', '/F', '/T', '/PID', str(process.pid)], capture_output=True, timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+        return
+    for process in processes:
+        signal_process_group(process, signal.SIGTERM)
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline and any(process.poll() is None for process in processes):
+        time.sleep(0.05)
+    for process in processes:
+        signal_process_group(process, signal.SIGKILL)
+
+def timeout_message(process):
+    return f"Délai dépassé ({process.timeout:g}s): {' '.join(process.args[:2])}"
+
+class OutputBuffer:
+    """Sortie d'une commande git lue au fil de l'eau, en mémoire bornée
+    
+    Les premières et les dernières lignes sont conservées pour le diagnostic,
+    celles du milieu sont seulement comptées. Les lignes de progression, que
+    git réécrit sur place par un retour chariot, ne sont pas conservées.
+    """
+    
+    def __init__(self, head_lines=OUTPUT_HEAD_LINES, tail_lines=OUTPUT_TAIL_LINES):
+        self.head_lines = head_lines
+        self.head = []
+        self.tail = deque(maxlen=tail_lines)
+        self.lines = 0
+        self.bytes = 0
+        self.omitted = 0
+    
+    def add_lines(self, lines):
+        self.lines += len(lines)
+        room = self.head_lines - len(self.head)
+        if room > 0:
+            self.head.extend(truncate_line(line) for line in lines[:room])
+            lines = lines[room:]
+        if lines:
+            self.omitted += max(0, len(self.tail) + len(lines) - self.tail.maxlen)
+            self.tail.extend(truncate_line(line) for line in lines[-self.tail.maxlen:])
+    
+    def read(self, stream, on_line=None):
+        """Lit le flux jusqu'à sa fin; on_line reçoit chaque ligne, progression comprise"""
+        decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+        pending = ""
+        # read1 rend les octets dès qu'ils arrivent: la progression est vue en direct
+        for chunk in iter(lambda: stream.read1(OUTPUT_CHUNK_BYTES), b''):
+            self.bytes += len(chunk)
+            *lines, pending = (pending + decoder.decode(chunk)).split('\n')
+            self.add_read_lines(lines, on_line)
+            if '\r' in pending:
+                # Progression en cours, sans fin de ligne; un \r final peut précéder un \n
+                carriage_return = pending.endswith('\r')
+                *progress, pending = pending[:-1 if carriage_return else None].split('\r')
+                if carriage_return:
+                    pending += '\r'
+                if on_line is not None:
+                    for line in progress:
+                        on_line(line)
+            if len(pending) > OUTPUT_MAX_LINE:
+                # Ligne sans fin (sortie binaire): découpée plutôt qu'accumulée
+                self.add_lines([pending])
+                pending = ""
+        pending = (pending + decoder.decode(b'', final=True)).rstrip('\r')
+        if pending:
+            self.add_read_lines([pending], on_line)
+    
+    def add_read_lines(self, lines, on_line):
+        if any('\r' in line for line in lines):
+            # Seul le dernier état d'une ligne réécrite par \r est conservé
+            kept = []
+            for line in lines:
+                *progress, line = line.rstrip('\r').split('\r')
+                if on_line is not None:
+                    for segment in progress:
+                        on_line(segment)
+                kept.append(line)
+            lines = kept
+        if on_line is not None:
+            for line in lines:
+                on_line(line)
+        self.add_lines(lines)
+    
+    def text(self):
+        lines = self.head
+        if self.omitted:
+            lines = lines + [f"[... {self.omitted} lignes omises ...]"]
+        return "".join(line + "\n" for line in itertools.chain(lines, self.tail))
+
+def truncate_line(line):
+    return line if len(line) <= OUTPUT_MAX_LINE else line[:OUTPUT_MAX_LINE] + "…"
+
+def read_process_output(process, input=None, on_progress=None):
+    """Lit stdout et stderr d'un processus jusqu'à leur fin, retourne leurs OutputBuffer
+    
+    stderr, où git écrit sa progression, est lu dans un thread et chacune de
+    ses lignes passée à on_progress; l'entrée éventuelle est écrite dans un
+    autre pour qu'aucun tube plein ne bloque le processus.
+    """
+    stdout, stderr = OutputBuffer(), OutputBuffer()
+    threads = [threading.Thread(target=stderr.read, args=(process.stderr, on_progress), daemon=True)]
+    if input is not None:
+        threads.append(threading.Thread(target=write_process_input, args=(process.stdin, input), daemon=True))
+    for thread in threads:
+        thread.start()
+    try:
+        stdout.read(process.stdout)
+    finally:
+        for thread in threads:
+            thread.join()
+        process.stdout.close()
+        process.stderr.close()
+        process.wait()
+    return stdout, stderr
+
+def write_process_input(stream, input):
+    try:
+        stream.write(input.encode('utf-8', errors='surrogateescape'))
+        stream.close()
+    except OSError:
+        # Processus terminé avant d'avoir tout lu (échec ou délai dépassé)
+        pass
+
+class ProgressReporter:
+    """Publie dans le statut d'un dépôt la progression lue sur stderr ("Writing objects:  45% (9/20)")
+    
+    Un statut n'est émis que lorsque l'étape ou le pourcentage change, au plus
+    une fois par PROGRESS_INTERVAL secondes hors fin d'étape.
+    """
+    
+    def __init__(self, committer, repo_name, label):
+        self.committer = committer
+        self.repo_name = repo_name
+        self.label = label
+        self.last = None
+        self.last_time = 0.0
+    
+    def __call__(self, line):
+        match = PROGRESS_PATTERN.match(line)
+        if match is None:
+            return
+        stage, percent = match.group(1), int(match.group(2))
+        now = time.monotonic()
+        if (stage, percent) == self.last or (percent < 100 and now - self.last_time < PROGRESS_INTERVAL):
+            return
+        self.last, self.last_time = (stage, percent), now
+        self.committer.notify_status(self.repo_name, CommitStatus.IN_PROGRESS,
+                                     f"{self.label}: {stage} {percent}%", progress=percent)
+
+def percentile(values, pct):
+    """Percentile par interpolation linéaire"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
 
 def get_base_dir():
     if getattr(sys, 'frozen', False):  # Exécuté via PyInstaller (.exe)
@@ -34,70 +954,2028 @@ def get_base_dir():
     else:  # Exécuté en mode .py normal
         return os.path.dirname(os.path.abspath(__file__))
 
+class GitBackend:
+    """Opérations git utilisées par le committer (status, indexation, commit, push)
+    
+    Le push passe toujours par le processus git, qui gère les identifiants
+    (agent SSH, credential helpers) de l'utilisateur.
+    """
+    
+    name = "base"
+    
+    def __init__(self, committer):
+        self.committer = committer
+        self.requested_name = self.name
+    
+    def iter_status(self, repo_path):
+        """Retourne les FileChange du dépôt"""
+        raise NotImplementedError
+    
+    def has_changes(self, repo_path):
+        """Vérifie s'il y a des changements dans le dépôt"""
+        try:
+            return any(True for _ in self.iter_status(repo_path))
+        except Exception:
+            return False
+    
+    def stage(self, repo_path, changes):
+        """Ajoute les changements à l'index, retourne (succès, sortie)"""
+        raise NotImplementedError
+    
+    def commit(self, repo_path, changes, message):
+        """Crée le commit des changements indexés, retourne (succès, sortie)"""
+        raise NotImplementedError
+    
+    def push(self, repo_path, env=None, on_progress=None):
+        """Pousse la branche courante; la taille envoyée est lue dans la progression de git"""
+        success, output = self.committer.run_git_command(['git', 'push', '--progress'], repo_path,
+                                                         include_stderr=True, env=env, on_progress=on_progress)
+        if success:
+            self.committer.record_bytes_pushed(parse_pushed_bytes(output))
+        return success, output
+    
+    def pull_rebase(self, repo_path, env=None, on_progress=None):
+        """Récupère la branche amont et y rejoue les commits locaux
+        
+        git pull ne télécharge que la branche suivie. Le rebase n'est tenté
+        que sur un arbre de travail propre: des fichiers suivis modifiés
+        (écartés par les limites de taille, ou modifiés depuis le commit)
+        resteraient dans le stash si son application échouait. En cas de
+        conflit, le rebase est annulé.
+        """
+        success, output = self.committer.run_git_command(
+            ['git', 'status', '--porcelain', '--untracked-files=no'], repo_path)
+        if not success:
+            return False, output
+        if output.strip():
+            return False, "fichiers suivis modifiés non commités, rebase non tenté pour ne pas y toucher"
+        # fetch.unpackLimit=1: le pack reçu est conservé tel quel (pas d'objets
+        # décompressés un à un) et git en affiche la taille dans sa progression
+        success, output = self.committer.run_git_command(
+            ['git', '-c', 'fetch.unpackLimit=1', 'pull', '--rebase', '--progress'], repo_path,
+            include_stderr=True, env=env, on_progress=on_progress
+        )
+        self.committer.record_bytes_fetched(parse_fetched_bytes(output))
+        if not success:
+            # Sans rebase en cours (échec réseau), l'annulation échoue sans effet
+            self.committer.run_git_command(['git', 'rebase', '--abort'], repo_path)
+        return success, output
+
+class SubprocessGitBackend(GitBackend):
+    """Backend par défaut: un processus git par opération"""
+    
+    name = "subprocess"
+    
+    PATHSPEC_ARGS = ['--pathspec-from-file=-', '--pathspec-file-nul']
+    
+    def iter_status(self, repo_path):
+        """Parcourt la sortie de git status --porcelain=v2 -z au fil de l'eau
+        
+        Lève subprocess.CalledProcessError si git status échoue.
+        """
+        command = ['git', 'status', '--porcelain=v2', '-z', '--untracked-files=all']
+        self.committer.count_git_process(command)
+        with self.committer.git_process(command, repo_path, stdin=subprocess.DEVNULL,
+                                        stdout=subprocess.PIPE, stderr=subprocess.PIPE) as process:
+            yield from self.parse_status(process)
+        if process.timed_out:
+            raise subprocess.CalledProcessError(process.returncode, command, stderr=timeout_message(process))
+        if process.returncode != 0:
+            raise subprocess.CalledProcessError(process.returncode, command, stderr=process.stderr_text)
+    
+    def parse_status(self, process):
+        buffer = b''
+        rename = None
+        output_bytes = 0
+        try:
+            for chunk in iter(lambda: process.stdout.read(64 * 1024), b''):
+                output_bytes += len(chunk)
+                buffer += chunk
+                *records, buffer = buffer.split(b'\0')
+                for record in records:
+                    record = record.decode('utf-8', errors='surrogateescape')
+                    if rename is not None:
+                        # Un renommage est suivi de son chemin d'origine
+                        yield rename._replace(orig_path=record)
+                        rename = None
+                    elif record.startswith('1 '):
+                        fields = record.split(' ', 8)
+                        yield FileChange('1', fields[1], fields[8], None)
+                    elif record.startswith('2 '):
+                        fields = record.split(' ', 9)
+                        rename = FileChange('2', fields[1], fields[9], None)
+                    elif record.startswith('u '):
+                        fields = record.split(' ', 10)
+                        yield FileChange('u', fields[1], fields[10], None)
+                    elif record.startswith('? '):
+                        yield FileChange('?', '??', record[2:], None)
+        finally:
+            process.stdout.close()
+            process.stderr_text = process.stderr.read().decode('utf-8', errors='replace')
+            process.stderr.close()
+            returncode = process.wait()
+            self.committer.record_git_result(returncode, output_bytes + len(process.stderr_text))
+    
+    def get_pathspec(self, changes):
+        paths = []
+        for change in changes:
+            paths.append(change.path)
+            if change.orig_path:
+                paths.append(change.orig_path)
+        return "\0".join(paths) + "\0"
+    
+    def stage(self, repo_path, changes):
+        # Seuls les fichiers non suivis passent par git add: les fichiers suivis
+        # sont indexés directement par git commit via le pathspec. Un commit
+        # partiel étant refusé pendant une fusion, les conflits aussi
+        to_add = [change for change in changes if change.kind in ('?', 'u')]
+        if not to_add:
+            return True, ""
+        return self.committer.run_git_command(['git', 'add', '-A'] + self.PATHSPEC_ARGS,
+                                              repo_path, input=self.get_pathspec(to_add))
+    
+    def commit(self, repo_path, changes, message):
+        if any(change.kind == 'u' for change in changes):
+            return self.committer.run_git_command(['git', 'commit', '-m', message], repo_path)
+        return self.committer.run_git_command(['git', 'commit', '-m', message] + self.PATHSPEC_ARGS,
+                                              repo_path, input=self.get_pathspec(changes))
+
+class Pygit2Backend(GitBackend):
+    """Backend en processus basé sur libgit2 (pygit2)
+    
+    Les hooks git (pre-commit, commit-msg...) ne sont pas exécutés.
+    """
+    
+    name = "pygit2"
+    
+    def __init__(self, committer):
+        super().__init__(committer)
+        import pygit2
+        self.pygit2 = pygit2
+    
+    def iter_status(self, repo_path):
+        git = self.pygit2
+        repo = git.Repository(repo_path)
+        index_flags = [
+            (git.GIT_STATUS_INDEX_NEW, 'A'), (git.GIT_STATUS_INDEX_MODIFIED, 'M'),
+            (git.GIT_STATUS_INDEX_DELETED, 'D'), (git.GIT_STATUS_INDEX_RENAMED, 'R'),
+            (git.GIT_STATUS_INDEX_TYPECHANGE, 'T')
+        ]
+        worktree_flags = [
+            (git.GIT_STATUS_WT_MODIFIED, 'M'), (git.GIT_STATUS_WT_DELETED, 'D'),
+            (git.GIT_STATUS_WT_RENAMED, 'R'), (git.GIT_STATUS_WT_TYPECHANGE, 'T')
+        ]
+        index_mask = sum(flag for flag, _ in index_flags)
+        for path, flags in repo.status(untracked_files="all").items():
+            if flags & git.GIT_STATUS_CONFLICTED:
+                yield FileChange('u', 'UU', path, None)
+            elif flags & git.GIT_STATUS_WT_NEW and not flags & index_mask:
+                yield FileChange('?', '??', path, None)
+            elif flags not in (git.GIT_STATUS_CURRENT, git.GIT_STATUS_IGNORED):
+                x = next((code for flag, code in index_flags if flags & flag), '.')
+                y = next((code for flag, code in worktree_flags if flags & flag), '.')
+                yield FileChange('1', x + y, path, None)
+    
+    def stage(self, repo_path, changes):
+        try:
+            repo = self.pygit2.Repository(repo_path)
+            index = repo.index
+            for change in changes:
+                if os.path.lexists(os.path.join(repo_path, change.path)):
+                    index.add(change.path)
+                elif change.path in index:
+                    index.remove(change.path)
+            index.write()
+            return True, ""
+        except (self.pygit2.GitError, KeyError, OSError) as e:
+            return False, str(e)
+    
+    def commit(self, repo_path, changes, message):
+        try:
+            repo = self.pygit2.Repository(repo_path)
+            tree = repo.index.write_tree()
+            signature = repo.default_signature
+            parents = [] if repo.head_is_unborn else [repo.head.target]
+            merge_head = os.path.join(repo.path, 'MERGE_HEAD')
+            if os.path.exists(merge_head):
+                with open(merge_head, 'r', encoding='utf-8') as f:
+                    parents.extend(self.pygit2.Oid(hex=line.strip()) for line in f if line.strip())
+            oid = repo.create_commit('HEAD', signature, signature, message, tree, parents)
+            repo.state_cleanup()
+            return True, str(oid)
+        except (self.pygit2.GitError, KeyError, ValueError, OSError) as e:
+            return False, str(e)
+
+class DulwichBackend(GitBackend):
+    """Backend en processus pur Python (dulwich)
+    
+    Les hooks git ne sont pas exécutés et les conflits de fusion ne sont pas gérés.
+    """
+    
+    name = "dulwich"
+    
+    def __init__(self, committer):
+        super().__init__(committer)
+        from dulwich import porcelain
+        from dulwich.repo import Repo
+        self.porcelain = porcelain
+        self.Repo = Repo
+    
+    def iter_status(self, repo_path):
+        def decode(path):
+            return path.decode('utf-8', errors='surrogateescape') if isinstance(path, bytes) else path
+        
+        status = self.porcelain.status(repo_path, untracked_files="all")
+        staged = {}
+        for kind, code in (('add', 'A'), ('modify', 'M'), ('delete', 'D')):
+            for path in status.staged.get(kind, []):
+                staged[decode(path)] = code
+        for path in status.unstaged:
+            path = decode(path)
+            y = 'M' if os.path.lexists(os.path.join(repo_path, path)) else 'D'
+            yield FileChange('1', staged.pop(path, '.') + y, path, None)
+        for path, code in staged.items():
+            yield FileChange('1', code + '.', path, None)
+        for path in status.untracked:
+            yield FileChange('?', '??', decode(path).rstrip('/'), None)
+    
+    def stage(self, repo_path, changes):
+        try:
+            with self.Repo(repo_path) as repo:
+                worktree = repo.get_worktree() if hasattr(repo, 'get_worktree') else repo
+                worktree.stage([change.path for change in changes])
+            return True, ""
+        except Exception as e:
+            return False, str(e)
+    
+    def commit(self, repo_path, changes, message):
+        try:
+            sha = self.porcelain.commit(repo_path, message=message.encode('utf-8'))
+            return True, sha.decode('ascii')
+        except Exception as e:
+            return False, str(e)
+
+GIT_BACKENDS = {
+    "subprocess": SubprocessGitBackend,
+    "pygit2": Pygit2Backend,
+    "dulwich": DulwichBackend
+}
+
+def create_git_backend(name, committer):
+    """Crée le backend git demandé, avec repli sur le backend subprocess"""
+    backend_class = GIT_BACKENDS.get(name)
+    if backend_class is None:
+        committer.logger.warning(f"Backend git inconnu '{name}', utilisation de subprocess")
+        backend_class = SubprocessGitBackend
+    try:
+        return backend_class(committer)
+    except ImportError as e:
+        committer.logger.warning(f"Backend git '{name}' indisponible ({e}), utilisation de subprocess")
+        return SubprocessGitBackend(committer)
+
+# Politique de push d'un dépôt, propre à sa racine de workspace_roots
+PushPolicy = namedtuple('PushPolicy', ['max_retries', 'retry_delay', 'rebase_on_reject'])
+
+class PushScheduler:
+    """File de push exécutée après la phase de commit local
+    
+    max_retries, retry_delay et rebase_on_reject sont la politique par
+    défaut; un dépôt mis en file avec sa propre PushPolicy la remplace.
+    """
+    
+    # Durée de vie d'une connexion SSH partagée inutilisée
+    SSH_CONTROL_PERSIST = 30
+    
+    def __init__(self, committer, per_remote_limit=2, max_retries=3, retry_delay=2.0,
+                 rebase_on_reject=False, ssh_multiplex=False):
+        self.committer = committer
+        self.per_remote_limit = max(1, per_remote_limit)
+        self.max_retries = max(1, max_retries)
+        self.retry_delay = retry_delay
+        self.rebase_on_reject = rebase_on_reject
+        self.ssh_multiplex = ssh_multiplex
+        self.pending = []
+        self.metrics = {}
+        self.policies = {}
+        self.envs = {}
+        self.ssh_control_dir = None
+        self.lock = threading.Lock()
+        self.host_semaphores = {}
+    
+    def enqueue(self, repo_path, metrics=None, policy=None):
+        """Ajoute un dépôt commité à la file de push"""
+        with self.lock:
+            self.pending.append(repo_path)
+            self.metrics[repo_path] = metrics
+            if policy is not None:
+                self.policies[repo_path] = policy
+    
+    def get_policy(self, repo_path):
+        policy = self.policies.get(repo_path)
+        if policy is None:
+            return PushPolicy(self.max_retries, self.retry_delay, self.rebase_on_reject)
+        return policy._replace(max_retries=max(1, policy.max_retries))
+    
+    def get_remote_settings(self, repo_path):
+        """(URL de push, core.sshCommand) du dépôt, lus en un seul appel à git config"""
+        success, output = self.committer.run_git_command(
+            ['git', 'config', '-z', '--get-regexp', REMOTE_CONFIG_PATTERN], repo_path)
+        # Code 1 sans sortie: aucune des clés n'est définie
+        return parse_remote_config(output if success else "", read_head_branch(repo_path))
+    
+    def get_remote_host(self, repo_path):
+        """Retourne l'hôte du dépôt distant par défaut"""
+        url, _ = self.get_remote_settings(repo_path)
+        return get_url_host(url, repo_path)
+    
+    def get_ssh_env(self, repo_path, url, ssh_command=None):
+        """Environnement git du push SSH: sans invite, avec une connexion partagée par hôte
+        
+        BatchMode empêche ssh de demander une phrase de passe ou de confirmer
+        une clé d'hôte. Chaque push vers un même hôte réutilise la connexion
+        maître (ControlMaster) au lieu de refaire la poignée de main SSH. Une
+        commande ssh déjà configurée (GIT_SSH_COMMAND, GIT_SSH ou
+        core.sshCommand) est laissée telle quelle.
+        """
+        if not is_ssh_url(url, repo_path):
+            return None
+        if 'GIT_SSH_COMMAND' in os.environ or 'GIT_SSH' in os.environ or ssh_command is not None:
+            return None
+        ssh_command = "ssh -o BatchMode=yes"
+        if self.ssh_multiplex and os.name != 'nt':
+            with self.lock:
+                if self.ssh_control_dir is None:
+                    self.ssh_control_dir = tempfile.mkdtemp(prefix="agc-ssh-")
+                control_path = shlex.quote(os.path.join(self.ssh_control_dir, "%C"))
+            ssh_command += (f" -o ControlMaster=auto -o ControlPath={control_path} "
+                            f"-o ControlPersist={self.SSH_CONTROL_PERSIST}")
+        return dict(os.environ, GIT_SSH_COMMAND=ssh_command)
+    
+    def close_ssh_connections(self):
+        """Ferme les connexions SSH maîtres ouvertes pendant le run"""
+        if self.ssh_control_dir is None:
+            return
+        for name in os.listdir(self.ssh_control_dir):
+            try:
+                # L'hôte est ignoré: le socket désigne la connexion
+                subprocess.run(['ssh', '-S', os.path.join(self.ssh_control_dir, name), '-O', 'exit', 'autogit'],
+                               capture_output=True, timeout=10)
+            except (OSError, subprocess.TimeoutExpired):
+                pass
+        shutil.rmtree(self.ssh_control_dir, ignore_errors=True)
+        self.ssh_control_dir = None
+    
+    def get_semaphore(self, host):
+        with self.lock:
+            if host not in self.host_semaphores:
+                self.host_semaphores[host] = threading.BoundedSemaphore(self.per_remote_limit)
+            return self.host_semaphores[host]
+    
+    def push_with_retry(self, repo_path, host):
+        """Pousse un dépôt avec des tentatives espacées exponentiellement"""
+        repo_name = self.committer.get_repo_name(repo_path)
+        start = time.perf_counter()
+        semaphore = self.get_semaphore(host)
+        metrics = self.metrics.get(repo_path) or RepoMetrics(repo_name)
+        self.committer.set_current_metrics(metrics)
+        try:
+            result = self.push_attempts(repo_path, repo_name, host, semaphore, metrics, start)
+        finally:
+            self.committer.set_current_metrics(None)
+        if not self.committer.cancel_event.is_set():
+            self.committer.journal_record(repo_path, "done" if result[0] else "failed")
+        return result
+    
+    def push_attempts(self, repo_path, repo_name, host, semaphore, metrics, start):
+        """Tentatives de push successives, chacune mesurée comme une phase push"""
+        max_retries, retry_delay, rebase_on_reject = self.get_policy(repo_path)
+        for attempt in range(1, max_retries + 1):
+            if self.committer.cancel_event.is_set():
+                # Le journal garde le dépôt en attente de push pour le run suivant
+                self.committer.notify_status(repo_name, CommitStatus.SKIPPED, "Run interrompu, push repris au prochain run")
+                return False, time.perf_counter() - start
+            with semaphore:
+                label = f"Push vers {host} (tentative {attempt}/{max_retries})"
+                self.committer.notify_status(repo_name, CommitStatus.IN_PROGRESS, f"{label}...")
+                with metrics.phase("push"):
+                    success, output = self.committer.get_git_backend().push(
+                        repo_path, self.envs.get(repo_path), ProgressReporter(self.committer, repo_name, label))
+            
+            if not success and rebase_on_reject and is_non_fast_forward(output) \
+                    and attempt < max_retries:
+                # La branche distante a avancé: rebase puis nouvelle tentative immédiate
+                if self.rebase_onto_remote(repo_path, repo_name, host, semaphore, metrics):
+                    continue
+                # Tant que le rebase échoue, chaque push serait refusé de la même façon
+                self.committer.notify_status(repo_name, CommitStatus.FAILED,
+                                             "Branche distante en avance, rebase impossible "
+                                             "(conflit ou fichiers modifiés?)")
+                return False, time.perf_counter() - start
+            
+            if success:
+                self.committer.logger.info(f"Push réalisé avec succès pour {repo_name}",
+                                           extra=log_fields(repo_name, "push", CommitStatus.SUCCESS,
+                                                            metrics.phases[-1].duration))
+                self.committer.notify_status(repo_name, CommitStatus.SUCCESS,
+                                             "Commit et push réalisés avec succès" + skipped_note(metrics))
+                return success, time.perf_counter() - start
+            
+            self.committer.logger.warning(f"Erreur lors du push dans {repo_name} (tentative {attempt}): {output}",
+                                          extra=log_fields(repo_name, "push", CommitStatus.FAILED,
+                                                           metrics.phases[-1].duration))
+            if metrics.timed_out or is_permanent_push_error(output):
+                # Un délai dépassé ou une erreur de configuration se répéteraient à chaque
+                # tentative: le dépôt ne doit pas retenir le run
+                break
+            if attempt < max_retries:
+                # Le sémaphore est relâché pendant l'attente pour ne pas bloquer l'hôte
+                delay = retry_delay * (2 ** (attempt - 1))
+                delay += random.uniform(0, retry_delay)
+                self.committer.notify_status(repo_name, CommitStatus.PUSH_PENDING,
+                                             f"Push échoué, nouvelle tentative dans {delay:.0f}s")
+                self.committer.cancel_event.wait(delay)
+        
+        self.committer.notify_status(repo_name, CommitStatus.FAILED, f"Erreur de push: {output[:50]}...")
+        return False, time.perf_counter() - start
+    
+    def rebase_onto_remote(self, repo_path, repo_name, host, semaphore, metrics):
+        """Rebase les commits locaux sur la branche distante après un refus non fast-forward"""
+        self.committer.logger.info(f"Push refusé pour {repo_name}: la branche distante a avancé, rebase",
+                                   extra=log_fields(repo_name, "pull"))
+        with semaphore:
+            self.committer.notify_status(repo_name, CommitStatus.IN_PROGRESS,
+                                         f"Branche distante en avance, rebase depuis {host}...")
+            with metrics.phase("pull"):
+                success, output = self.committer.get_git_backend().pull_rebase(
+                    repo_path, self.envs.get(repo_path), ProgressReporter(self.committer, repo_name, f"Rebase depuis {host}"))
+        if not success:
+            self.committer.logger.error(f"Rebase non effectué pour {repo_name}, push abandonné "
+                                        f"(à intégrer manuellement avec git pull --rebase): {output}",
+                                        extra=log_fields(repo_name, "pull", CommitStatus.FAILED,
+                                                         metrics.phases[-1].duration))
+        return success
+    
+    def run(self, max_workers):
+        """Vide la file de push et retourne {repo_path: (succès, durée)}"""
+        with self.lock:
+            pending, self.pending = self.pending, []
+        if not pending:
+            return {}
+        try:
+            return self.push_all(pending, max_workers)
+        finally:
+            self.close_ssh_connections()
+    
+    def push_all(self, pending, max_workers):
+        # Regrouper par hôte puis entrelacer les hôtes pour qu'un serveur lent
+        # n'occupe pas tous les workers
+        by_host = {}
+        for repo_path in pending:
+            url, ssh_command = self.get_remote_settings(repo_path)
+            self.envs[repo_path] = self.get_ssh_env(repo_path, url, ssh_command)
+            by_host.setdefault(get_url_host(url, repo_path), []).append(repo_path)
+        jobs = []
+        while any(by_host.values()):
+            for host, repos in by_host.items():
+                if repos:
+                    jobs.append((repos.pop(0), host))
+        
+        self.committer.logger.info(
+            f"Phase de push: {len(jobs)} dépôts vers {len(by_host)} hôtes "
+            f"(max {self.per_remote_limit} par hôte)"
+        )
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(jobs))),
+                                thread_name_prefix="git-push") as executor:
+            futures = {repo_path: executor.submit(self.push_with_retry, repo_path, host)
+                       for repo_path, host in jobs}
+            try:
+                return {repo_path: future.result() for repo_path, future in futures.items()}
+            except KeyboardInterrupt:
+                self.committer.cancel_run()
+                raise
+
+def glob_to_regex(pattern):
+    """Traduit un motif glob à la manière de .gitignore en expression régulière"""
+    parts = []
+    i, length = 0, len(pattern)
+    while i < length:
+        char = pattern[i]
+        if char == '*':
+            at_segment_start = i == 0 or pattern[i - 1] == '/'
+            if pattern.startswith('**', i) and at_segment_start and pattern[i + 2:i + 3] == '/':
+                # "**/": zéro ou plusieurs dossiers
+                parts.append('(?:[^/]*/)*')
+                i += 3
+                continue
+            if pattern.startswith('**', i) and at_segment_start and i + 2 == length:
+                # "/**" final: tout le contenu du dossier
+                parts.append('.*')
+                i += 2
+                continue
+            parts.append('[^/]*')
+            while i + 1 < length and pattern[i + 1] == '*':
+                i += 1
+        elif char == '?':
+            parts.append('[^/]')
+        elif char == '[':
+            # Un ']' placé juste après '[' (ou '[!') fait partie de la classe
+            start = i + 2 if pattern[i + 1:i + 2] in ('!', '^') else i + 1
+            end = pattern.find(']', start + 1)
+            if end == -1:
+                parts.append(re.escape(char))
+            else:
+                content = pattern[i + 1:end]
+                negate = content[:1] in ('!', '^')
+                if negate:
+                    content = content[1:]
+                content = "".join(c if c == '-' else re.escape(c) for c in content)
+                parts.append(f"[{'^/' if negate else ''}{content}]")
+                i = end
+        elif char == '\\' and i + 1 < length:
+            i += 1
+            parts.append(re.escape(pattern[i]))
+        else:
+            parts.append(re.escape(char))
+        i += 1
+    return "".join(parts)
+
+def escape_glob(text):
+    """Échappe un nom pour qu'il soit pris littéralement dans un motif"""
+    return re.sub(r'([*?\[\\])', r'\\\1', text)
+
+def legacy_exclusion_patterns(excluded_folders, excluded_files):
+    """Motifs équivalents aux listes excluded_folders (noms de dossiers) et excluded_files (suffixes)"""
+    patterns = [escape_glob(name) + '/' for name in excluded_folders]
+    patterns += ['*' + escape_glob(suffix) for suffix in excluded_files]
+    return [f"\\{pattern}" if pattern[:1] in ('!', '#') else pattern for pattern in patterns]
+
+class ExclusionMatcher:
+    """Règles d'exclusion compilées, à la manière de .gitignore
+    
+    Motifs acceptés: '*', '?', '[a-z]', '**' pour traverser des dossiers, '/'
+    final pour ne viser que les dossiers, '/' en tête ou au milieu pour ancrer
+    le motif à la racine, '!' pour réinclure. Comme pour git, la dernière
+    règle qui correspond l'emporte et rien n'est réinclus sous un dossier
+    exclu. Les chemins sont relatifs et séparés par '/'.
+    
+    Les cas courants sont résolus sans expression régulière: un nom exact par
+    une recherche dans un dict, un suffixe ('*.log') par une recherche par
+    longueur de suffixe. Les autres motifs sont combinés en une seule
+    expression par catégorie (nom seul ou chemin ancré), la règle la plus
+    récente en tête de l'alternative. Les résultats des dossiers sont mis en
+    cache.
+    """
+    
+    CACHE_SIZE = 65536
+    GLOB_CHARS = re.compile(r'[*?\[\\]')
+    
+    def __init__(self, patterns):
+        self.patterns = tuple(patterns)
+        rules = [rule for rule in map(self.parse_pattern, self.patterns) if rule is not None]
+        self.dir_rules = self.compile_rules(rules)
+        self.file_rules = self.compile_rules([rule for rule in rules if not rule[3]])
+        self.dir_cache = {}
+    
+    @classmethod
+    def parse_pattern(cls, pattern):
+        """Retourne (type, clé, négation, dossier seulement), ou None pour une ligne vide ou un commentaire
+        
+        Types: "name" (nom exact), "suffix" (nom se terminant par la clé),
+        "glob" (expression sur le nom), "path" (expression sur le chemin).
+        """
+        pattern = pattern.rstrip()
+        if not pattern or pattern.startswith('#'):
+            return None
+        negate = pattern.startswith('!')
+        if negate:
+            pattern = pattern[1:]
+        dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        if not pattern:
+            return None
+        if '/' in pattern:
+            return "path", glob_to_regex(pattern.lstrip('/')), negate, dir_only
+        # Sans '/', le motif s'applique au nom, à toute profondeur
+        if not cls.GLOB_CHARS.search(pattern):
+            return "name", pattern, negate, dir_only
+        if pattern.startswith('*') and not cls.GLOB_CHARS.search(pattern, 1):
+            return "suffix", pattern[1:], negate, dir_only
+        return "glob", glob_to_regex(pattern), negate, dir_only
+    
+    @staticmethod
+    def compile_rules(rules):
+        """Regroupe les règles par type; chaque règle garde son rang pour départager"""
+        names, suffixes, expressions = {}, {}, {"glob": [], "path": []}
+        for rank, (kind, key, negate, _) in enumerate(rules):
+            if kind == "name":
+                names[key] = (rank, negate)
+            elif kind == "suffix":
+                suffixes[key] = (rank, negate)
+            else:
+                expressions[kind].append((key, rank, negate))
+        compiled = {}
+        for kind, entries in expressions.items():
+            entries.reverse()
+            regex = re.compile("|".join(f"({key})" for key, _, _ in entries), re.DOTALL) if entries else None
+            compiled[kind] = (regex, tuple((rank, negate) for _, rank, negate in entries))
+        lengths = tuple(sorted({len(suffix) for suffix in suffixes}))
+        return names, suffixes, lengths, compiled["glob"], compiled["path"]
+    
+    @staticmethod
+    def last_match(rules, path):
+        """Rang et négation de la dernière règle qui correspond, ou None"""
+        names, suffixes, lengths, (glob_regex, glob_rules), (path_regex, path_rules) = rules
+        name = path.rpartition('/')[2]
+        best = names.get(name)
+        for length in lengths:
+            # name[-0:] serait le nom entier: '*' seul a un suffixe vide
+            hit = suffixes.get(name[len(name) - length:] if length <= len(name) else None)
+            if hit is not None and (best is None or hit[0] > best[0]):
+                best = hit
+        for regex, ranks, target in ((glob_regex, glob_rules, name), (path_regex, path_rules, path)):
+            if regex is None:
+                continue
+            match = regex.fullmatch(target)
+            if match is not None:
+                hit = ranks[match.lastindex - 1]
+                if best is None or hit[0] > best[0]:
+                    best = hit
+        return best
+    
+    def matches(self, path, is_dir=False):
+        """Indique si le chemin lui-même est exclu, sans regarder ses dossiers parents"""
+        best = self.last_match(self.dir_rules if is_dir else self.file_rules, path)
+        return best is not None and not best[1]
+    
+    def is_dir_excluded(self, path):
+        result = self.dir_cache.get(path)
+        if result is None:
+            parent = path.rpartition('/')[0]
+            result = bool(parent) and self.is_dir_excluded(parent) or self.matches(path, True)
+            if len(self.dir_cache) >= self.CACHE_SIZE:
+                self.dir_cache.clear()
+            self.dir_cache[path] = result
+        return result
+    
+    def is_excluded(self, path, is_dir=False):
+        """Indique si un chemin est exclu, lui ou l'un de ses dossiers"""
+        if is_dir:
+            return self.is_dir_excluded(path)
+        parent = path.rpartition('/')[0]
+        if parent:
+            excluded = self.dir_cache.get(parent)
+            if excluded is None:
+                excluded = self.is_dir_excluded(parent)
+            if excluded:
+                return True
+        return self.matches(path)
+
+class RepositoryIndex:
+    """Index persistant des dépôts découverts sous un dossier racine
+    
+    Chaque dossier parcouru est mémorisé avec son mtime: un dossier dont le
+    mtime n'a pas changé n'est pas relu, seul un os.stat est effectué.
+    """
+    
+    VERSION = 1
+    
+    def __init__(self, index_file, root, matcher, max_depth=1, include_nested=False, logger=None):
+        self.index_file = index_file
+        self.root = root
+        self.matcher = matcher
+        self.max_depth = max(1, max_depth)
+        self.include_nested = include_nested
+        self.logger = logger or logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        self.dirs = self.load()
+        self.dirty = False
+        self.listdir_count = 0
+    
+    def settings_key(self):
+        """Paramètres de découverte: l'index est invalidé s'ils changent"""
+        return {
+            "root": self.root,
+            "exclude_patterns": list(self.matcher.patterns),
+            "max_depth": self.max_depth,
+            "include_nested": self.include_nested
+        }
+    
+    def load(self):
+        """Charge l'index depuis le disque, ou un index vide s'il est invalide"""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == self.VERSION and data.get("settings") == self.settings_key():
+                return data.get("dirs", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Index des dépôts illisible, reconstruction: {e}")
+        return {}
+    
+    def save(self):
+        """Écrit l'index si des entrées ont changé"""
+        if not self.dirty:
+            return
+        data = {"version": self.VERSION, "settings": self.settings_key(), "dirs": self.dirs}
+        try:
+            # Réécriture sur place: remplacer le fichier modifierait le mtime du
+            # dossier racine et invaliderait l'index à chaque sauvegarde.
+            # Un index corrompu est simplement reconstruit au chargement.
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            self.dirty = False
+        except OSError as e:
+            self.logger.warning(f"Impossible d'écrire l'index des dépôts: {e}")
+    
+    def scan_dir(self, path, rel_path):
+        """Lit un dossier et retourne (type de dépôt, sous-dossiers non exclus)"""
+        self.listdir_count += 1
+        kind = None
+        subdirs = []
+        prefix = rel_path.replace(os.sep, '/') + '/' if rel_path else ''
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.name == '.git':
+                    kind = "repo" if entry.is_dir() else "gitfile"
+                elif entry.is_dir(follow_symlinks=False) and \
+                        not self.matcher.matches(prefix + entry.name, is_dir=True):
+                    # Le dossier parent, déjà parcouru, n'est pas exclu
+                    subdirs.append(entry.name)
+        return kind, sorted(subdirs)
+    
+    def get_entry(self, rel_path, visited):
+        """Retourne l'entrée d'index d'un dossier, relue seulement si modifiée"""
+        path = os.path.join(self.root, rel_path) if rel_path else self.root
+        mtime = os.stat(path).st_mtime_ns
+        entry = self.dirs.get(rel_path)
+        if entry is None or entry["mtime"] != mtime:
+            kind, subdirs = self.scan_dir(path, rel_path)
+            entry = {"mtime": mtime, "kind": kind, "subdirs": subdirs}
+            self.dirs[rel_path] = entry
+            self.dirty = True
+        visited.add(rel_path)
+        return entry
+    
+    def walk(self, rel_path, depth, inside_repo, visited, repositories):
+        try:
+            entry = self.get_entry(rel_path, visited)
+        except OSError:
+            return
+        
+        kind = entry["kind"]
+        if rel_path and kind:
+            if kind == "gitfile" and inside_repo:
+                # Sous-module: ses changements sont suivis par le dépôt parent
+                self.logger.debug(f"Sous-module ignoré: {rel_path}")
+            else:
+                repositories.append(os.path.join(self.root, rel_path))
+        
+        is_repo = bool(rel_path and kind)
+        if depth >= self.max_depth or (is_repo and not self.include_nested):
+            return
+        for name in entry["subdirs"]:
+            child = os.path.join(rel_path, name) if rel_path else name
+            self.walk(child, depth + 1, inside_repo or is_repo, visited, repositories)
+    
+    def find_repositories(self):
+        """Retourne les dépôts sous la racine en réutilisant l'index"""
+        with self.lock:
+            self.listdir_count = 0
+            visited = set()
+            repositories = []
+            self.walk("", 0, False, visited, repositories)
+            
+            # Oublier les dossiers qui n'existent plus ou ne sont plus parcourus
+            stale = set(self.dirs) - visited
+            for rel_path in stale:
+                del self.dirs[rel_path]
+            if stale:
+                self.dirty = True
+            
+            self.save()
+            return repositories
+
+class WorkspaceRoot:
+    """Dossier racine où sont cherchés des dépôts, avec ses propres paramètres
+    
+    config contient les paramètres de ROOT_KEYS: ceux redéfinis par la
+    racine, les valeurs globales pour les autres. La racine par défaut,
+    le dossier du script, n'a pas de nom: ses dépôts gardent leur chemin
+    relatif comme nom.
+    """
+    
+    def __init__(self, name, path, config, index_file):
+        self.name = name
+        self.path = path
+        self.config = config
+        self.index_file = index_file
+        self.index = None
+        self.index_settings = None
+    
+    def contains(self, repo_path):
+        return repo_path == self.path or repo_path.startswith(self.path.rstrip(os.sep) + os.sep)
+    
+    def repo_name(self, repo_path):
+        """Nom affiché d'un dépôt: son chemin relatif à la racine, précédé du nom de la racine"""
+        rel_path = os.path.relpath(repo_path, self.path).replace(os.sep, '/')
+        if not self.name:
+            return rel_path
+        return self.name if rel_path == '.' else f"{self.name}/{rel_path}"
+
+class RepositoryWatcher:
+    """Suit les dépôts modifiés entre deux runs pour éviter des git status inutiles
+    
+    Un dépôt est considéré modifié tant qu'il n'a pas été traité depuis son
+    dernier changement. Les dépôts nouvellement suivis sont toujours modifiés.
+    """
+    
+    backend_name = "base"
+    
+    def __init__(self, matcher, logger=None):
+        self.matcher = matcher
+        self.logger = logger or logging.getLogger(__name__)
+        self.lock = threading.Lock()
+        self.repositories = set()
+        self.dirty = set()
+    
+    def is_ignored(self, rel_path, is_dir=False):
+        """Indique si un chemin relatif au dépôt ('/' comme séparateur) est exclu de la surveillance"""
+        return rel_path.rpartition('/')[2] == '.git' or self.matcher.is_excluded(rel_path, is_dir)
+    
+    @staticmethod
+    def relative_prefix(repo_path, dir_path):
+        """Préfixe relatif au dépôt des entrées d'un dossier ('' à la racine)"""
+        rel_dir = os.path.relpath(dir_path, repo_path)
+        return "" if rel_dir == os.curdir else rel_dir.replace(os.sep, '/') + '/'
+    
+    def update_repositories(self, repositories):
+        """Synchronise les dépôts suivis avec la liste découverte"""
+        repositories = set(repositories)
+        with self.lock:
+            added = repositories - self.repositories
+            removed = self.repositories - repositories
+            self.repositories = repositories
+            self.dirty |= added
+            self.dirty -= removed
+        for repo_path in removed:
+            self.unwatch(repo_path)
+        for repo_path in added:
+            self.watch(repo_path)
+    
+    def mark_dirty(self, repo_path):
+        with self.lock:
+            if repo_path in self.repositories:
+                self.dirty.add(repo_path)
+    
+    def force_full_scan(self):
+        """Marque tous les dépôts suivis comme modifiés"""
+        with self.lock:
+            self.dirty = set(self.repositories)
+    
+    def take_dirty(self):
+        """Retourne les dépôts modifiés et les considère comme traités"""
+        with self.lock:
+            dirty, self.dirty = self.dirty, set()
+        return dirty
+    
+    def watch(self, repo_path):
+        pass
+    
+    def unwatch(self, repo_path):
+        pass
+    
+    def close(self):
+        pass
+
+class PollingWatcher(RepositoryWatcher):
+    """Détection par comparaison d'empreintes de l'arborescence (sans processus git)"""
+    
+    backend_name = "polling"
+    
+    def __init__(self, matcher, logger=None):
+        super().__init__(matcher, logger)
+        self.snapshots = {}
+    
+    def snapshot(self, repo_path):
+        """Empreinte (nombre, taille, mtime max) des fichiers non exclus"""
+        count = size = latest = 0
+        for dirpath, dirnames, filenames in os.walk(repo_path):
+            prefix = self.relative_prefix(repo_path, dirpath)
+            dirnames[:] = [d for d in dirnames if not self.is_ignored(prefix + d, True)]
+            latest = max(latest, os.stat(dirpath).st_mtime_ns)
+            for name in filenames:
+                if self.is_ignored(prefix + name):
+                    continue
+                try:
+                    st = os.lstat(os.path.join(dirpath, name))
+                except OSError:
+                    continue
+                count += 1
+                size += st.st_size
+                latest = max(latest, st.st_mtime_ns)
+        return count, size, latest
+    
+    def take_dirty(self):
+        with self.lock:
+            repositories = set(self.repositories)
+        for repo_path in repositories:
+            try:
+                current = self.snapshot(repo_path)
+            except OSError:
+                continue
+            if self.snapshots.get(repo_path) != current:
+                self.snapshots[repo_path] = current
+                self.mark_dirty(repo_path)
+        return super().take_dirty()
+    
+    def unwatch(self, repo_path):
+        self.snapshots.pop(repo_path, None)
+
+class InotifyWatcher(RepositoryWatcher):
+    """Détection par événements inotify (Linux), via ctypes"""
+    
+    backend_name = "inotify"
+    
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ISDIR = 0x40000000
+    WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+    EVENT_HEADER = struct.Struct('iIII')
+    
+    def __init__(self, matcher, logger=None):
+        super().__init__(matcher, logger)
+        if not sys.platform.startswith('linux'):
+            raise OSError("inotify n'est disponible que sous Linux")
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 a échoué")
+        self.watches = {}
+        self.repo_watches = {}
+        # Dépôts sans surveillance complète (limite de watches atteinte)
+        self.unwatched = set()
+        self.closed = False
+        self.thread = threading.Thread(target=self.read_loop, daemon=True, name="repo-watcher")
+        self.thread.start()
+    
+    def add_watch(self, dir_path, repo_path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dir_path), self.WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch a échoué pour {dir_path}")
+        with self.lock:
+            self.watches[wd] = (dir_path, repo_path)
+            self.repo_watches.setdefault(repo_path, set()).add(wd)
+    
+    def watch_tree(self, dir_path, repo_path):
+        """Surveille un dossier et ses sous-dossiers non exclus"""
+        try:
+            for dirpath, dirnames, _ in os.walk(dir_path):
+                prefix = self.relative_prefix(repo_path, dirpath)
+                # Les dépôts imbriqués ont leur propre surveillance
+                dirnames[:] = [d for d in dirnames if not self.is_ignored(prefix + d, True)
+                               and not os.path.exists(os.path.join(dirpath, d, '.git'))]
+                self.add_watch(dirpath, repo_path)
+        except OSError as e:
+            self.logger.warning(f"Surveillance incomplète de {repo_path}, vérification à chaque run: {e}")
+            with self.lock:
+                self.unwatched.add(repo_path)
+    
+    def watch(self, repo_path):
+        self.watch_tree(repo_path, repo_path)
+    
+    def unwatch(self, repo_path):
+        with self.lock:
+            wds = self.repo_watches.pop(repo_path, set())
+            self.unwatched.discard(repo_path)
+        for wd in wds:
+            self.libc.inotify_rm_watch(self.fd, wd)
+    
+    def take_dirty(self):
+        with self.lock:
+            self.dirty |= self.unwatched & self.repositories
+        return super().take_dirty()
+    
+    def read_loop(self):
+        """Lit les événements inotify jusqu'à la fermeture"""
+        while not self.closed:
+            try:
+                readable, _, _ = select.select([self.fd], [], [], 0.5)
+                if not readable:
+                    continue
+                data = os.read(self.fd, 64 * 1024)
+            except (OSError, ValueError):
+                if self.closed:
+                    return
+                continue
+            self.handle_events(data)
+    
+    def handle_events(self, data):
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            
+            if mask & self.IN_Q_OVERFLOW:
+                self.logger.warning("File d'événements inotify saturée, scan complet au prochain run")
+                self.force_full_scan()
+                continue
+            
+            with self.lock:
+                if mask & self.IN_IGNORED:
+                    dir_path, repo_path = self.watches.pop(wd, (None, None))
+                    if repo_path in self.repo_watches:
+                        self.repo_watches[repo_path].discard(wd)
+                    continue
+                dir_path, repo_path = self.watches.get(wd, (None, None))
+            
+            if repo_path is None or (name and self.is_ignored(self.relative_prefix(repo_path, dir_path) + name,
+                                                              bool(mask & self.IN_ISDIR))):
+                continue
+            if mask & self.IN_ISDIR and mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                self.watch_tree(os.path.join(dir_path, name), repo_path)
+            self.mark_dirty(repo_path)
+    
+    def close(self):
+        self.closed = True
+        self.thread.join(timeout=1)
+        os.close(self.fd)
+
+def create_watcher(backend, matcher, logger=None):
+    """Crée le watcher demandé, avec repli sur le polling si inotify est indisponible"""
+    logger = logger or logging.getLogger(__name__)
+    if backend in ("auto", "inotify"):
+        try:
+            return InotifyWatcher(matcher, logger)
+        except (OSError, AttributeError) as e:
+            logger.info(f"inotify indisponible ({e}), utilisation du polling")
+    return PollingWatcher(matcher, logger)
+
+class StatusCache:
+    """Résultats récents de git status partagés entre le moteur et l'interface
+    
+    Le moteur y enregistre l'état de chaque dépôt qu'il traite; l'onglet des
+    dépôts et la commande status le réutilisent tant qu'il a moins de ttl
+    secondes, au lieu de relancer un git status.
+    """
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.entries = {}
+    
+    def get(self, repo_path):
+        """Retourne True/False si un résultat récent existe, sinon None"""
+        with self.lock:
+            entry = self.entries.get(repo_path)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+    
+    def put(self, repo_path, has_changes):
+        if self.ttl > 0:
+            with self.lock:
+                self.entries[repo_path] = (time.monotonic(), has_changes)
+    
+    def invalidate(self, repo_path=None):
+        with self.lock:
+            if repo_path is None:
+                self.entries.clear()
+            else:
+                self.entries.pop(repo_path, None)
+
+class DailySchedule:
+    """Échéance quotidienne à heure fixe ("HH:MM")"""
+    
+    def __init__(self, expression):
+        self.expression = expression
+        moment = datetime.strptime(expression, "%H:%M")
+        self.hour, self.minute = moment.hour, moment.minute
+    
+    def next_after(self, moment):
+        candidate = moment.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        if candidate <= moment:
+            candidate += timedelta(days=1)
+        return candidate
+
+class IntervalSchedule:
+    """Échéance périodique ("every 30m"), alignée sur le démarrage du service"""
+    
+    UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    
+    def __init__(self, expression, anchor=None):
+        self.expression = expression
+        amount = expression.split(None, 1)[1].strip().lower()
+        if len(amount) < 2 or amount[-1] not in self.UNITS or not amount[:-1].isdigit():
+            raise ValueError(f"Intervalle invalide: {expression} (ex: every 30m, every 2h)")
+        self.interval = timedelta(seconds=int(amount[:-1]) * self.UNITS[amount[-1]])
+        if not self.interval:
+            raise ValueError(f"Intervalle nul: {expression}")
+        self.anchor = anchor or datetime.now()
+    
+    def next_after(self, moment):
+        if moment < self.anchor:
+            return self.anchor + self.interval
+        elapsed = (moment - self.anchor) // self.interval
+        return self.anchor + (elapsed + 1) * self.interval
+
+class CronSchedule:
+    """Expression cron à 5 champs: minute heure jour mois jour_semaine
+    
+    Chaque champ accepte *, des valeurs, des plages a-b, des listes et des pas
+    (*/15, 9-18/2). Comme cron, si le jour du mois et le jour de la semaine
+    sont tous deux restreints, une correspondance sur l'un des deux suffit.
+    """
+    
+    FIELDS = ((0, 59), (0, 23), (1, 31), (1, 12), (0, 7))
+    
+    def __init__(self, expression):
+        self.expression = expression
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Expression cron invalide: {expression} (5 champs attendus)")
+        parsed = [self.parse_field(field, low, high, expression)
+                  for field, (low, high) in zip(fields, self.FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        # Dimanche peut s'écrire 0 ou 7; cron numérote à partir du dimanche
+        self.weekdays = {day % 7 for day in weekdays}
+        self.days_restricted = fields[2] != '*'
+        self.weekdays_restricted = fields[4] != '*'
+    
+    @staticmethod
+    def parse_field(field, low, high, expression):
+        values = set()
+        for part in field.split(','):
+            range_part, _, step = part.partition('/')
+            try:
+                step = int(step) if step else 1
+                if range_part == '*':
+                    start, end = low, high
+                elif '-' in range_part:
+                    start, end = (int(value) for value in range_part.split('-', 1))
+                else:
+                    start = int(range_part)
+                    end = high if step > 1 else start
+            except ValueError:
+                raise ValueError(f"Expression cron invalide: {expression}") from None
+            if step < 1 or start < low or end > high or start > end:
+                raise ValueError(f"Valeur hors limites dans l'expression cron: {expression}")
+            values.update(range(start, end + 1, step))
+        return values
+    
+    def matches_day(self, moment):
+        day_match = moment.day in self.days
+        # datetime: lundi=0; cron: dimanche=0
+        weekday_match = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+    
+    def next_after(self, moment):
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        # Avance par mois, jour, heure puis minute plutôt que minute par minute
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year, month = divmod(candidate.month, 12)
+                candidate = candidate.replace(year=candidate.year + year, month=month + 1,
+                                              day=1, hour=0, minute=0)
+            elif not self.matches_day(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+            elif candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"Aucune échéance possible pour l'expression cron: {self.expression}")
+
+def parse_schedule_expression(expression):
+    """Convertit une entrée de commit_times en échéancier
+    
+    Formats acceptés: "HH:MM" (quotidien), "every 30m" / "every 2h"
+    (intervalle) et expression cron à 5 champs ("*/15 9-18 * * 1-5").
+    Lève ValueError si l'expression est invalide.
+    """
+    expression = expression.strip()
+    if expression.lower().startswith("every "):
+        return IntervalSchedule(expression)
+    if len(expression.split()) == 5:
+        schedule_entry = CronSchedule(expression)
+        schedule_entry.next_after(datetime.now())
+        return schedule_entry
+    try:
+        return DailySchedule(expression)
+    except ValueError:
+        raise ValueError(f"Planification invalide: {expression} "
+                         "(HH:MM, every 30m ou expression cron)") from None
+
+class CommitScheduler:
+    """Déclenche les runs planifiés en dormant jusqu'à la prochaine échéance
+    
+    Le thread attend sur une condition: l'arrêt ou un changement de
+    planification le réveillent immédiatement. Les runs s'exécutent dans ce
+    thread, un à la fois; les échéances dépassées pendant un run sont
+    regroupées en un seul run suivant plutôt que rejouées. Le callback
+    reçoit les échéanciers arrivés à échéance.
+    """
+    
+    # Attente maximale avant de relire l'horloge (changement d'heure, mise en veille)
+    MAX_WAIT = 600
+    
+    def __init__(self, callback, logger=None):
+        self.callback = callback
+        self.logger = logger or logging.getLogger(__name__)
+        self.condition = threading.Condition()
+        self.entries = []
+        self.next_due = {}
+        self.running = False
+        self.thread = None
+    
+    def set_entries(self, entries):
+        """Remplace la planification et réveille le thread pour recalculer l'échéance
+        
+        Les échéanciers déjà planifiés gardent leur prochaine échéance.
+        """
+        now = datetime.now()
+        with self.condition:
+            self.entries = list(entries)
+            self.next_due = {entry: self.next_due.get(entry) or entry.next_after(now)
+                             for entry in self.entries}
+            self.condition.notify_all()
+    
+    def next_run(self):
+        """Prochaine échéance planifiée, ou None"""
+        with self.condition:
+            return min(self.next_due.values(), default=None)
+    
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Arrête le thread; un run en cours se termine normalement"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+    
+    def loop(self):
+        with self.condition:
+            while self.running:
+                now = datetime.now()
+                due = [entry for entry, moment in self.next_due.items() if moment <= now]
+                if not due:
+                    next_due = min(self.next_due.values(), default=None)
+                    timeout = self.MAX_WAIT
+                    if next_due is not None:
+                        timeout = min(timeout, max(0.0, (next_due - now).total_seconds()))
+                    self.condition.wait(timeout)
+                    continue
+                
+                self.logger.info(f"Run planifié ({', '.join(entry.expression for entry in due)})")
+                for entry in due:
+                    self.next_due[entry] = entry.next_after(now)
+                self.condition.release()
+                try:
+                    self.callback(due)
+                except Exception as e:
+                    self.logger.error(f"Erreur lors du run planifié: {e}")
+                finally:
+                    self.condition.acquire()
+                
+                # Les échéances passées pendant le run sont sautées
+                now = datetime.now()
+                for entry in self.entries:
+                    if self.next_due.get(entry, now) <= now:
+                        self.next_due[entry] = entry.next_after(now)
+
+class AdaptiveScheduler:
+    """Planification par dépôt selon la fréquence de changements observée
+    
+    Chaque dépôt a son propre intervalle de vérification, divisé par deux
+    quand un run y commite des fichiers et doublé sinon, entre min_interval
+    et max_interval. Les échéances sont gardées dans un tas: à chaque réveil,
+    les dépôts échus sont traités ensemble, les plus en retard d'abord, dans
+    la limite de max_checks vérifications par fenêtre de window secondes.
+    Les intervalles de départ sont estimés à partir de l'historique des runs.
+    """
+    
+    MAX_WAIT = 600
+    # Délai avant de réessayer quand un autre run occupe le verrou
+    BUSY_RETRY = 5
+    # Vérifications minimales dans l'historique pour se fier au taux de changement
+    MIN_HISTORY_RUNS = 3
+    
+    def __init__(self, committer, logger=None):
+        self.committer = committer
+        self.logger = logger or logging.getLogger(__name__)
+        self.condition = threading.Condition()
+        self.min_interval = 300
+        self.max_interval = 86400
+        self.max_checks = 0
+        self.window = 3600
+        self.heap = []
+        self.due = {}
+        self.intervals = {}
+        self.dispatched = deque()
+        self.next_discovery = 0.0
+        self.running = False
+        self.thread = None
+    
+    def configure(self, min_interval, max_interval, max_checks, window):
+        """Applique les paramètres et réveille le thread"""
+        with self.condition:
+            self.min_interval = max(1.0, float(min_interval))
+            self.max_interval = max(self.min_interval, float(max_interval))
+            self.max_checks = max(0, int(max_checks))
+            self.window = max(1.0, float(window))
+            for repo_path, interval in self.intervals.items():
+                self.intervals[repo_path] = self.clamp(interval)
+            self.next_discovery = 0.0
+            self.condition.notify_all()
+    
+    def clamp(self, interval):
+        return min(self.max_interval, max(self.min_interval, interval))
+    
+    def next_run(self):
+        """Prochaine vérification planifiée, ou None"""
+        with self.condition:
+            next_due = min(self.due.values(), default=None)
+        return datetime.fromtimestamp(next_due) if next_due is not None else None
+    
+    def start(self):
+        with self.condition:
+            if self.running:
+                return
+            self.running = True
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Arrête le thread; un run en cours se termine normalement"""
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+    
+    def schedule(self, repo_path, moment):
+        # Les entrées remplacées restent dans le tas et sont ignorées au dépilage
+        self.due[repo_path] = moment
+        heapq.heappush(self.heap, (moment, repo_path))
+    
+    def initial_interval(self, runs, changes):
+        """Intervalle de départ d'un dépôt d'après son taux de changement passé"""
+        if runs < self.MIN_HISTORY_RUNS:
+            return self.min_interval
+        if not changes:
+            return self.max_interval
+        return self.clamp(self.min_interval * runs / changes)
+    
+    def load_change_counts(self):
+        history = self.committer.get_run_history()
+        if history is None:
+            return {}
+        try:
+            return history.change_counts()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Historique illisible, intervalles par défaut: {e}")
+            return {}
+    
+    def sync_repositories(self, repositories, change_counts):
+        """Ajoute les nouveaux dépôts et oublie ceux qui ont disparu (sous le verrou)"""
+        now = time.time()
+        current = set(repositories)
+        for repo_path in list(self.due):
+            if repo_path not in current:
+                del self.due[repo_path]
+                self.intervals.pop(repo_path, None)
+        for repo_path in repositories:
+            if repo_path in self.due:
+                continue
+            counts = change_counts.get(self.committer.get_repo_name(repo_path))
+            if counts is None:
+                self.intervals[repo_path] = self.min_interval
+                self.schedule(repo_path, now)
+            else:
+                interval = self.initial_interval(*counts)
+                self.intervals[repo_path] = interval
+                # Étalement des premières vérifications des dépôts connus
+                self.schedule(repo_path, now + random.uniform(0, interval))
+    
+    def peek(self):
+        """Prochaine échéance valide du tas, ou None"""
+        while self.heap:
+            moment, repo_path = self.heap[0]
+            if self.due.get(repo_path) == moment:
+                return moment
+            heapq.heappop(self.heap)
+        return None
+    
+    def remaining_budget(self, now):
+        """Vérifications encore permises dans la fenêtre glissante"""
+        while self.dispatched and self.dispatched[0] <= now - self.window:
+            self.dispatched.popleft()
+        if not self.max_checks:
+            return len(self.due)
+        return self.max_checks - len(self.dispatched)
+    
+    def take_due(self, now):
+        """Dépile les dépôts échus, les plus en retard d'abord, dans la limite du budget"""
+        budget = self.remaining_budget(now)
+        batch = []
+        while len(batch) < budget:
+            moment = self.peek()
+            if moment is None or moment > now:
+                break
+            _, repo_path = heapq.heappop(self.heap)
+            del self.due[repo_path]
+            batch.append(repo_path)
+        self.dispatched.extend(now for _ in batch)
+        return batch
+    
+    def record_results(self, batch, run):
+        """Ajuste l'intervalle de chaque dépôt traité et replanifie sa vérification"""
+        now = time.time()
+        repo_metrics = {repo.repo_name: repo for repo in run.repos} if run is not None else {}
+        for repo_path in batch:
+            if repo_path not in self.intervals:
+                continue
+            metrics = repo_metrics.get(self.committer.get_repo_name(repo_path))
+            interval = self.intervals[repo_path]
+            if metrics is None or (metrics.status in FAILED_STATUSES and not metrics.files_changed):
+                # Erreur avant le commit: nouvel essai sans changer le rythme
+                self.schedule(repo_path, now + self.min_interval)
+                continue
+            if metrics.files_changed:
+                interval = self.clamp(interval / 2)
+            else:
+                interval = self.clamp(interval * 2)
+            self.intervals[repo_path] = interval
+            self.schedule(repo_path, now + interval)
+    
+    def loop(self):
+        change_counts = self.load_change_counts()
+        with self.condition:
+            while self.running:
+                now = time.time()
+                if now >= self.next_discovery:
+                    self.condition.release()
+                    try:
+                        repositories = self.committer.find_git_repositories()
+                    except Exception as e:
+                        self.logger.error(f"Erreur lors de la découverte des dépôts: {e}")
+                        repositories = None
+                    finally:
+                        self.condition.acquire()
+                    if repositories is not None:
+                        self.sync_repositories(repositories, change_counts)
+                    # Les nouveaux dépôts sont repérés au rythme de l'intervalle minimal
+                    self.next_discovery = time.time() + self.min_interval
+                    continue
+                
+                batch = self.take_due(now)
+                if not batch:
+                    wake = self.next_discovery
+                    next_due = self.peek()
+                    if next_due is not None:
+                        if self.remaining_budget(now) <= 0:
+                            # Budget épuisé: attente de la sortie de la plus ancienne vérification
+                            next_due = max(next_due, self.dispatched[0] + self.window)
+                        wake = min(wake, next_due)
+                    self.condition.wait(min(self.MAX_WAIT, max(0.0, wake - now)))
+                    continue
+                
+                deferred = sum(1 for moment in self.due.values() if moment <= now)
+                self.logger.info(f"Vérification adaptative de {len(batch)} dépôts"
+                                 + (f" ({deferred} reportés, limite atteinte)" if deferred else ""))
+                self.condition.release()
+                busy = False
+                run = None
+                try:
+                    if self.committer.run_lock.acquire(blocking=False):
+                        try:
+                            run = self.committer.process_repositories(batch, len(batch))
+                        finally:
+                            self.committer.run_lock.release()
+                    else:
+                        busy = True
+                except Exception as e:
+                    self.logger.error(f"Erreur lors de la vérification planifiée: {e}")
+                finally:
+                    self.condition.acquire()
+                
+                if busy:
+                    # Un autre run est en cours: les dépôts restent échus et hors budget
+                    for repo_path in batch:
+                        if repo_path in self.intervals:
+                            self.schedule(repo_path, now)
+                        self.dispatched.pop()
+                    self.condition.wait(self.BUSY_RETRY)
+                    continue
+                self.record_results(batch, run)
+
+DEFAULT_CONFIG = {
+    "commit_times": ["09:00", "18:00"],
+    "commit_message": "Auto commit - {date}",
+    "excluded_folders": [".git", "__pycache__", ".vscode", "node_modules"],
+    "excluded_files": [".exe", ".log", "config.json"],
+    "exclude_patterns": [],
+    "auto_push": True,
+    "max_workers": 4,
+    "push_per_remote_limit": 2,
+    "push_max_retries": 3,
+    "push_retry_delay": 2,
+    "discovery_depth": 1,
+    "include_nested_repos": False,
+    "workspace_roots": [],
+    "discovery_workers": 4,
+    "watch_mode": False,
+    "watch_backend": "auto",
+    "git_backend": "subprocess",
+    "metrics_file": "metrics.jsonl",
+    "metrics_max_bytes": 5 * 1024 * 1024,
+    "metrics_backup_count": 3,
+    "prometheus_file": "",
+    "prometheus_port": 0,
+    "status_cache_ttl": 30,
+    "log_format": "text",
+    "log_max_bytes": 10 * 1024 * 1024,
+    "log_backup_count": 5,
+    "log_rotate_when": "",
+    "log_compress": True,
+    "history_file": "run_history.db",
+    "history_retention_days": 90,
+    "journal_file": "run_journal.jsonl",
+    "adaptive_schedule": False,
+    "adaptive_min_interval": 300,
+    "adaptive_max_interval": 86400,
+    "adaptive_max_checks": 0,
+    "adaptive_window": 3600,
+    "max_file_size": 100 * 1024 * 1024,
+    "max_binary_file_size": 20 * 1024 * 1024,
+    "max_commit_size": 500 * 1024 * 1024,
+    "large_files_lfs": False,
+    "push_rebase_on_reject": True,
+    "push_ssh_multiplex": True,
+    "config_reload": True,
+    "config_reload_interval": 2,
+    "timeout_status": 300,
+    "timeout_add": 900,
+    "timeout_commit": 900,
+    "timeout_push": 600,
+    "timeout_other": 120
+}
+
+# Valeurs permises des paramètres à choix
+CONFIG_CHOICES = {
+    "log_format": ("text", "json"),
+    "watch_backend": ("auto", "inotify", "polling"),
+    "git_backend": tuple(GIT_BACKENDS)
+}
+
+# Durées en secondes acceptant une valeur décimale; les autres nombres sont entiers
+FLOAT_KEYS = {"push_retry_delay", "config_reload_interval", "timeout_status", "timeout_add",
+              "timeout_commit", "timeout_push", "timeout_other"}
+
+# Bornes (minimum, maximum ou None) des paramètres numériques, 0 par défaut au minimum
+CONFIG_RANGES = {
+    "max_workers": (1, None),
+    "discovery_workers": (1, None),
+    "push_per_remote_limit": (1, None),
+    "prometheus_port": (0, 65535),
+    "config_reload_interval": (0.1, None)
+}
+
+# Paramètres qu'une racine de workspace_roots peut redéfinir
+ROOT_KEYS = ("commit_times", "auto_push", "push_max_retries", "push_retry_delay", "push_rebase_on_reject",
+             "max_workers", "discovery_depth", "include_nested_repos")
+
+# Paramètres qui imposent de recalculer la planification
+SCHEDULE_KEYS = {"commit_times", "adaptive_schedule", "adaptive_min_interval", "adaptive_max_interval",
+                 "adaptive_max_checks", "adaptive_window", "workspace_roots"}
+
+# Paramètres lus une seule fois au démarrage du processus
+RESTART_KEYS = {"log_format", "log_max_bytes", "log_backup_count", "log_rotate_when", "log_compress"}
+
+def read_config_file(config_file):
+    """Lit config.json et complète les clés absentes par les valeurs par défaut"""
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError("la configuration doit être un objet JSON")
+    for key, value in DEFAULT_CONFIG.items():
+        if key not in config:
+            config[key] = copy.deepcopy(value)
+    return config
+
+def validate_setting(key, value):
+    """Message d'erreur d'un paramètre connu, ou None s'il est valide"""
+    if key == "workspace_roots":
+        return validate_workspace_roots(value)
+    default = DEFAULT_CONFIG[key]
+    if isinstance(default, bool):
+        valid = isinstance(value, bool)
+    elif key in FLOAT_KEYS:
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+    elif isinstance(default, int):
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    elif isinstance(default, list):
+        valid = isinstance(value, list) and all(isinstance(item, str) for item in value)
+    else:
+        valid = isinstance(value, str)
+    if not valid:
+        return f"{key}: valeur {value!r} invalide"
+    if key in CONFIG_CHOICES and value not in CONFIG_CHOICES[key]:
+        return f"{key}: {value!r} n'est pas parmi {', '.join(CONFIG_CHOICES[key])}"
+    
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        low, high = CONFIG_RANGES.get(key, (0, None))
+        if value < low or (high is not None and value > high):
+            bounds = f"entre {low} et {high}" if high is not None else f"au moins {low}"
+            return f"{key}: {value!r} hors limites ({bounds})"
+    if key == "commit_times":
+        for expression in value:
+            try:
+                parse_schedule_expression(expression)
+            except ValueError as e:
+                return f"commit_times: {e}"
+    if key == "exclude_patterns":
+        try:
+            ExclusionMatcher(value)
+        except re.error as e:
+            return f"exclude_patterns: motif invalide ({e})"
+    if key == "commit_message":
+        try:
+            value.format(date="")
+        except (KeyError, IndexError, ValueError) as e:
+            return f"commit_message: modèle invalide ({e})"
+    return None
+
+def validate_config(config):
+    """Vérifie chaque paramètre connu; retourne {clé: message d'erreur}"""
+    errors = {}
+    for key, default in DEFAULT_CONFIG.items():
+        error = validate_setting(key, config.get(key, default))
+        if error is not None:
+            errors[key] = error
+    return errors
+
+def unknown_config_keys(config):
+    """Clés de la configuration qui ne correspondent à aucun paramètre (fautes de frappe)"""
+    return sorted(key for key in config if key not in DEFAULT_CONFIG)
+
+def workspace_root_entry(entry):
+    """(nom, chemin, paramètres propres) d'une entrée de workspace_roots
+    
+    Une entrée est un chemin, ou un objet {"path", "name", paramètres de
+    ROOT_KEYS}. Le nom par défaut est celui du dossier.
+    """
+    if isinstance(entry, str):
+        entry = {"path": entry}
+    path = entry["path"]
+    name = entry.get("name") or os.path.basename(os.path.normpath(os.path.expanduser(path))) or path
+    overrides = {key: value for key, value in entry.items() if key in ROOT_KEYS}
+    return name, path, overrides
+
+def validate_workspace_roots(roots):
+    """Message d'erreur de workspace_roots, ou None si la liste est valide"""
+    if not isinstance(roots, list):
+        return f"workspace_roots: valeur {roots!r} invalide"
+    names = set()
+    for entry in roots:
+        if isinstance(entry, dict):
+            if not isinstance(entry.get("path"), str) or not entry["path"]:
+                return f"workspace_roots: racine sans \"path\" ({entry!r})"
+            if not isinstance(entry.get("name", ""), str):
+                return f"workspace_roots: nom {entry['name']!r} invalide"
+            unknown = sorted(set(entry) - set(ROOT_KEYS) - {"path", "name"})
+            if unknown:
+                return f"workspace_roots: paramètres non redéfinissables par racine: {', '.join(unknown)}"
+            for key in ROOT_KEYS:
+                error = validate_setting(key, entry[key]) if key in entry else None
+                if error is not None:
+                    return f"workspace_roots ({entry['path']}): {error}"
+        elif not isinstance(entry, str) or not entry:
+            return f"workspace_roots: racine {entry!r} invalide"
+        name = workspace_root_entry(entry)[0]
+        if name in names:
+            return f"workspace_roots: deux racines nommées {name!r}, précisez \"name\""
+        names.add(name)
+    return None
+
+def diff_config(old, new):
+    """Paramètres modifiés entre deux configurations: {clé: (ancienne, nouvelle)}"""
+    return {key: (old.get(key), new.get(key))
+            for key in sorted(old.keys() | new.keys()) if old.get(key) != new.get(key)}
+
+class ConfigWatcher:
+    """Surveille config.json et déclenche son rechargement quand il change
+    
+    Un os.stat toutes les interval secondes suffit pour un seul fichier. Le
+    fichier n'est relu qu'une fois sa signature (mtime, taille) stable
+    entre deux vérifications, pour ne pas lire une écriture en cours. La
+    signature n'est mémorisée qu'une fois le rechargement traité, pour
+    qu'un rechargement différé pendant un run soit retenté.
+    """
+    
+    def __init__(self, config_file, callback, interval=2.0, logger=None):
+        self.config_file = config_file
+        self.callback = callback
+        self.interval = interval
+        self.logger = logger or logging.getLogger(__name__)
+        self.stop_event = threading.Event()
+        self.signature = self.get_signature()
+        self.pending_signature = None
+        self.thread = None
+    
+    def get_signature(self):
+        try:
+            file_stat = os.stat(self.config_file)
+        except OSError:
+            return None
+        return file_stat.st_mtime_ns, file_stat.st_size
+    
+    def start(self):
+        self.thread = threading.Thread(target=self.loop, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        self.stop_event.set()
+    
+    def check(self):
+        """Recharge la configuration si le fichier a changé depuis le dernier rechargement"""
+        signature = self.get_signature()
+        if signature is None or signature == self.signature:
+            return
+        if signature != self.pending_signature:
+            self.pending_signature = signature
+            return
+        try:
+            handled = self.callback()
+        except Exception as e:
+            self.logger.error(f"Erreur lors du rechargement de la configuration: {e}")
+            handled = True
+        if handled:
+            self.signature = signature
+    
+    def loop(self):
+        while not self.stop_event.wait(self.interval):
+            self.check()
+
 class AutoGitCommitter:
-    def __init__(self, status_callback=None):
-        self.script_dir = get_base_dir()
+    def __init__(self, status_callback=None, base_dir=None, run_callback=None, console_log=True,
+                 config_callback=None):
+        self.script_dir = base_dir or get_base_dir()
         self.config_file = os.path.join(self.script_dir, "config.json")
+        self.index_file = os.path.join(self.script_dir, "repo_index.json")
         self.log_file = os.path.join(self.script_dir, "git_commits.log")
         self.status_callback = status_callback
+        self.run_callback = run_callback
+        self.config_callback = config_callback
+        
+        self.logger = logging.getLogger(__name__)
+        
+        # Charger ou créer la configuration, dont dépend le format des logs
+        config_created = not os.path.exists(self.config_file)
+        self.config_errors = []
+        self.config_warnings = []
+        self.config = self.load_config()
         
-        # Configuration du logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger(__name__)
+        # Configuration du logging (console désactivable pour les commandes d'interrogation)
+        self.log_listener = None
+        self.setup_logging(console_log)
+        if config_created:
+            self.logger.info(f"Fichier de configuration créé: {self.config_file}")
+        for error in self.config_errors:
+            self.logger.error(error)
+        for warning in self.config_warnings:
+            self.logger.warning(warning)
         
-        # Variables pour le contrôle du thread
+        # Variables pour le contrôle du service planifié
         self.running = False
-        self.worker_thread = None
+        self.scheduler = None
+        self.config_watcher = None
         
-        # Charger ou créer la configuration
-        self.config = self.load_config()
-
+        # Un seul run à la fois (planifié, manuel ou en ligne de commande)
+        self.run_lock = threading.Lock()
+        
+        # Processus git en cours, tués à leur délai ou à l'interruption du run
+        self.active_processes = set()
+        self.process_lock = threading.Lock()
+        self.cancel_event = threading.Event()
+        self.git_env = dict(os.environ, **GIT_NONINTERACTIVE_ENV)
+        
+        # Verrou pour sérialiser les notifications venant des workers
+        self.status_lock = threading.Lock()
+        
+        # Mesures du dépôt en cours de traitement, propres à chaque worker
+        self.git_stats = threading.local()
+        
+        self.git_backend = None
+        self.git_backend_lock = threading.Lock()
+        
+        # Racines de recherche des dépôts (workspace_roots), chacune avec son index,
+        # recréées si la configuration change
+        self.workspace_roots = None
+        self.workspace_settings = None
+        # Racine de chaque dépôt découvert, et racines déclenchées par chaque heure de commit
+        self.repo_roots = {}
+        self.schedule_roots = {}
+        self.exclusion_matcher = None
+        self.exclusion_settings = None
+        
+        # Surveillance des dépôts modifiés (mode watch)
+        self.watcher = None
+        
+        # Export des mesures de chaque run
+        self.metrics_exporter = None
+        self.metrics_settings = None
+        
+        # Historique des runs, ouvert au premier enregistrement ou à la première requête
+        self.run_history = None
+        self.run_history_file = None
+        
+        # Journal du run en cours, pour reprendre un run interrompu
+        self.run_journal = None
+        self.run_journal_file = None
+        self.active_journal = None
+        self.process_started_at = time.time()
+        
+        # Disponibilité de git-lfs, vérifiée au premier fichier volumineux
+        self.lfs_available = None
+        
+        # Résultats récents de git status (durée de validité lue à chaque accès)
+        self.status_cache = StatusCache(self.config["status_cache_ttl"])
+    
+    
+    def setup_logging(self, console_log):
+        """Configure le logging du processus, si ce n'est pas déjà fait
+        
+        Les threads de commit ne font que déposer les messages dans une queue;
+        l'écriture, la rotation et la compression ont lieu dans le thread du
+        QueueListener, pour qu'un disque lent ne ralentisse pas les commits.
+        """
+        root = logging.getLogger()
+        if root.handlers:
+            return
         
+        text_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        file_handler = create_log_file_handler(
+            self.log_file,
+            self.config["log_max_bytes"],
+            self.config["log_backup_count"],
+            rotate_when=self.config["log_rotate_when"],
+            compress=self.config["log_compress"]
+        )
+        file_handler.setFormatter(JsonLogFormatter() if self.config["log_format"] == "json" else text_formatter)
+        handlers = [file_handler]
+        if console_log:
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(text_formatter)
+            handlers.append(console_handler)
+        
+        log_queue = queue.SimpleQueue()
+        self.log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        self.log_listener.start()
+        # Vide la queue et ferme le fichier à la sortie du processus
+        atexit.register(self.log_listener.stop)
+        
+        root.addHandler(logging.handlers.QueueHandler(log_queue))
+        root.setLevel(logging.INFO)
     
-    def notify_status(self, repo_name, status, message=""):
+    def notify_status(self, repo_name, status, message="", progress=None):
         """Notifie le changement de statut à l'interface"""
+        metrics = self.current_metrics()
+        if metrics is None or metrics.repo_name != repo_name:
+            metrics = None
+        elif status == CommitStatus.FAILED and metrics.timed_out:
+            # Échec dû à une commande git arrêtée à son délai
+            status = CommitStatus.TIMED_OUT
+        if metrics is not None and status in FINAL_STATUSES:
+            metrics.status = status
+        else:
+            metrics = None
         if self.status_callback:
-            self.status_callback(StatusUpdate(repo_name, status, message))
+            with self.status_lock:
+                self.status_callback(StatusUpdate(repo_name, status, message, metrics=metrics, progress=progress))
     
     def load_config(self):
-        """Charge la configuration depuis le fichier JSON"""
-        default_config = {
-            "commit_times": ["09:00", "18:00"],
-            "commit_message": "Auto commit - {date}",
-            "excluded_folders": [".git", "__pycache__", ".vscode", "node_modules"],
-            "excluded_files": [".exe", ".log", "config.json"],
-            "auto_push": True
-        }
+        """Charge la configuration depuis le fichier JSON
         
+        Les valeurs invalides sont remplacées par leur valeur par défaut. Le
+        logging n'étant pas encore configuré, les erreurs sont conservées dans
+        config_errors (et les clés inconnues dans config_warnings) et
+        journalisées ensuite.
+        """
         if os.path.exists(self.config_file):
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                for key, value in default_config.items():
-                    if key not in config:
-                        config[key] = value
-                return config
+                config = read_config_file(self.config_file)
             except Exception as e:
-                self.logger.error(f"Erreur lors du chargement de la config: {e}")
-                return default_config
+                self.config_errors.append(f"Erreur lors du chargement de la config: {e}")
+                return copy.deepcopy(DEFAULT_CONFIG)
+            for key, error in validate_config(config).items():
+                self.config_errors.append(f"Configuration invalide, valeur par défaut utilisée pour {error}")
+                config[key] = copy.deepcopy(DEFAULT_CONFIG[key])
+            unknown = unknown_config_keys(config)
+            if unknown:
+                self.config_warnings.append(f"Paramètres inconnus ignorés dans la config: {', '.join(unknown)}")
+            return config
         else:
+            default_config = copy.deepcopy(DEFAULT_CONFIG)
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(default_config, f, indent=4, ensure_ascii=False)
-            self.logger.info(f"Fichier de configuration créé: {self.config_file}")
             return default_config
     
-    def save_config(self):
-        """Sauvegarde la configuration dans le fichier JSON"""
+    def reload_config(self):
+        """Relit config.json et applique ce qui a changé
+        
+        Une configuration invalide est rejetée en entier. Retourne False si
+        un run est en cours: le rechargement est alors retenté plus tard, pour
+        que le run se termine avec la configuration de son démarrage.
+        """
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=4, ensure_ascii=False)
+            config = read_config_file(self.config_file)
+        except (OSError, ValueError) as e:
+            self.logger.error(f"Rechargement de la configuration impossible: {e}")
+            return True
+        errors = validate_config(config)
+        if errors:
+            self.logger.error("Configuration rejetée, la configuration actuelle est conservée: " +
+                              "; ".join(errors.values()))
+            return True
+        unknown = unknown_config_keys(config)
+        if unknown:
+            self.logger.warning(f"Paramètres inconnus ignorés dans la config: {', '.join(unknown)}")
+        return self.update_config(config)
+    
+    def update_config(self, config):
+        """Applique une configuration déjà vérifiée, sauf pendant un run
+        
+        Retourne False si un run est en cours: l'appelant retente plus tard,
+        et le run se termine avec la configuration de son démarrage.
+        """
+        if not self.run_lock.acquire(blocking=False):
+            return False
+        try:
+            self.apply_config(config)
+        finally:
+            self.run_lock.release()
+        return True
+    
+    def apply_config(self, config):
+        """Remplace la configuration et n'applique que les paramètres modifiés"""
+        changes = diff_config(self.config, config)
+        if not changes:
+            return changes
+        self.config = config
+        self.logger.info("Configuration rechargée: " + ", ".join(
+            f"{key}: {old!r} → {new!r}" for key, (old, new) in changes.items()))
+        
+        if "status_cache_ttl" in changes:
+            self.status_cache.ttl = config["status_cache_ttl"]
+        if changes.keys() & {"watch_mode", "watch_backend", "excluded_folders", "excluded_files",
+                             "exclude_patterns"}:
+            # Le watcher est recréé au prochain run avec les nouveaux paramètres
+            self.close_watcher()
+        if changes.keys() & SCHEDULE_KEYS and self.running:
+            self.setup_schedule()
+        if changes.keys() & {"config_reload", "config_reload_interval"} and self.running:
+            self.setup_config_watcher()
+        restart_keys = sorted(changes.keys() & RESTART_KEYS)
+        if restart_keys:
+            self.logger.warning(f"Redémarrage nécessaire pour appliquer: {', '.join(restart_keys)}")
+        # Les autres paramètres (index des dépôts, backend git, workers, exports)
+        # sont relus ou recréés au prochain usage
+        if self.config_callback:
+            self.config_callback(changes)
+        return changes
+    
+    def save_config(self, config=None):
+        """Sauvegarde la configuration (par défaut celle en cours) dans le fichier JSON
+        
+        Le fichier est remplacé d'un bloc: le rechargement à chaud ne lit
+        jamais un fichier à moitié écrit.
+        """
+        try:
+            tmp_file = self.config_file + ".tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.config if config is None else config, f, indent=4, ensure_ascii=False)
+            os.replace(tmp_file, self.config_file)
             return True
         except Exception as e:
             self.logger.error(f"Erreur lors de la sauvegarde: {e}")
@@ -107,702 +2985,1266 @@ class AutoGitCommitter:
         """Vérifie si le dossier est un dépôt Git"""
         return os.path.exists(os.path.join(path, '.git'))
     
-    def has_changes(self, repo_path):
-        """Vérifie s'il y a des changements dans le dépôt"""
+    def begin_repo_metrics(self, repo_name):
+        """Démarre les mesures d'un dépôt pour le worker courant"""
+        self.git_stats.metrics = RepoMetrics(repo_name)
+        return self.git_stats.metrics
+    
+    def current_metrics(self):
+        return getattr(self.git_stats, 'metrics', None)
+    
+    def set_current_metrics(self, metrics):
+        self.git_stats.metrics = metrics
+    
+    def count_git_process(self, command):
+        """Comptabilise un processus git lancé par le worker courant"""
+        metrics = self.current_metrics()
+        if metrics is not None:
+            metrics.record_process(command)
+    
+    def record_git_result(self, exit_code, output_bytes, output_lines=0):
+        """Enregistre le code de sortie et la taille de sortie du dernier processus git"""
+        metrics = self.current_metrics()
+        if metrics is not None:
+            metrics.record_result(exit_code, output_bytes, output_lines)
+    
+    def record_bytes_pushed(self, byte_count):
+        metrics = self.current_metrics()
+        if metrics is not None:
+            metrics.bytes_pushed += byte_count
+    
+    def record_bytes_fetched(self, byte_count):
+        metrics = self.current_metrics()
+        if metrics is not None:
+            metrics.bytes_fetched += byte_count
+    
+    def get_git_backend(self):
+        """Retourne le backend git configuré, recréé si la configuration change"""
+        with self.git_backend_lock:
+            backend = self.git_backend
+            if backend is None or backend.requested_name != self.config["git_backend"]:
+                backend = create_git_backend(self.config["git_backend"], self)
+                backend.requested_name = self.config["git_backend"]
+                self.git_backend = backend
+                self.logger.info(f"Backend git: {backend.name}")
+            return backend
+    
+    def has_changes(self, repo_path, use_cache=True):
+        """Vérifie s'il y a des changements dans le dépôt
+        
+        Un résultat de moins de status_cache_ttl secondes est réutilisé.
+        """
+        self.status_cache.ttl = self.config["status_cache_ttl"]
+        if use_cache:
+            cached = self.status_cache.get(repo_path)
+            if cached is not None:
+                return cached
+        has_changes = self.get_git_backend().has_changes(repo_path)
+        self.status_cache.put(repo_path, has_changes)
+        return has_changes
+    
+    def run_git_command(self, command, repo_path, input=None, include_stderr=False, env=None, on_progress=None):
+        """Exécute une commande Git dans le dépôt spécifié
+        
+        En cas de succès, la sortie retournée est stdout, suivie de stderr si
+        include_stderr est demandé (git y écrit sa progression). La sortie est
+        lue au fil de l'eau et bornée à ses premières et dernières lignes
+        (OutputBuffer); on_progress reçoit chaque ligne de stderr dès sa lecture.
+        """
+        self.count_git_process(command)
+        stdin = subprocess.PIPE if input is not None else subprocess.DEVNULL
+        with self.git_process(command, repo_path, env, stdin=stdin, stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE) as process:
+            stdout, stderr = read_process_output(process, input, on_progress)
+        self.record_git_result(process.returncode, stdout.bytes + stderr.bytes, stdout.lines + stderr.lines)
+        if process.timed_out:
+            return False, timeout_message(process)
+        if process.returncode != 0 and self.cancel_event.is_set():
+            return False, f"Run interrompu pendant {' '.join(command[:2])}"
+        if process.returncode != 0:
+            return False, stderr.text()
+        return True, stdout.text() + stderr.text() if include_stderr else stdout.text()
+    
+    def get_git_timeout(self):
+        """Délai maximal (secondes) d'une commande git selon la phase en cours, ou None"""
+        metrics = self.current_metrics()
+        phase = metrics.current_phase if metrics is not None else None
+        timeout = self.config[GIT_TIMEOUT_KEYS.get(phase.name if phase is not None else None, "timeout_other")]
+        return timeout or None
+    
+    @contextmanager
+    def git_process(self, command, repo_path, env=None, **popen_args):
+        """Lance un processus git non interactif, tué avec ses enfants à son délai ou à l'interruption du run
+        
+        Le délai dépend de la phase en cours. Le processus reçoit les attributs
+        timeout et timed_out; les mesures du dépôt retiennent si la commande a
+        été arrêtée à son délai.
+        """
+        env = self.git_env if env is None else dict(env, **GIT_NONINTERACTIVE_ENV)
+        process = subprocess.Popen(command, cwd=repo_path, env=env, **popen_session_args(), **popen_args)
+        process.timeout = self.get_git_timeout()
+        process.timed_out = False
+        with self.process_lock:
+            self.active_processes.add(process)
+        timer = None
+        if process.timeout:
+            timer = threading.Timer(process.timeout, self.expire_git_process, (process, repo_path))
+            timer.daemon = True
+            timer.start()
         try:
-            result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return bool(result.stdout.strip())
-        except subprocess.CalledProcessError:
-            return False
+            yield process
+        except KeyboardInterrupt:
+            # Le processus, hors du groupe du terminal, ne reçoit pas le Ctrl+C
+            kill_process_trees([process])
+            raise
+        finally:
+            if timer is not None:
+                timer.cancel()
+            with self.process_lock:
+                self.active_processes.discard(process)
+            metrics = self.current_metrics()
+            if metrics is not None:
+                metrics.timed_out = process.timed_out
+    
+    def expire_git_process(self, process, repo_path):
+        """Arrête une commande git qui a dépassé son délai (appelé par le minuteur)"""
+        if process.poll() is not None:
+            return
+        process.timed_out = True
+        self.logger.warning(f"{timeout_message(process)} dans {self.get_repo_name(repo_path)}, arrêt du processus",
+                            extra=log_fields(self.get_repo_name(repo_path), status=CommitStatus.TIMED_OUT))
+        kill_process_trees([process])
+    
+    def cancel_run(self):
+        """Interrompt le run en cours: les processus git sont tués et aucun dépôt n'est commencé
+        
+        Les dépôts non terminés restent dans le journal et sont repris au
+        prochain run.
+        """
+        self.cancel_event.set()
+        with self.process_lock:
+            processes = list(self.active_processes)
+        if processes:
+            self.logger.warning(f"Interruption du run: arrêt de {len(processes)} processus git")
+        kill_process_trees(processes)
+    
+    def get_exclusion_matcher(self):
+        """Retourne les règles d'exclusion compilées, recompilées si la configuration a changé"""
+        settings = (
+            tuple(self.config["excluded_folders"]),
+            tuple(self.config["excluded_files"]),
+            tuple(self.config["exclude_patterns"])
+        )
+        if self.exclusion_matcher is None or self.exclusion_settings != settings:
+            self.exclusion_matcher = ExclusionMatcher(
+                legacy_exclusion_patterns(settings[0], settings[1]) + list(settings[2]))
+            self.exclusion_settings = settings
+        return self.exclusion_matcher
+    
+    def is_excluded_path(self, path):
+        """Indique si un chemin du dépôt est exclu par la configuration"""
+        return self.get_exclusion_matcher().is_excluded(path)
     
-    def run_git_command(self, command, repo_path):
-        """Exécute une commande Git dans le dépôt spécifié"""
+    def get_change_size(self, repo_path, change):
+        """Taille sur disque d'un changement (0 pour une suppression, un lien ou un sous-module)"""
         try:
-            result = subprocess.run(
-                command,
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                check=True
-            )
-            return True, result.stdout
-        except subprocess.CalledProcessError as e:
-            return False, e.stderr
+            file_stat = os.lstat(os.path.join(repo_path, change.path))
+        except OSError:
+            return 0
+        return file_stat.st_size if stat.S_ISREG(file_stat.st_mode) else 0
+    
+    def is_lfs_available(self):
+        """Indique si git-lfs est installé (vérifié une seule fois)"""
+        if self.lfs_available is None:
+            try:
+                result = subprocess.run(['git', 'lfs', 'version'], capture_output=True, timeout=30)
+                self.lfs_available = result.returncode == 0
+            except (OSError, subprocess.TimeoutExpired):
+                self.lfs_available = False
+            if self.config["large_files_lfs"] and not self.lfs_available:
+                self.logger.warning("git-lfs introuvable: les fichiers volumineux seront ignorés")
+        return self.lfs_available
+    
+    def apply_size_limits(self, repo_path, changes):
+        """Écarte les fichiers qui dépassent les limites de taille avant l'indexation
+        
+        Seule la taille donnée par lstat est consultée; le début du fichier
+        n'est lu que pour reconnaître un binaire au-delà de max_binary_file_size.
+        Les fichiers trop volumineux sont confiés à Git LFS si large_files_lfs
+        est actif, sinon ignorés. Les fichiers retenus, y compris ceux confiés
+        à LFS, le sont dans l'ordre de git status tant que leur total reste
+        sous max_commit_size; seul le premier peut dépasser ce budget à lui
+        seul. Les suivants sont reportés au prochain run. Retourne
+        (changements, fichiers écartés).
+        """
+        max_file_size = self.config["max_file_size"]
+        max_binary_size = self.config["max_binary_file_size"]
+        max_commit_size = self.config["max_commit_size"]
+        selected, large, skipped = [], [], []
+        total_size = 0
+        use_lfs = None
+        for change in changes:
+            # Un conflit doit être commité en entier pour terminer la fusion
+            size = 0 if change.kind == 'u' else self.get_change_size(repo_path, change)
+            reason = None
+            if max_file_size and size > max_file_size:
+                reason = "trop volumineux"
+            elif max_binary_size and size > max_binary_size and \
+                    is_binary_file(os.path.join(repo_path, change.path)):
+                reason = "binaire trop volumineux"
+            if reason is not None and use_lfs is None:
+                # Sans LFS utilisable, un gros fichier ne doit pas occuper le budget du commit
+                use_lfs = self.config["large_files_lfs"] and self.get_git_backend().name == "subprocess" \
+                    and self.is_lfs_available()
+            if reason is not None and not use_lfs:
+                skipped.append(SkippedFile(change, size, reason, False))
+                continue
+            if max_commit_size and (selected or large) and total_size + size > max_commit_size:
+                skipped.append(SkippedFile(change, size, "budget du commit atteint", True))
+                continue
+            total_size += size
+            if reason is not None:
+                large.append((change, size))
+            else:
+                selected.append(change)
+        
+        if large:
+            routed, failed = self.track_with_lfs(repo_path, [change for change, _ in large])
+            paths = {change.path for change in selected}
+            selected.extend(change for change in routed if change.path not in paths)
+            sizes = {change.path: size for change, size in large}
+            skipped.extend(SkippedFile(change, sizes[change.path], "LFS indisponible", False)
+                           for change in failed)
+        return selected, skipped
+    
+    def track_with_lfs(self, repo_path, changes):
+        """Déclare des fichiers dans Git LFS; retourne (changements à commiter, fichiers non suivis par LFS)
+        
+        Le filtre LFS n'est appliqué que par la commande git: les moteurs en
+        processus ignorent les fichiers volumineux.
+        """
+        if self.get_git_backend().name != "subprocess" or not self.is_lfs_available():
+            return [], changes
+        attributes_path = os.path.join(repo_path, '.gitattributes')
+        attributes_existed = os.path.exists(attributes_path)
+        success, output = self.run_git_command(
+            ['git', 'lfs', 'track', '--filename'] + [change.path for change in changes], repo_path
+        )
+        if not success:
+            self.logger.warning(f"git lfs track a échoué dans {self.get_repo_name(repo_path)}: {output}")
+            return [], changes
+        # .gitattributes modifié par git lfs track accompagne les fichiers dans le commit
+        attributes = FileChange('1', '.M', '.gitattributes', None) if attributes_existed else \
+            FileChange('?', '??', '.gitattributes', None)
+        self.logger.info(f"{len(changes)} fichier(s) volumineux confiés à Git LFS dans "
+                         f"{self.get_repo_name(repo_path)}")
+        return changes + [attributes], []
+    
+    def log_skipped_files(self, repo_name, skipped):
+        """Journalise les fichiers écartés, les plus gros d'abord"""
+        largest = sorted(skipped, key=lambda entry: entry.size, reverse=True)
+        details = ", ".join(f"{entry.change.path} ({format_bytes(entry.size)}, {entry.reason})"
+                            for entry in largest[:5])
+        if len(skipped) > 5:
+            details += f" et {len(skipped) - 5} autre(s)"
+        self.logger.warning(f"{len(skipped)} fichier(s) écarté(s) du commit dans {repo_name}: {details}",
+                            extra=log_fields(repo_name, "scan"))
     
-    def commit_repository(self, repo_path):
-        """Effectue un commit complet pour un dépôt"""
-        repo_name = os.path.basename(repo_path)
-        self.logger.info(f"Traitement du dépôt: {repo_name}")
+    def summarize_changes(self, changes):
+        """Résumé lisible des changements, utilisé dans le message de commit"""
+        counts = {"ajoutés": 0, "modifiés": 0, "supprimés": 0, "renommés": 0, "en conflit": 0}
+        for change in changes:
+            if change.kind == '?' or 'A' in change.xy:
+                counts["ajoutés"] += 1
+            elif change.kind == '2':
+                counts["renommés"] += 1
+            elif change.kind == 'u':
+                counts["en conflit"] += 1
+            elif 'D' in change.xy:
+                counts["supprimés"] += 1
+            else:
+                counts["modifiés"] += 1
+        details = ", ".join(f"{count} {label}" for label, count in counts.items() if count)
+        return f"{len(changes)} fichier(s): {details}"
+    
+    def commit_repository(self, repo_path, push_scheduler=None):
+        """Effectue un commit complet pour un dépôt
+        
+        Si un push_scheduler est fourni, le push est différé à la phase de push.
+        """
+        repo_name = self.get_repo_name(repo_path)
+        self.logger.info(f"Traitement du dépôt: {repo_name}",
+                         extra=log_fields(repo_name, status=CommitStatus.IN_PROGRESS))
         
         # Notification du début du traitement
         self.notify_status(repo_name, CommitStatus.IN_PROGRESS, "Vérification des changements...")
+        metrics = self.begin_repo_metrics(repo_name)
+        
+        # Un seul git status sert à la fois à décider du commit et à l'indexation
+        try:
+            with metrics.phase("status"):
+                changes = list(self.get_git_backend().iter_status(repo_path))
+        except Exception as e:
+            self.status_cache.invalidate(repo_path)
+            error = e.stderr if isinstance(e, subprocess.CalledProcessError) else str(e)
+            self.logger.error(f"Erreur lors de la vérification de {repo_name}: {error}",
+                              extra=log_fields(repo_name, "status", CommitStatus.FAILED,
+                                               metrics.phase_duration("status")))
+            self.notify_status(repo_name, CommitStatus.FAILED, f"Erreur de status: {error[:50]}...")
+            return False
         
-        if not self.has_changes(repo_path):
-            self.logger.info(f"Aucun changement détecté dans {repo_name}")
+        self.status_cache.put(repo_path, bool(changes))
+        if not changes:
+            self.logger.info(f"Aucun changement détecté dans {repo_name}",
+                             extra=log_fields(repo_name, "status", CommitStatus.SKIPPED,
+                                              metrics.phase_duration("status")))
             self.notify_status(repo_name, CommitStatus.SKIPPED, "Aucun changement détecté")
             return True
         
+        to_commit = [change for change in changes if not self.is_excluded_path(change.path)]
+        excluded_count = len(changes) - len(to_commit)
+        if not to_commit:
+            self.logger.info(f"Seuls des fichiers exclus ont changé dans {repo_name}",
+                             extra=log_fields(repo_name, "status", CommitStatus.SKIPPED,
+                                              metrics.phase_duration("status")))
+            self.notify_status(repo_name, CommitStatus.SKIPPED,
+                               f"Seuls des fichiers exclus ont changé ({excluded_count})")
+            return True
+        
+        # Les fichiers volumineux sont écartés (ou confiés à LFS) avant d'être hachés par git add
+        with metrics.phase("scan"):
+            to_commit, skipped = self.apply_size_limits(repo_path, to_commit)
+        if skipped:
+            metrics.files_skipped = len(skipped)
+            self.log_skipped_files(repo_name, skipped)
+            if self.watcher is not None and any(entry.deferred for entry in skipped):
+                # Les fichiers reportés doivent être repris au prochain run
+                self.watcher.mark_dirty(repo_path)
+        if not to_commit:
+            self.status_cache.put(repo_path, True)
+            self.notify_status(repo_name, CommitStatus.SKIPPED,
+                               f"Seuls des fichiers volumineux ont changé ({len(skipped)} ignorés)")
+            return True
+        
         # Ajout des fichiers
         self.notify_status(repo_name, CommitStatus.IN_PROGRESS, "Ajout des fichiers...")
-        success, output = self.run_git_command(['git', 'add', '.'], repo_path)
+        self.journal_record(repo_path, "add")
+        with metrics.phase("add"):
+            success, output = self.get_git_backend().stage(repo_path, to_commit)
         if not success:
-            self.logger.error(f"Erreur lors de l'ajout des fichiers dans {repo_name}: {output}")
+            self.status_cache.invalidate(repo_path)
+            self.logger.error(f"Erreur lors de l'ajout des fichiers dans {repo_name}: {output}",
+                              extra=log_fields(repo_name, "add", CommitStatus.FAILED,
+                                               metrics.phase_duration("add")))
             self.notify_status(repo_name, CommitStatus.FAILED, f"Erreur lors de l'ajout: {output[:50]}...")
             return False
         
         # Commit
         self.notify_status(repo_name, CommitStatus.IN_PROGRESS, "Création du commit...")
+        summary = self.summarize_changes(to_commit)
         commit_message = self.config["commit_message"].format(
             date=datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         )
+        commit_message = f"{commit_message}\n\n{summary}"
         
-        success, output = self.run_git_command(
-            ['git', 'commit', '-m', commit_message],
-            repo_path
-        )
+        self.journal_record(repo_path, "commit")
+        with metrics.phase("commit"):
+            success, output = self.get_git_backend().commit(repo_path, to_commit, commit_message)
         if not success:
-            self.logger.error(f"Erreur lors du commit dans {repo_name}: {output}")
+            self.status_cache.invalidate(repo_path)
+            self.logger.error(f"Erreur lors du commit dans {repo_name}: {output}",
+                              extra=log_fields(repo_name, "commit", CommitStatus.FAILED,
+                                               metrics.phase_duration("commit")))
             self.notify_status(repo_name, CommitStatus.FAILED, f"Erreur de commit: {output[:50]}...")
             return False
         
-        self.logger.info(f"Commit réalisé dans {repo_name}")
+        # Après le commit, seuls les fichiers exclus ou écartés restent modifiés
+        self.status_cache.put(repo_path, excluded_count > 0 or bool(skipped))
+        metrics.files_changed = len(to_commit)
         
-        # Push si activé
-        if self.config["auto_push"]:
+        self.logger.info(
+            f"Commit réalisé dans {repo_name} ({summary}, {excluded_count} exclus) - "
+            f"{metrics.subprocesses} processus git, "
+            f"{metrics.index_refreshes} rafraîchissements d'index",
+            extra=log_fields(repo_name, "commit", CommitStatus.SUCCESS, metrics.phase_duration("commit"))
+        )
+        
+        # Push si activé pour la racine du dépôt
+        auto_push = self.get_repo_config(repo_path)["auto_push"]
+        if auto_push and push_scheduler is not None:
+            self.journal_record(repo_path, RunJournal.PUSH_PHASE)
+            push_scheduler.enqueue(repo_path, metrics, self.get_push_policy(repo_path))
+            self.notify_status(repo_name, CommitStatus.PUSH_PENDING,
+                               "Commit réalisé, push en attente" + skipped_note(metrics))
+        elif auto_push:
             self.notify_status(repo_name, CommitStatus.IN_PROGRESS, "Push vers le dépôt distant...")
-            success, output = self.run_git_command(['git', 'push'], repo_path)
+            with metrics.phase("push"):
+                success, output = self.get_git_backend().push(
+                    repo_path, on_progress=ProgressReporter(self, repo_name, "Push vers le dépôt distant"))
             if not success:
-                self.logger.warning(f"Erreur lors du push dans {repo_name}: {output}")
+                self.logger.warning(f"Erreur lors du push dans {repo_name}: {output}",
+                                    extra=log_fields(repo_name, "push", CommitStatus.FAILED,
+                                                     metrics.phases[-1].duration))
                 self.notify_status(repo_name, CommitStatus.FAILED, f"Erreur de push: {output[:50]}...")
                 return False
-            self.logger.info(f"Push réalisé avec succès pour {repo_name}")
-            self.notify_status(repo_name, CommitStatus.SUCCESS, "Commit et push réalisés avec succès")
+            self.logger.info(f"Push réalisé avec succès pour {repo_name}",
+                             extra=log_fields(repo_name, "push", CommitStatus.SUCCESS,
+                                              metrics.phases[-1].duration))
+            self.notify_status(repo_name, CommitStatus.SUCCESS,
+                               "Commit et push réalisés avec succès" + skipped_note(metrics))
         else:
-            self.notify_status(repo_name, CommitStatus.SUCCESS, "Commit réalisé avec succès")
+            self.notify_status(repo_name, CommitStatus.SUCCESS, "Commit réalisé avec succès" + skipped_note(metrics))
         
         return True
     
-    def find_git_repositories(self):
-        """Trouve tous les dépôts Git dans le dossier courant"""
-        repositories = []
-        
-        for item in os.listdir(self.script_dir):
-            item_path = os.path.join(self.script_dir, item)
-            
-            if (item in self.config["excluded_folders"] or 
-                any(item.endswith(ext) for ext in self.config["excluded_files"])):
-                continue
-            
-            if os.path.isdir(item_path) and self.is_git_repository(item_path):
-                repositories.append(item_path)
+    def get_workspace_roots(self):
+        """Racines de recherche des dépôts, recréées si la configuration change
         
+        Sans workspace_roots, la seule racine est le dossier du script. Un
+        chemin relatif est pris depuis ce dossier.
+        """
+        settings = [self.config["workspace_roots"]] + [self.config[key] for key in ROOT_KEYS]
+        if self.workspace_roots is None or self.workspace_settings != settings:
+            roots = []
+            for entry in self.config["workspace_roots"]:
+                name, path, overrides = workspace_root_entry(entry)
+                path = os.path.abspath(os.path.join(self.script_dir, os.path.expanduser(path)))
+                digest = hashlib.sha1(path.encode('utf-8', errors='surrogateescape')).hexdigest()[:12]
+                config = {key: overrides.get(key, self.config[key]) for key in ROOT_KEYS}
+                roots.append(WorkspaceRoot(name, path, config, os.path.join(self.script_dir,
+                                                                          f"repo_index-{digest}.json")))
+            if not roots:
+                config = {key: self.config[key] for key in ROOT_KEYS}
+                roots.append(WorkspaceRoot("", self.script_dir, config, self.index_file))
+            self.workspace_roots = roots
+            self.workspace_settings = copy.deepcopy(settings)
+            self.repo_roots = {}
+        return self.workspace_roots
+    
+    def get_repo_root(self, repo_path):
+        """Racine d'un dépôt: celle qui l'a découvert, sinon la plus profonde qui le contient"""
+        root = self.repo_roots.get(repo_path)
+        if root is not None:
+            return root
+        containing = [root for root in self.get_workspace_roots() if root.contains(repo_path)]
+        return max(containing, key=lambda root: len(root.path), default=None)
+    
+    def get_commit_times(self):
+        """commit_times effectifs de toutes les racines, sans doublons, dans leur ordre"""
+        times = []
+        for root in self.get_workspace_roots():
+            for expression in root.config["commit_times"]:
+                if expression not in times:
+                    times.append(expression)
+        return times
+    
+    def has_schedule(self):
+        """Vrai si le service a de quoi planifier: mode adaptatif ou commit_times d'une racine"""
+        return bool(self.config["adaptive_schedule"] or self.get_commit_times())
+    
+    def get_repo_config(self, repo_path):
+        """Paramètres de ROOT_KEYS d'un dépôt, tels que redéfinis par sa racine"""
+        root = self.get_repo_root(repo_path)
+        return root.config if root is not None else self.config
+    
+    def get_push_policy(self, repo_path):
+        config = self.get_repo_config(repo_path)
+        return PushPolicy(config["push_max_retries"], config["push_retry_delay"], config["push_rebase_on_reject"])
+    
+    def get_repo_name(self, repo_path):
+        """Nom affiché d'un dépôt: son chemin relatif à sa racine, préfixé du nom de la racine"""
+        root = self.get_repo_root(repo_path)
+        if root is not None:
+            return root.repo_name(repo_path)
+        return os.path.relpath(repo_path, self.script_dir).replace(os.sep, '/')
+    
+    def get_repo_index(self, root):
+        """Retourne l'index des dépôts d'une racine, recréé si les paramètres ont changé"""
+        matcher = self.get_exclusion_matcher()
+        settings = (
+            matcher.patterns,
+            root.config["discovery_depth"],
+            root.config["include_nested_repos"]
+        )
+        if root.index is None or root.index_settings != settings:
+            root.index = RepositoryIndex(
+                root.index_file,
+                root.path,
+                matcher,
+                max_depth=root.config["discovery_depth"],
+                include_nested=root.config["include_nested_repos"],
+                logger=self.logger
+            )
+            root.index_settings = settings
+        return root.index
+    
+    def scan_root(self, root):
+        """Dépôts d'une racine, une racine absente (disque débranché) n'en ayant aucun"""
+        if not os.path.isdir(root.path):
+            self.logger.warning(f"Racine introuvable, ignorée: {root.path}")
+            return []
+        index = self.get_repo_index(root)
+        repositories = index.find_repositories()
+        self.logger.debug(f"Découverte{f' ({root.name})' if root.name else ''}: {len(repositories)} dépôts, "
+                          f"{index.listdir_count} dossiers relus")
         return repositories
     
-    def commit_all_repositories(self):
-        """Effectue les commits pour tous les dépôts trouvés"""
-        self.logger.info("=== Début du processus de commit automatique ===")
-        
-        repositories = self.find_git_repositories()
-        
-        if not repositories:
-            self.logger.info("Aucun dépôt Git trouvé dans le dossier")
-            return
+    def find_git_repositories(self, root_names=None):
+        """Trouve tous les dépôts Git des racines (toutes, ou celles de root_names)
         
-        self.logger.info(f"Dépôts trouvés: {[os.path.basename(repo) for repo in repositories]}")
+        Chaque racine est parcourue par son propre worker de découverte. Un
+        dépôt présent sous deux racines imbriquées appartient à la première.
+        """
+        roots = [root for root in self.get_workspace_roots() if root_names is None or root.name in root_names]
+        workers = min(len(roots), self.config["discovery_workers"])
+        if workers <= 1:
+            found = [self.scan_root(root) for root in roots]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discovery") as executor:
+                found = list(executor.map(self.scan_root, roots))
+        repositories = []
+        repo_roots = {}
+        for root, root_repositories in zip(roots, found):
+            for repo_path in root_repositories:
+                if repo_path not in repo_roots:
+                    repo_roots[repo_path] = root
+                    repositories.append(repo_path)
+        self.repo_roots = dict(self.repo_roots, **repo_roots)
+        return repositories
+    
+    def get_watcher(self):
+        """Retourne le watcher des dépôts, créé au premier run en mode watch"""
+        if self.watcher is None:
+            self.watcher = create_watcher(
+                self.config["watch_backend"],
+                self.get_exclusion_matcher(),
+                logger=self.logger
+            )
+            self.logger.info(f"Surveillance des dépôts active ({self.watcher.backend_name})")
+        return self.watcher
+    
+    def close_watcher(self):
+        if self.watcher is not None:
+            self.watcher.close()
+            self.watcher = None
+    
+    def select_changed_repositories(self, repositories, full_scan=False):
+        """Filtre les dépôts sans événement depuis le dernier run (mode watch)"""
+        if not self.config["watch_mode"]:
+            return repositories
         
-        # Initialiser le statut des repos
-        for repo_path in repositories:
-            repo_name = os.path.basename(repo_path)
-            self.notify_status(repo_name, CommitStatus.PENDING, "En attente de traitement")
+        watcher = self.get_watcher()
+        watcher.update_repositories(repositories)
+        if full_scan:
+            watcher.force_full_scan()
+        dirty = watcher.take_dirty()
         
-        success_count = 0
+        changed = [repo_path for repo_path in repositories if repo_path in dirty]
         for repo_path in repositories:
-            if self.commit_repository(repo_path):
-                success_count += 1
+            if repo_path not in dirty:
+                self.notify_status(self.get_repo_name(repo_path), CommitStatus.SKIPPED,
+                                   "Aucune modification depuis le dernier run")
         
-        self.logger.info(f"=== Fin du processus: {success_count}/{len(repositories)} dépôts traités avec succès ===")
+        # Chaque dépôt ignoré économise au moins un git status
+        self.logger.info(
+            f"Mode watch: {len(changed)}/{len(repositories)} dépôts modifiés, "
+            f"{len(repositories) - len(changed)} processus git évités"
+        )
+        return changed
     
-    def setup_schedule(self):
-        """Configure la planification des commits"""
-        schedule.clear()
-        for commit_time in self.config["commit_times"]:
-            schedule.every().day.at(commit_time).do(self.commit_all_repositories)
-            self.logger.info(f"Commit programmé à {commit_time}")
-    
-    def worker_loop(self):
-        """Boucle de travail en arrière-plan"""
-        self.setup_schedule()
-        while self.running:
-            schedule.run_pending()
-            time.sleep(60)
+    def commit_all_repositories(self, full_scan=False, root_names=None):
+        """Effectue les commits pour tous les dépôts trouvés
+        
+        En mode watch, seuls les dépôts modifiés depuis le dernier run sont
+        traités, sauf si full_scan est demandé. root_names limite le run aux
+        dépôts de ces racines. Retourne les mesures du run, ou None si aucun
+        dépôt n'a été traité ou si un run est déjà en cours.
+        """
+        if not self.run_lock.acquire(blocking=False):
+            self.logger.warning("Un run est déjà en cours, nouveau run ignoré")
+            return None
+        try:
+            return self.run_all_repositories(full_scan, root_names)
+        finally:
+            self.run_lock.release()
     
-    def start_worker(self):
-        """Démarre le processus en arrière-plan"""
-        if not self.running:
-            self.running = True
-            self.worker_thread = threading.Thread(target=self.worker_loop, daemon=True)
-            self.worker_thread.start()
-            self.logger.info("Service de commit automatique démarré")
+    def is_run_in_progress(self):
+        return self.run_lock.locked()
     
-    def stop_worker(self):
-        """Arrête le processus en arrière-plan"""
-        if self.running:
-            self.running = False
-            self.logger.info("Service de commit automatique arrêté")
-
-class StatusMonitor:
-    def __init__(self, parent):
-        self.parent = parent
-        self.status_queue = queue.Queue()
+    def run_all_repositories(self, full_scan, root_names=None):
+        """Corps d'un run, appelé sous run_lock"""
+        self.logger.info("=== Début du processus de commit automatique ===")
         
-        # Dictionnaire pour stocker les statuts des repos
-        self.repo_statuses = {}
+        repositories = self.find_git_repositories(root_names)
+        
+        if not repositories:
+            self.logger.info("Aucun dépôt Git trouvé dans le dossier")
+            return None
         
-        self.setup_ui()
+        self.logger.info(f"Dépôts trouvés: {[self.get_repo_name(repo) for repo in repositories]}")
         
-        # Vérifier les mises à jour de statut
-        self.check_status_updates()
+        total_count = len(repositories)
+        repositories = self.select_changed_repositories(repositories, full_scan)
+        if not repositories:
+            self.logger.info("=== Fin du processus: aucun dépôt modifié ===")
+            return None
+        return self.process_repositories(repositories, total_count)
     
-    def setup_ui(self):
-        """Configure l'interface du moniteur de statut"""
-        # Frame principal
-        self.frame = ttk.LabelFrame(self.parent, text="📊 Moniteur de Statut des Commits")
-        self.frame.pack(fill='both', expand=True, padx=5, pady=5)
+    def process_repositories(self, repositories, total_count):
+        """Commit puis push d'une liste de dépôts, appelé sous run_lock
         
-        # Canvas avec scrollbar pour les statuts
-        canvas_frame = ttk.Frame(self.frame)
-        canvas_frame.pack(fill='both', expand=True, padx=5, pady=5)
+        Sert aux runs complets comme aux lots de la planification adaptative.
+        Les dépôts laissés inachevés par un run interrompu y sont ajoutés.
+        Retourne les mesures du run, ou None s'il n'y a rien à traiter.
+        """
+        resumed_commits, resumed_pushes = self.recover_interrupted_run()
+        known = set(repositories)
+        added = [repo_path for repo_path in resumed_commits if repo_path not in known]
+        repositories = list(repositories) + added
+        total_count += len(added)
+        # Dépôts à pousser sans passer par la phase de commit
+        push_only = [repo_path for repo_path in resumed_pushes if repo_path not in known]
+        if not repositories and not push_only:
+            return None
+        
+        # Initialiser le statut des repos
+        for repo_path in repositories:
+            repo_name = self.get_repo_name(repo_path)
+            self.notify_status(repo_name, CommitStatus.PENDING, "En attente de traitement")
+        for repo_path in push_only:
+            self.notify_status(self.get_repo_name(repo_path), CommitStatus.PUSH_PENDING,
+                               "Reprise du push interrompu")
         
-        self.canvas = tk.Canvas(canvas_frame, height=200, bg='white')
-        scrollbar = ttk.Scrollbar(canvas_frame, orient='vertical', command=self.canvas.yview)
-        self.scrollable_frame = ttk.Frame(self.canvas)
+        self.cancel_event.clear()
+        self.active_journal = self.get_run_journal()
+        if self.active_journal is not None:
+            self.active_journal.begin(repositories + push_only)
+            for repo_path in resumed_pushes:
+                self.active_journal.record(repo_path, RunJournal.PUSH_PHASE)
         
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+        # Chaque racine a son propre pool de workers, limité par son max_workers
+        shards = {}
+        for repo_path in repositories:
+            shards.setdefault(self.get_repo_root(repo_path), []).append(repo_path)
+        shard_workers = {root: self.get_max_workers(len(shard), self.get_repo_config(shard[0]))
+                         for root, shard in shards.items()}
+        max_workers = max(1, sum(shard_workers.values()))
+        push_scheduler = PushScheduler(
+            self,
+            per_remote_limit=self.config["push_per_remote_limit"],
+            max_retries=self.config["push_max_retries"],
+            retry_delay=self.config["push_retry_delay"],
+            rebase_on_reject=self.config["push_rebase_on_reject"],
+            ssh_multiplex=self.config["push_ssh_multiplex"]
         )
+        run = RunMetrics()
+        run_start = time.perf_counter()
         
-        self.canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        # Phase 1: commits locaux. Chaque dépôt est traité entièrement par un
+        # seul worker: l'ordre status -> add -> commit est conservé par dépôt
+        resumed_push_set = set(resumed_pushes)
         
-        self.canvas.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
+        def commit_job(repo_path):
+            return self.timed_commit_repository(repo_path, push_scheduler, repo_path in resumed_push_set)
         
-        # Frame pour les widgets de statut
-        self.status_widgets = {}
+        if max_workers == 1:
+            results = [commit_job(repo_path) for repo_path in repositories]
+        else:
+            with ExitStack() as stack:
+                futures = {}
+                for root, shard in shards.items():
+                    executor = stack.enter_context(ThreadPoolExecutor(
+                        max_workers=shard_workers[root],
+                        thread_name_prefix=f"git-worker-{root.name}" if root is not None and root.name
+                        else "git-worker"
+                    ))
+                    for repo_path in shard:
+                        futures[repo_path] = executor.submit(commit_job, repo_path)
+                try:
+                    results = [futures[repo_path].result() for repo_path in repositories]
+                except KeyboardInterrupt:
+                    # Sans cela, la sortie du bloc attendrait chaque dépôt en file
+                    self.cancel_run()
+                    raise
+        commit_time = time.perf_counter() - run_start
         
-        # Message initial
-        initial_label = ttk.Label(self.scrollable_frame, text="🔄 En attente du premier commit...", 
-                                 font=('Arial', 10, 'italic'))
-        initial_label.pack(pady=20)
+        # Les push interrompus sont repris même si le dépôt n'a plus de changement. Un
+        # dépôt passé par la phase de commit garde ses mesures: il ne compte qu'une fois
+        commit_metrics = {repo_path: metrics for repo_path, (_, _, metrics) in zip(repositories, results)}
+        resumed_metrics = []
+        for repo_path in resumed_pushes:
+            if repo_path in push_scheduler.metrics:
+                continue
+            metrics = commit_metrics.get(repo_path)
+            if repo_path not in commit_metrics:
+                metrics = RepoMetrics(self.get_repo_name(repo_path))
+                resumed_metrics.append(metrics)
+            push_scheduler.enqueue(repo_path, metrics, self.get_push_policy(repo_path))
         
-        # Statistiques globales
-        stats_frame = ttk.Frame(self.frame)
-        stats_frame.pack(fill='x', padx=5, pady=5)
+        # Phase 2: push des dépôts commités, avec limite par hôte distant
+        push_results = push_scheduler.run(max_workers)
+        if self.active_journal is not None:
+            if self.cancel_event.is_set():
+                # Sans ligne de fin, le run sera repris
+                self.active_journal.close()
+                self.logger.warning("Run interrompu: les dépôts non terminés seront repris au prochain run")
+            else:
+                self.active_journal.finish()
+            self.active_journal = None
         
-        self.stats_label = ttk.Label(stats_frame, text="📈 Statistiques: 0 dépôts", 
-                                   font=('Arial', 9, 'bold'))
-        self.stats_label.pack(side='left')
+        wall_time = time.perf_counter() - run_start
+        summed_time = (sum(duration for _, duration, _ in results) +
+                       sum(duration for _, duration in push_results.values()))
+        run.wall_time = wall_time
+        run.repos = [metrics for _, _, metrics in results if metrics is not None] + resumed_metrics
+        success_count = sum(push_results.get(repo_path, (False, 0))[0] for repo_path in push_only)
+        for repo_path, (success, _, _) in zip(repositories, results):
+            if success and push_results.get(repo_path, (True, 0))[0]:
+                success_count += 1
+            elif self.watcher is not None:
+                # Un dépôt en échec doit être retraité au prochain run
+                self.watcher.mark_dirty(repo_path)
         
-        self.last_run_label = ttk.Label(stats_frame, text="⏰ Dernier run: Jamais", 
-                                      font=('Arial', 9))
-        self.last_run_label.pack(side='right')
-    
-    def get_status_icon(self, status):
-        """Retourne l'icône correspondant au statut"""
-        icons = {
-            CommitStatus.PENDING: "⏳",
-            CommitStatus.IN_PROGRESS: "🔄",
-            CommitStatus.SUCCESS: "✅",
-            CommitStatus.FAILED: "❌",
-            CommitStatus.SKIPPED: "⏭️"
-        }
-        return icons.get(status, "❓")
-    
-    def get_status_color(self, status):
-        """Retourne la couleur correspondant au statut"""
-        colors = {
-            CommitStatus.PENDING: "#FFA500",  # Orange
-            CommitStatus.IN_PROGRESS: "#1E90FF",  # Bleu
-            CommitStatus.SUCCESS: "#32CD32",  # Vert
-            CommitStatus.FAILED: "#FF4500",  # Rouge
-            CommitStatus.SKIPPED: "#696969"  # Gris
-        }
-        return colors.get(status, "#000000")
+        self.logger.info(f"=== Fin du processus: {success_count}/{len(repositories) + len(push_only)} "
+                         f"dépôts traités avec succès ===")
+        if total_count != len(repositories):
+            self.logger.info(f"{total_count - len(repositories)} dépôts non modifiés ignorés")
+        self.logger.info(
+            f"Durée totale: {wall_time:.2f}s (commits: {commit_time:.2f}s, "
+            f"push: {wall_time - commit_time:.2f}s) | Temps cumulé par dépôt: {summed_time:.2f}s "
+            f"| Workers: {max_workers}"
+        )
+        self.report_run_metrics(run)
+        return run
     
-    def add_status_update(self, update):
-        """Ajoute une mise à jour de statut à la queue"""
-        self.status_queue.put(update)
+    def get_max_workers(self, repo_count, config=None):
+        """Retourne le nombre de workers à utiliser pour un run (ou pour une racine, selon sa config)"""
+        config = self.config if config is None else config
+        try:
+            max_workers = int(config.get("max_workers", 1))
+        except (TypeError, ValueError):
+            max_workers = 1
+        return max(1, min(max_workers, repo_count))
     
-    def check_status_updates(self):
-        """Vérifie et traite les mises à jour de statut"""
+    def timed_commit_repository(self, repo_path, push_scheduler=None, push_resumed=False):
+        """Effectue le commit d'un dépôt et retourne (succès, durée, mesures)
+        
+        push_resumed indique un push interrompu à reprendre après la phase de
+        commit: le dépôt n'est alors pas marqué terminé dans le journal.
+        """
+        start = time.perf_counter()
+        self.set_current_metrics(None)
+        if self.cancel_event.is_set():
+            self.notify_status(self.get_repo_name(repo_path), CommitStatus.SKIPPED,
+                               "Run interrompu, repris au prochain run")
+            return False, 0.0, None
         try:
-            while True:
-                update = self.status_queue.get_nowait()
-                self.update_repo_status(update)
-        except queue.Empty:
+            success = self.commit_repository(repo_path, push_scheduler)
+        except Exception as e:
+            repo_name = self.get_repo_name(repo_path)
+            self.logger.error(f"Erreur inattendue dans {repo_name}: {e}")
+            self.notify_status(repo_name, CommitStatus.FAILED, f"Erreur inattendue: {str(e)[:50]}...")
+            success = False
+        if self.cancel_event.is_set():
+            # Commande interrompue: le dépôt sera repris depuis sa dernière phase
             pass
-        
-        # Programmer la prochaine vérification
-        self.parent.after(100, self.check_status_updates)
+        elif push_resumed:
+            # Le commit a pu remplacer la phase du journal: le push reste à reprendre
+            self.journal_record(repo_path, RunJournal.PUSH_PHASE)
+        elif push_scheduler is None or repo_path not in push_scheduler.metrics:
+            self.journal_record(repo_path, "done" if success else "failed")
+        metrics = self.current_metrics()
+        self.set_current_metrics(None)
+        return success, time.perf_counter() - start, metrics
     
-    def update_repo_status(self, update):
-        """Met à jour le statut d'un dépôt"""
-        repo_name = update.repo_name
-        
-        # Mettre à jour le dictionnaire de statut
-        self.repo_statuses[repo_name] = update
-        
-        # Supprimer le message initial si nécessaire
-        for widget in self.scrollable_frame.winfo_children():
-            if isinstance(widget, ttk.Label) and "En attente du premier commit" in widget.cget("text"):
-                widget.destroy()
-        
-        # Créer ou mettre à jour le widget de statut pour ce repo
-        if repo_name not in self.status_widgets:
-            self.create_status_widget(repo_name)
-        
-        self.update_status_widget(repo_name, update)
-        self.update_global_stats()
+    def get_metrics_exporter(self):
+        """Retourne l'exporteur de mesures, recréé si sa configuration change"""
+        settings = (
+            self.config["metrics_file"],
+            self.config["metrics_max_bytes"],
+            self.config["metrics_backup_count"],
+            self.config["prometheus_file"],
+            self.config["prometheus_port"]
+        )
+        if self.metrics_exporter is None or self.metrics_settings != settings:
+            if self.metrics_exporter is not None:
+                self.metrics_exporter.close()
+            metrics_file, max_bytes, backup_count, prometheus_file, prometheus_port = settings
+            self.metrics_exporter = MetricsExporter(
+                os.path.join(self.script_dir, metrics_file) if metrics_file else None,
+                max_bytes,
+                backup_count,
+                prometheus_file=os.path.join(self.script_dir, prometheus_file) if prometheus_file else None,
+                prometheus_port=prometheus_port,
+                logger=self.logger
+            )
+            self.metrics_settings = settings
+        return self.metrics_exporter
     
-    def create_status_widget(self, repo_name):
-        """Crée un nouveau widget de statut pour un dépôt"""
-        frame = ttk.Frame(self.scrollable_frame, relief='solid', borderwidth=1)
-        frame.pack(fill='x', padx=5, pady=2)
-        
-        # Ligne principale avec icône, nom et statut
-        main_frame = ttk.Frame(frame)
-        main_frame.pack(fill='x', padx=5, pady=3)
-        
-        icon_label = ttk.Label(main_frame, text="⏳", font=('Arial', 14))
-        icon_label.pack(side='left', padx=(0, 5))
-        
-        name_label = ttk.Label(main_frame, text=f"📁 {repo_name}", font=('Arial', 10, 'bold'))
-        name_label.pack(side='left')
-        
-        status_label = ttk.Label(main_frame, text="En attente...", font=('Arial', 9))
-        status_label.pack(side='right')
-        
-        # Ligne de détails
-        detail_frame = ttk.Frame(frame)
-        detail_frame.pack(fill='x', padx=5, pady=(0, 3))
-        
-        message_label = ttk.Label(detail_frame, text="", font=('Arial', 8), foreground='gray')
-        message_label.pack(side='left')
-        
-        time_label = ttk.Label(detail_frame, text="", font=('Arial', 8), foreground='gray')
-        time_label.pack(side='right')
-        
-        # Barre de progression (pour les statuts en cours)
-        progress_bar = ttk.Progressbar(frame, mode='indeterminate')
-        
-        self.status_widgets[repo_name] = {
-            'frame': frame,
-            'icon': icon_label,
-            'name': name_label,
-            'status': status_label,
-            'message': message_label,
-            'time': time_label,
-            'progress': progress_bar
-        }
+    def get_run_history(self):
+        """Retourne l'historique des runs, ou None s'il est désactivé (history_file vide)"""
+        history_file = self.config["history_file"]
+        if not history_file:
+            return None
+        history_file = os.path.join(self.script_dir, history_file)
+        if self.run_history is None or self.run_history_file != history_file:
+            self.run_history = RunHistory(history_file)
+            self.run_history_file = history_file
+        return self.run_history
     
-    def update_status_widget(self, repo_name, update):
-        """Met à jour un widget de statut existant"""
-        if repo_name not in self.status_widgets:
-            return
-        
-        widgets = self.status_widgets[repo_name]
-        
-        # Mettre à jour l'icône et la couleur
-        icon = self.get_status_icon(update.status)
-        color = self.get_status_color(update.status)
-        
-        widgets['icon'].config(text=icon)
-        widgets['status'].config(text=update.status.value.replace('_', ' ').title(), foreground=color)
-        
-        # Mettre à jour le message
-        widgets['message'].config(text=update.message if update.message else "")
-        
-        # Mettre à jour l'horodatage
-        time_str = update.timestamp.strftime("%H:%M:%S")
-        widgets['time'].config(text=time_str)
+    def get_run_journal(self):
+        """Retourne le journal des runs, ou None s'il est désactivé (journal_file vide)"""
+        journal_file = self.config["journal_file"]
+        if not journal_file:
+            return None
+        journal_file = os.path.join(self.script_dir, journal_file)
+        if self.run_journal is None or self.run_journal_file != journal_file:
+            self.run_journal = RunJournal(journal_file, self.logger)
+            self.run_journal_file = journal_file
+        return self.run_journal
+    
+    def journal_record(self, repo_path, phase):
+        """Enregistre une transition de phase dans le journal du run en cours"""
+        if self.active_journal is not None:
+            self.active_journal.record(repo_path, phase)
+    
+    def has_interrupted_run(self):
+        """Indique si le dernier run a été interrompu avant sa fin"""
+        journal = self.get_run_journal()
+        return journal is not None and not self.run_lock.locked() and bool(journal.load_interrupted())
+    
+    def recover_interrupted_run(self):
+        """Nettoie les dépôts d'un run interrompu, appelé sous run_lock
         
-        # Gérer la barre de progression
-        if update.status == CommitStatus.IN_PROGRESS:
-            widgets['progress'].pack(fill='x', padx=5, pady=(0, 3))
-            widgets['progress'].start(10)
-        else:
-            widgets['progress'].stop()
-            widgets['progress'].pack_forget()
-        
-        # Faire défiler vers le bas
-        self.canvas.update_idletasks()
-        self.canvas.yview_moveto(1.0)
-    
-    def update_global_stats(self):
-        """Met à jour les statistiques globales"""
-        total = len(self.repo_statuses)
-        success = sum(1 for status in self.repo_statuses.values() if status.status == CommitStatus.SUCCESS)
-        failed = sum(1 for status in self.repo_statuses.values() if status.status == CommitStatus.FAILED)
-        in_progress = sum(1 for status in self.repo_statuses.values() if status.status == CommitStatus.IN_PROGRESS)
-        
-        stats_text = f"📈 Total: {total} | ✅ Succès: {success} | ❌ Échecs: {failed}"
-        if in_progress > 0:
-            stats_text += f" | 🔄 En cours: {in_progress}"
-        
-        self.stats_label.config(text=stats_text)
-        
-        # Mettre à jour l'heure du dernier run
-        if self.repo_statuses:
-            latest_time = max(status.timestamp for status in self.repo_statuses.values())
-            self.last_run_label.config(text=f"⏰ Dernier run: {latest_time.strftime('%H:%M:%S')}")
-    
-    def clear_status(self):
-        """Efface tous les statuts"""
-        for widgets in self.status_widgets.values():
-            widgets['frame'].destroy()
-        self.status_widgets.clear()
-        self.repo_statuses.clear()
-        
-        # Remettre le message initial
-        initial_label = ttk.Label(self.scrollable_frame, text="🔄 En attente du premier commit...", 
-                                 font=('Arial', 10, 'italic'))
-        initial_label.pack(pady=20)
-        
-        self.stats_label.config(text="📈 Statistiques: 0 dépôts")
-        self.last_run_label.config(text="⏰ Dernier run: Jamais")
-
-class GitCommitterGUI:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.root.title("Auto Git Committer - Configuration")
-        self.root.geometry("1000x700")
-        self.root.resizable(True, True)
-        
-        # Style
-        style = ttk.Style()
-        style.theme_use('vista')
-        
-        # Initialiser le committer avec callback
-        self.committer = AutoGitCommitter(status_callback=self.handle_status_update)
-        
-        self.setup_ui()
-        self.load_config_to_ui()
-        
-        # Gestionnaire de fermeture
-        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
-    
-    def handle_status_update(self, update):
-        """Gestionnaire des mises à jour de statut"""
-        self.status_monitor.add_status_update(update)
-    
-    def setup_ui(self):
-        """Configure l'interface utilisateur"""
-        # Titre principal
-        title_frame = ttk.Frame(self.root)
-        title_frame.pack(fill='x', padx=10, pady=10)
-        
-        ttk.Label(title_frame, text="Auto Git Committer", 
-                 font=('Arial', 16, 'bold')).pack()
-        ttk.Label(title_frame, text="Configuration des commits automatiques", 
-                 font=('Arial', 10)).pack()
-        
-        # Frame principal divisé en deux colonnes
-        main_frame = ttk.Frame(self.root)
-        main_frame.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        # Colonne gauche - Configuration
-        left_frame = ttk.Frame(main_frame)
-        left_frame.pack(side='left', fill='both', expand=True, padx=(0, 5))
-        
-        # Notebook pour les onglets
-        notebook = ttk.Notebook(left_frame)
-        notebook.pack(fill='both', expand=True)
-        
-        # Onglet Configuration
-        config_frame = ttk.Frame(notebook)
-        notebook.add(config_frame, text="⚙️ Configuration")
-        self.setup_config_tab(config_frame)
-        
-        # Onglet Dépôts
-        repos_frame = ttk.Frame(notebook)
-        notebook.add(repos_frame, text="📁 Dépôts Git")
-        self.setup_repos_tab(repos_frame)
-        
-        # Onglet Logs
-        logs_frame = ttk.Frame(notebook)
-        notebook.add(logs_frame, text="📝 Logs")
-        self.setup_logs_tab(logs_frame)
-        
-        # Colonne droite - Moniteur de statut
-        right_frame = ttk.Frame(main_frame, width=350)
-        right_frame.pack(side='right', fill='both', padx=(5, 0))
-        right_frame.pack_propagate(False)
-        
-        # Créer le moniteur de statut
-        self.status_monitor = StatusMonitor(right_frame)
-        
-        # Boutons de contrôle
-        control_frame = ttk.Frame(self.root)
-        control_frame.pack(fill='x', padx=10, pady=5)
-        
-        ttk.Button(control_frame, text="💾 Sauvegarder Config", 
-                  command=self.save_config).pack(side='left', padx=5)
-        ttk.Button(control_frame, text="🔧 Test Commit Manuel", 
-                  command=self.manual_commit).pack(side='left', padx=5)
-        ttk.Button(control_frame, text="🗑️ Effacer Statuts", 
-                  command=self.clear_status).pack(side='left', padx=5)
-        
-        self.start_button = ttk.Button(control_frame, text="▶️ Démarrer Service", 
-                                      command=self.toggle_service)
-        self.start_button.pack(side='right', padx=5)
-        
-        # Status bar
-        self.status_var = tk.StringVar()
-        self.status_var.set("🔴 Service arrêté")
-        status_bar = ttk.Label(self.root, textvariable=self.status_var, 
-                              relief='sunken', anchor='w')
-        status_bar.pack(fill='x', side='bottom')
-    
-    def setup_config_tab(self, parent):
-        """Configure l'onglet de configuration"""
-        # Frame pour les heures
-        time_frame = ttk.LabelFrame(parent, text="⏰ Heures de Commit")
-        time_frame.pack(fill='x', padx=10, pady=5)
-        
-        # Liste des heures
-        self.times_listbox = tk.Listbox(time_frame, height=4)
-        self.times_listbox.pack(fill='x', padx=5, pady=5)
-        
-        # Contrôles pour ajouter/supprimer des heures
-        time_controls = ttk.Frame(time_frame)
-        time_controls.pack(fill='x', padx=5, pady=5)
-        
-        ttk.Label(time_controls, text="Nouvelle heure (HH:MM):").pack(side='left')
-        self.time_entry = ttk.Entry(time_controls, width=10)
-        self.time_entry.pack(side='left', padx=5)
-        ttk.Button(time_controls, text="➕ Ajouter", 
-                  command=self.add_time).pack(side='left', padx=2)
-        ttk.Button(time_controls, text="➖ Supprimer", 
-                  command=self.remove_time).pack(side='left', padx=2)
-        
-        # Frame pour le message de commit
-        msg_frame = ttk.LabelFrame(parent, text="💬 Message de Commit")
-        msg_frame.pack(fill='x', padx=10, pady=5)
-        
-        ttk.Label(msg_frame, text="Modèle de message ({date} sera remplacé par la date):").pack(anchor='w', padx=5, pady=2)
-        self.msg_entry = ttk.Entry(msg_frame)
-        self.msg_entry.pack(fill='x', padx=5, pady=5)
-        
-        # Options
-        options_frame = ttk.LabelFrame(parent, text="⚙️ Options")
-        options_frame.pack(fill='x', padx=10, pady=5)
-        
-        self.auto_push_var = tk.BooleanVar()
-        ttk.Checkbutton(options_frame, text="🚀 Push automatique vers GitHub", 
-                       variable=self.auto_push_var).pack(anchor='w', padx=5, pady=2)
-    
-    def setup_repos_tab(self, parent):
-        """Configure l'onglet des dépôts"""
-        ttk.Label(parent, text="📁 Dépôts Git détectés dans le dossier:").pack(anchor='w', padx=10, pady=5)
-        
-        self.repos_tree = ttk.Treeview(parent, columns=('Status', 'Dernière modification'), show='tree headings')
-        self.repos_tree.heading('#0', text='Nom du dépôt')
-        self.repos_tree.heading('Status', text='Status')
-        self.repos_tree.heading('Dernière modification', text='Dernière modification')
-        
-        scrollbar = ttk.Scrollbar(parent, orient='vertical', command=self.repos_tree.yview)
-        self.repos_tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.repos_tree.pack(fill='both', expand=True, padx=10, pady=5)
-        scrollbar.pack(side='right', fill='y')
-        
-        ttk.Button(parent, text="🔄 Actualiser la liste", 
-                  command=self.refresh_repos).pack(pady=5)
-    
-    def setup_logs_tab(self, parent):
-        """Configure l'onglet des logs"""
-        ttk.Label(parent, text="📝 Logs du système:").pack(anchor='w', padx=10, pady=5)
-        
-        self.logs_text = scrolledtext.ScrolledText(parent, height=20)
-        self.logs_text.pack(fill='both', expand=True, padx=10, pady=5)
-        
-        ttk.Button(parent, text="🔄 Actualiser les logs", 
-                  command=self.refresh_logs).pack(pady=5)
-    
-    def load_config_to_ui(self):
-        """Charge la configuration dans l'interface"""
-        # Heures de commit
-        self.times_listbox.delete(0, tk.END)
-        for time_str in self.committer.config["commit_times"]:
-            self.times_listbox.insert(tk.END, time_str)
-        
-        # Message de commit
-        self.msg_entry.delete(0, tk.END)
-        self.msg_entry.insert(0, self.committer.config["commit_message"])
-        
-        # Auto push
-        self.auto_push_var.set(self.committer.config["auto_push"])
-        
-        # Actualiser la liste des dépôts
-        self.refresh_repos()
-        
-        # Charger les logs
-        self.refresh_logs()
-    
-    def add_time(self):
-        """Ajoute une nouvelle heure de commit"""
-        time_str = self.time_entry.get().strip()
-        if not time_str:
-            return
+        Retourne (dépôts à commiter, dépôts à pousser): les dépôts terminés
+        ne sont pas repris.
+        """
+        journal = self.get_run_journal()
+        phases = journal.load_interrupted() if journal is not None else None
+        unfinished = {repo_path: phase for repo_path, phase in (phases or {}).items()
+                      if phase not in RunJournal.FINAL_PHASES and self.is_git_repository(repo_path)}
+        if not unfinished:
+            return [], []
+        self.logger.warning(f"Run précédent interrompu: reprise de {len(unfinished)} dépôts non terminés")
+        to_commit, to_push = [], []
+        for repo_path, phase in unfinished.items():
+            if phase == RunJournal.PUSH_PHASE:
+                to_push.append(repo_path)
+                continue
+            if phase in RunJournal.STAGING_PHASES:
+                self.clean_partial_staging(repo_path, journal.interrupted_started_at)
+            to_commit.append(repo_path)
+        kept = [repo_path for repo_path in to_push if self.get_repo_config(repo_path)["auto_push"]]
+        if len(kept) != len(to_push):
+            self.logger.info(f"Push automatique désactivé: {len(to_push) - len(kept)} push interrompus non repris")
+        return to_commit, kept
+    
+    def clean_partial_staging(self, repo_path, run_started_at=None):
+        """Vide l'index laissé partiellement rempli par un git add ou un commit interrompu
         
-        # Validation du format HH:MM
-        try:
-            datetime.strptime(time_str, "%H:%M")
-            if time_str not in self.committer.config["commit_times"]:
-                self.committer.config["commit_times"].append(time_str)
-                self.committer.config["commit_times"].sort()
-                self.times_listbox.insert(tk.END, time_str)
-                self.time_entry.delete(0, tk.END)
-        except ValueError:
-            messagebox.showerror("Erreur", "Format d'heure invalide. Utilisez HH:MM (ex: 09:30)")
-    
-    def remove_time(self):
-        """Supprime l'heure sélectionnée"""
-        selection = self.times_listbox.curselection()
-        if selection:
-            index = selection[0]
-            time_str = self.times_listbox.get(index)
-            self.committer.config["commit_times"].remove(time_str)
-            self.times_listbox.delete(index)
-    
-    def save_config(self):
-        """Sauvegarde la configuration"""
-        # Mettre à jour la config avec les valeurs de l'interface
-        self.committer.config["commit_message"] = self.msg_entry.get()
-        self.committer.config["auto_push"] = self.auto_push_var.get()
-        
-        if self.committer.save_config():
-            messagebox.showinfo("Succès", "💾 Configuration sauvegardée avec succès!")
-            # Reconfigurer le planning si le service est actif
-            if self.committer.running:
-                self.committer.setup_schedule()
+        Appelé seulement pour un dépôt que le journal montre en cours
+        d'indexation ou de commit. Un verrou d'index ne peut pas être attribué
+        à coup sûr (un git lancé par l'utilisateur, un rebase par exemple,
+        peut le détenir): il n'est supprimé que s'il a été créé pendant le
+        run interrompu (après run_started_at, avant le démarrage du
+        processus) et date d'au moins STALE_INDEX_LOCK_AGE secondes, bien
+        plus que ne le garde une commande git. Sinon il est laissé en place et
+        le dépôt échouera tant qu'il existe. Le commit suivant réindexe les
+        fichiers.
+        """
+        repo_name = self.get_repo_name(repo_path)
+        success, output = self.run_git_command(['git', 'rev-parse', '--git-path', 'index.lock'], repo_path)
+        if success:
+            lock_file = os.path.join(repo_path, output.strip())
+            try:
+                locked_at = os.path.getmtime(lock_file)
+            except OSError:
+                locked_at = None
+            if locked_at is not None:
+                abandoned = run_started_at is not None and run_started_at <= locked_at < self.process_started_at \
+                    and time.time() - locked_at >= STALE_INDEX_LOCK_AGE
+                if abandoned:
+                    try:
+                        os.remove(lock_file)
+                        self.logger.warning(f"Verrou d'index abandonné par le run interrompu supprimé dans {repo_name}")
+                    except OSError:
+                        pass
+                else:
+                    self.logger.warning(f"Verrou d'index conservé dans {repo_name}: il peut appartenir à une "
+                                        f"commande git en cours, à supprimer à la main sinon ({lock_file})")
+                    return
+        success, output = self.run_git_command(['git', 'reset', '-q'], repo_path, include_stderr=True)
+        if success:
+            self.logger.info(f"Index partiellement indexé réinitialisé dans {repo_name}")
         else:
-            messagebox.showerror("Erreur", "❌ Erreur lors de la sauvegarde de la configuration")
+            self.logger.warning(f"Impossible de réinitialiser l'index de {repo_name}: {output}")
     
-    def refresh_repos(self):
-        """Actualise la liste des dépôts"""
-        # Vider la liste
-        for item in self.repos_tree.get_children():
-            self.repos_tree.delete(item)
+    def resume_interrupted_run(self):
+        """Termine les dépôts d'un run interrompu sans attendre la prochaine échéance
         
-        # Ajouter les dépôts trouvés
-        repositories = self.committer.find_git_repositories()
-        for repo_path in repositories:
-            repo_name = os.path.basename(repo_path)
-            has_changes = self.committer.has_changes(repo_path)
-            status = "🔄 Changements détectés" if has_changes else "✅ À jour"
-            
-            # Dernière modification
-            try:
-                mod_time = os.path.getmtime(repo_path)
-                mod_date = datetime.fromtimestamp(mod_time).strftime("%Y-%m-%d %H:%M")
-            except:
-                mod_date = "❓ Inconnue"
-            
-            self.repos_tree.insert('', 'end', text=f"📁 {repo_name}", values=(status, mod_date))
+        Retourne les mesures du run, ou None s'il n'y avait rien à reprendre
+        ou si un run est déjà en cours.
+        """
+        if not self.run_lock.acquire(blocking=False):
+            return None
+        try:
+            journal = self.get_run_journal()
+            if journal is None or not journal.load_interrupted():
+                return None
+            self.logger.info("=== Reprise du run interrompu ===")
+            return self.process_repositories([], 0)
+        finally:
+            self.run_lock.release()
     
-    def refresh_logs(self):
-        """Actualise les logs"""
+    def report_run_metrics(self, run):
+        """Journalise, exporte et transmet à l'interface les mesures d'un run"""
+        totals = run.phase_totals()
+        if totals:
+            phases_text = ", ".join(f"{name} {total['duration']:.2f}s ({total['subprocesses']} proc.)"
+                                    for name, total in totals.items())
+            self.logger.info(f"Durée par phase: {phases_text}")
+        bytes_pushed = sum(repo.bytes_pushed for repo in run.repos)
+        bytes_fetched = sum(repo.bytes_fetched for repo in run.repos)
+        if bytes_pushed or bytes_fetched:
+            self.logger.info(f"Réseau: {format_bytes(bytes_pushed)} envoyés, {format_bytes(bytes_fetched)} reçus")
+        slowest = [repo for repo in run.slowest(3) if repo.duration > 0]
+        if slowest:
+            self.logger.info("Dépôts les plus lents: " +
+                             ", ".join(f"{repo.repo_name} ({repo.duration:.2f}s)" for repo in slowest))
         try:
-            with open(self.committer.log_file, 'r', encoding='utf-8') as f:
-                logs = f.read()
-            self.logs_text.delete('1.0', tk.END)
-            self.logs_text.insert('1.0', logs)
-            self.logs_text.see(tk.END)
-        except FileNotFoundError:
-            self.logs_text.delete('1.0', tk.END)
-            self.logs_text.insert('1.0', "📝 Aucun fichier de log trouvé.")
+            self.get_metrics_exporter().export(run)
+        except Exception as e:
+            self.logger.warning(f"Erreur lors de l'export des mesures: {e}")
+        try:
+            history = self.get_run_history()
+            if history is not None:
+                history.record_run(run)
+                if self.config["history_retention_days"] > 0:
+                    history.prune(self.config["history_retention_days"])
+        except sqlite3.Error as e:
+            self.logger.warning(f"Erreur lors de l'enregistrement de l'historique: {e}")
+        if self.run_callback:
+            self.run_callback(run)
+    
+    def read_last_run_summary(self):
+        """Retourne le résumé du dernier run exporté dans le fichier de mesures, ou None"""
+        metrics_file = self.config["metrics_file"]
+        if not metrics_file:
+            return None
+        metrics_path = os.path.join(self.script_dir, metrics_file)
+        try:
+            with open(metrics_path, 'rb') as f:
+                # Seule la fin du fichier est lue: la dernière ligne est le dernier run
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - 65536))
+                lines = f.read().splitlines()
+        except OSError:
+            return None
+        for line in reversed(lines):
+            try:
+                return json.loads(line.decode('utf-8'))
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                continue
+        return None
     
-    def manual_commit(self):
-        """Effectue un commit manuel"""
-        # Effacer les anciens statuts avant de commencer
-        self.status_monitor.clear_status()
+    def parse_commit_times(self):
+        """Retourne les échéanciers valides des commit_times de chaque racine
         
-        # Démarrer le commit dans un thread séparé pour ne pas bloquer l'UI
-        thread = threading.Thread(target=self._manual_commit_worker, daemon=True)
-        thread.start()
+        Une expression partagée par plusieurs racines donne un seul échéancier;
+        schedule_roots associe chaque échéancier aux racines qu'il déclenche.
+        Les échéanciers du planificateur en cours sont réutilisés pour les
+        expressions inchangées, afin qu'un intervalle garde son ancrage.
+        Les expressions invalides sont journalisées.
+        """
+        current = {}
+        if isinstance(self.scheduler, CommitScheduler):
+            current = {entry.expression: entry for entry in self.scheduler.entries}
+        entries = {}
+        schedule_roots = {}
+        for root in self.get_workspace_roots():
+            for expression in root.config["commit_times"]:
+                if expression not in entries and expression.strip() in current:
+                    entries[expression] = current[expression.strip()]
+                elif expression not in entries:
+                    try:
+                        entries[expression] = parse_schedule_expression(expression)
+                    except ValueError as e:
+                        self.logger.error(str(e))
+                        entries[expression] = None
+                if entries[expression] is not None:
+                    schedule_roots.setdefault(entries[expression], []).append(root.name)
+        self.schedule_roots = schedule_roots
+        return [entry for entry in entries.values() if entry is not None]
+    
+    def run_scheduled(self, entries):
+        """Run des échéances de commit_times arrivées à terme, limité à leurs racines"""
+        root_names = {name for entry in entries for name in self.schedule_roots.get(entry, [])}
+        return self.commit_all_repositories(root_names=root_names)
+    
+    def create_scheduler(self):
+        """Planificateur correspondant au mode configuré"""
+        if self.config["adaptive_schedule"]:
+            return AdaptiveScheduler(self, self.logger)
+        return CommitScheduler(self.run_scheduled, self.logger)
     
-    def _manual_commit_worker(self):
-        """Worker pour le commit manuel"""
-        self.committer.commit_all_repositories()
-        # Actualiser l'interface dans le thread principal
-        self.root.after(0, self._post_manual_commit)
-    
-    def _post_manual_commit(self):
-        """Actions post-commit manuel"""
-        self.refresh_repos()
-        self.refresh_logs()
-        messagebox.showinfo("Terminé", "✅ Commit manuel effectué. Consultez les statuts et logs pour les détails.")
-    
-    def clear_status(self):
-        """Efface tous les statuts du moniteur"""
-        self.status_monitor.clear_status()
-        messagebox.showinfo("Information", "🗑️ Statuts effacés.")
-    
-    def toggle_service(self):
-        """Active/désactive le service"""
-        if self.committer.running:
-            self.committer.stop_worker()
-            self.start_button.config(text="▶️ Démarrer Service")
-            self.status_var.set("🔴 Service arrêté")
+    def setup_schedule(self):
+        """Configure la planification des commits (réveille le service immédiatement)"""
+        replaced = self.scheduler is not None and \
+            isinstance(self.scheduler, AdaptiveScheduler) != bool(self.config["adaptive_schedule"])
+        if replaced:
+            # Changement de mode: le planificateur est remplacé, un run en cours se termine
+            self.scheduler.stop()
+            self.scheduler = self.create_scheduler()
+        
+        if self.config["adaptive_schedule"]:
+            self.logger.info(
+                f"Planification adaptative: vérification de chaque dépôt toutes les "
+                f"{self.config['adaptive_min_interval']}s à {self.config['adaptive_max_interval']}s"
+                + (f", au plus {self.config['adaptive_max_checks']} par {self.config['adaptive_window']}s"
+                   if self.config["adaptive_max_checks"] else "")
+            )
+            if self.scheduler is not None:
+                self.scheduler.configure(
+                    self.config["adaptive_min_interval"],
+                    self.config["adaptive_max_interval"],
+                    self.config["adaptive_max_checks"],
+                    self.config["adaptive_window"]
+                )
         else:
-            if not self.committer.config["commit_times"]:
-                messagebox.showwarning("Attention", "⚠️ Aucune heure de commit configurée!")
-                return
-            
-            self.committer.start_worker()
-            self.start_button.config(text="⏸️ Arrêter Service")
-            times_str = ", ".join(self.committer.config["commit_times"])
-            self.status_var.set(f"🟢 Service actif - Prochains commits: {times_str}")
-    
-    def on_closing(self):
-        """Gestionnaire de fermeture de l'application"""
-        if self.committer.running:
-            if messagebox.askokcancel("Fermeture", 
-                                    "⚠️ Le service est actif. Voulez-vous vraiment fermer l'application?"):
-                self.committer.stop_worker()
-                self.root.destroy()
+            entries = self.parse_commit_times()
+            for entry in entries:
+                root_names = [name for name in self.schedule_roots[entry] if name]
+                self.logger.info(f"Commit programmé: {entry.expression}"
+                                 + (f" ({', '.join(root_names)})" if root_names else ""))
+            if self.scheduler is not None:
+                self.scheduler.set_entries(entries)
+                next_run = self.scheduler.next_run()
+                if next_run:
+                    self.logger.info(f"Prochain commit: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
+        if replaced:
+            self.scheduler.start()
+    
+    def get_next_run(self):
+        """Prochaine échéance planifiée, ou None si le service est arrêté"""
+        return self.scheduler.next_run() if self.scheduler is not None else None
+    
+    def start_worker(self):
+        """Démarre le processus en arrière-plan"""
+        if not self.running:
+            self.running = True
+            self.scheduler = self.create_scheduler()
+            self.setup_schedule()
+            self.scheduler.start()
+            self.setup_config_watcher()
+            self.logger.info("Service de commit automatique démarré")
+            if self.has_interrupted_run():
+                threading.Thread(target=self.resume_interrupted_run, daemon=True, name="run-resume").start()
+    
+    def setup_config_watcher(self):
+        """Démarre, arrête ou ajuste la surveillance de config.json selon config_reload
+        
+        Appelé aussi depuis le thread du watcher, quand le rechargement porte
+        sur ces paramètres: l'arrêt ne fait que lui demander de sortir.
+        """
+        if not self.config["config_reload"]:
+            if self.config_watcher is not None:
+                self.config_watcher.stop()
+                self.config_watcher = None
+        elif self.config_watcher is None:
+            self.config_watcher = ConfigWatcher(self.config_file, self.reload_config,
+                                                self.config["config_reload_interval"], self.logger)
+            self.config_watcher.start()
         else:
-            self.root.destroy()
+            # La boucle du watcher relit l'intervalle à chaque attente
+            self.config_watcher.interval = self.config["config_reload_interval"]
+    
+    def stop_worker(self):
+        """Arrête le processus en arrière-plan"""
+        if self.running:
+            self.running = False
+            if self.run_lock.locked():
+                self.cancel_run()
+            self.scheduler.stop()
+            self.scheduler = None
+            if self.config_watcher is not None:
+                self.config_watcher.stop()
+                self.config_watcher = None
+            # Les événements ne sont plus suivis: le prochain run sera complet
+            self.close_watcher()
+            self.logger.info("Service de commit automatique arrêté")
+
+# Codes de sortie de la ligne de commande
+EXIT_OK = 0
+EXIT_FAILURES = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+def run_gui():
+    """Lance l'interface graphique (tkinter n'est importé qu'ici)"""
+    from auto_git_committer_gui import GitCommitterGUI
+    app = GitCommitterGUI()
+    app.run()
+    return EXIT_OK
+
+def cli_run_once(committer, args):
+    """Effectue un run de commit immédiat"""
+    run = committer.commit_all_repositories(full_scan=args.full_scan)
+    if run is None:
+        return EXIT_OK
+    counts = run.status_counts()
+    failed = sum(counts.get(status.value, 0) for status in FAILED_STATUSES)
+    return EXIT_FAILURES if failed else EXIT_OK
+
+def cli_daemon(committer, args):
+    """Lance le service planifié jusqu'à SIGINT/SIGTERM"""
+    if not committer.has_schedule():
+        print("⚠️ Aucune heure de commit configurée", file=sys.stderr)
+        return EXIT_USAGE
     
-    def run(self):
-        """Lance l'interface graphique"""
-        self.root.mainloop()
+    stop_event = threading.Event()
+    signal.signal(signal.SIGINT, lambda *_: stop_event.set())
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, lambda *_: stop_event.set())
+    
+    committer.start_worker()
+    print("🚀 Auto Git Committer démarré en mode console")
+    print("📊 Service de commit automatique actif...")
+    print("⏹️  Appuyez sur Ctrl+C pour arrêter")
+    while not stop_event.wait(1):
+        pass
+    print("\n⏹️  Arrêt du service...")
+    committer.stop_worker()
+    print("✅ Service arrêté.")
+    return EXIT_OK
 
-if __name__ == "__main__":
-    # Vérifier si on lance en mode console ou GUI
-    if len(sys.argv) > 1 and sys.argv[1] == "--console":
-        # Mode console pour exécution en arrière-plan
-        committer = AutoGitCommitter()
-        committer.start_worker()
-        try:
-            print("🚀 Auto Git Committer démarré en mode console")
-            print("📊 Service de commit automatique actif...")
-            print("⏹️  Appuyez sur Ctrl+C pour arrêter")
-            while True:
-                time.sleep(60)
-        except KeyboardInterrupt:
-            print("\n⏹️  Arrêt du service...")
-            committer.stop_worker()
-            print("✅ Service arrêté.")
+def cli_list_repos(committer, args):
+    """Affiche les dépôts découverts"""
+    for repo_path in committer.find_git_repositories():
+        print(repo_path if args.paths else committer.get_repo_name(repo_path))
+    return EXIT_OK
+
+def cli_status(committer, args):
+    """Affiche la planification, les dépôts modifiés et le dernier run"""
+    if committer.config["adaptive_schedule"]:
+        print(f"⏰ Planification adaptative: toutes les {committer.config['adaptive_min_interval']}s "
+              f"à {committer.config['adaptive_max_interval']}s par dépôt")
+    else:
+        print(f"⏰ Heures de commit: {', '.join(committer.get_commit_times()) or 'aucune'}")
+    print(f"🚀 Push automatique: {'oui' if committer.config['auto_push'] else 'non'}")
+    
+    repositories = committer.find_git_repositories()
+    changed = [repo_path for repo_path in repositories if committer.has_changes(repo_path)]
+    print(f"📁 Dépôts: {len(repositories)} | 🔄 Avec changements: {len(changed)}")
+    if committer.config["workspace_roots"]:
+        for root in committer.get_workspace_roots():
+            root_count = sum(1 for repo_path in repositories if committer.get_repo_root(repo_path) is root)
+            root_changed = sum(1 for repo_path in changed if committer.get_repo_root(repo_path) is root)
+            print(f"  📂 {root.name} ({root.path}): {root_count} dépôts, {root_changed} avec changements | "
+                  f"⏰ {', '.join(root.config['commit_times']) or 'aucune'} | "
+                  f"🚀 {'oui' if root.config['auto_push'] else 'non'} | 👷 {root.config['max_workers']} worker(s)")
+    for repo_path in changed:
+        print(f"  🔄 {committer.get_repo_name(repo_path)}")
+    
+    last_run = committer.read_last_run_summary()
+    if last_run:
+        statuses = ", ".join(f"{status}: {count}" for status, count in last_run["statuses"].items())
+        print(f"📈 Dernier run: {last_run['started_at']} ({last_run['wall_time']:.1f}s) - {statuses}")
+    else:
+        print("📈 Dernier run: Jamais")
+    if committer.has_interrupted_run():
+        print("⚠️ Run précédent interrompu: les dépôts non terminés seront repris au prochain run")
+    return EXIT_OK
+
+def format_bytes(byte_count):
+    for unit in ("o", "Ko", "Mo"):
+        if byte_count < 1024:
+            return f"{byte_count:.0f} {unit}"
+        byte_count /= 1024
+    return f"{byte_count:.1f} Go"
+
+def cli_history(committer, args):
+    """Affiche l'historique: runs récents, dépôts en échec ou statistiques par dépôt"""
+    history = committer.get_run_history()
+    if history is None:
+        print("⚠️ Historique désactivé (history_file vide)", file=sys.stderr)
+        return EXIT_USAGE
+    
+    if args.repo:
+        for entry in history.repo_history(args.repo, args.limit):
+            push = f" | push {entry['push_duration']:.2f}s" if entry['push_duration'] is not None else ""
+            print(f"{entry['started_at']:%Y-%m-%d %H:%M:%S} {entry['status'] or '?':<12} "
+                  f"{entry['duration']:.2f}s{push} | {entry['files_changed']} fichier(s) | "
+                  f"{format_bytes(entry['bytes_pushed'])}")
+    elif args.failed:
+        failures = history.failed_repositories(args.days)
+        print(f"❌ Dépôts en échec sur {args.days} jour(s): {len(failures)}")
+        for repo, count, last_failure in failures:
+            print(f"  {repo}: {count} échec(s), dernier le {last_failure:%Y-%m-%d %H:%M}")
+    elif args.stats:
+        print(f"{'dépôt':<30} {'runs':>5} {'échecs':>6} {'moy. (s)':>9} {'p95 (s)':>8} "
+              f"{'p95 push':>9} {'fichiers':>8} {'poussé':>10}")
+        for entry in sorted(history.repo_statistics(args.days), key=lambda entry: entry["repo"]):
+            p95_push = f"{entry['p95_push']:.2f}" if entry['p95_push'] is not None else "-"
+            print(f"{entry['repo'][:30]:<30} {entry['runs']:>5} {entry['failed']:>6} "
+                  f"{entry['avg_duration']:>9.2f} {entry['p95_duration']:>8.2f} {p95_push:>9} "
+                  f"{entry['files_changed']:>8} {format_bytes(entry['bytes_pushed']):>10}")
     else:
-        # Mode GUI
-        app = GitCommitterGUI()
-        app.run()
\ No newline at end of file
+        for run in history.recent_runs(args.limit):
+            print(f"{run['started_at']:%Y-%m-%d %H:%M:%S} {run['wall_time']:>7.1f}s | "
+                  f"{run['repositories']} dépôt(s): ✅ {run['succeeded']} ❌ {run['failed']} ⏭️ {run['skipped']}")
+    return EXIT_OK
+
+def main(argv=None):
+    """Point d'entrée: interface graphique par défaut, sinon ligne de commande"""
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        return run_gui()
+    
+    # Compatibilité avec l'ancienne option --console
+    if argv[0] == "--console":
+        argv = ["daemon"] + argv[1:]
+    
+    parser = argparse.ArgumentParser(prog="auto_git_committer",
+                                     description="Commits Git automatiques de tous les dépôts d'un dossier")
+    parser.add_argument("--base-dir", help="Dossier contenant les dépôts (défaut: dossier du script)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    run_once = subparsers.add_parser("run-once", help="Effectue un run de commit immédiat")
+    run_once.add_argument("--full-scan", action="store_true",
+                          help="Traite tous les dépôts, même en mode watch")
+    run_once.set_defaults(func=cli_run_once, console_log=True)
+    
+    daemon = subparsers.add_parser("daemon", help="Lance le service planifié")
+    daemon.set_defaults(func=cli_daemon, console_log=True)
+    
+    status = subparsers.add_parser("status", help="Affiche l'état des dépôts et du dernier run")
+    status.set_defaults(func=cli_status, console_log=False)
+    
+    list_repos = subparsers.add_parser("list-repos", help="Liste les dépôts découverts")
+    list_repos.add_argument("--paths", action="store_true", help="Affiche les chemins complets")
+    list_repos.set_defaults(func=cli_list_repos, console_log=False)
+    
+    history = subparsers.add_parser("history", help="Affiche l'historique des runs")
+    history_view = history.add_mutually_exclusive_group()
+    history_view.add_argument("--failed", action="store_true", help="Dépôts en échec sur la période")
+    history_view.add_argument("--stats", action="store_true", help="Statistiques par dépôt sur la période")
+    history_view.add_argument("--repo", help="Derniers résultats d'un dépôt")
+    history.add_argument("--days", type=int, default=7, help="Période en jours (défaut: 7)")
+    history.add_argument("--limit", type=int, default=20, help="Nombre de lignes (défaut: 20)")
+    history.set_defaults(func=cli_history, console_log=False)
+    
+    gui = subparsers.add_parser("gui", help="Lance l'interface graphique")
+    gui.set_defaults(func=None)
+    
+    args = parser.parse_args(argv)
+    if args.func is None:
+        return run_gui()
+    
+    try:
+        committer = AutoGitCommitter(base_dir=args.base_dir, console_log=args.console_log)
+        return args.func(committer, args)
+    except KeyboardInterrupt:
+        return EXIT_INTERRUPTED
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1290 @@
+"""Interface graphique Tkinter d'Auto Git Committer
+
+Module chargé uniquement en mode GUI: le mode console et la ligne de
+commande n'importent jamais tkinter.
+"""
+import os
+import json
+import copy
+import time
+import threading
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import tkinter as tk
+from tkinter import ttk, messagebox, scrolledtext
+
+from auto_git_committer import (AutoGitCommitter, CommitStatus, parse_schedule_expression, format_bytes,
+                                validate_config)
+
+class StatusBatcher:
+    """Tampon entre les workers et l'interface, vidé une fois par tick
+    
+    Seule la dernière mise à jour de chaque dépôt est conservée entre deux
+    ticks: un dépôt passant par plusieurs statuts n'est redessiné qu'une fois.
+    """
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.runs = []
+        self.first_enqueued = None
+        self.received = 0
+        self.coalesced = 0
+    
+    def put(self, update):
+        with self.lock:
+            if update.repo_name in self.pending:
+                self.coalesced += 1
+            self.pending[update.repo_name] = update
+            self.received += 1
+            if self.first_enqueued is None:
+                self.first_enqueued = time.perf_counter()
+    
+    def put_run(self, run):
+        with self.lock:
+            self.runs.append(run)
+            if self.first_enqueued is None:
+                self.first_enqueued = time.perf_counter()
+    
+    def depth(self):
+        with self.lock:
+            return len(self.pending) + len(self.runs)
+    
+    def drain(self):
+        """Retourne (mises à jour, runs, instant du plus ancien ajout) et vide le tampon"""
+        with self.lock:
+            updates, self.pending = list(self.pending.values()), {}
+            runs, self.runs = self.runs, []
+            first_enqueued, self.first_enqueued = self.first_enqueued, None
+        return updates, runs, first_enqueued
+
+class RepositoryRefresh:
+    """Actualisation de l'onglet des dépôts hors du thread Tk
+    
+    La découverte puis les git status (via le cache partagé du committer)
+    s'exécutent dans un pool; les résultats sont accumulés au fil de l'eau
+    et récupérés par l'interface avec drain().
+    """
+    
+    def __init__(self, committer, max_workers):
+        self.committer = committer
+        try:
+            self.max_workers = max(1, int(max_workers))
+        except (TypeError, ValueError):
+            self.max_workers = 1
+        self.cancelled = threading.Event()
+        self.lock = threading.Lock()
+        self.results = []
+        self.done = False
+        self.error = None
+        self.thread = threading.Thread(target=self.run, daemon=True)
+    
+    def start(self):
+        self.thread.start()
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    def push(self, result):
+        with self.lock:
+            self.results.append(result)
+    
+    def drain(self):
+        """Retourne (résultats reçus depuis le dernier appel, actualisation terminée)"""
+        with self.lock:
+            results, self.results = self.results, []
+            return results, self.done
+    
+    def run(self):
+        try:
+            repositories = self.committer.find_git_repositories()
+            if not self.cancelled.is_set():
+                self.push(('repos', [(repo_path, self.committer.get_repo_name(repo_path))
+                                     for repo_path in repositories]))
+                with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                    for repo_path in repositories:
+                        pool.submit(self.check_repository, repo_path)
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            with self.lock:
+                self.done = True
+    
+    def check_repository(self, repo_path):
+        # Les tâches encore en file après une annulation se terminent sans git status
+        if self.cancelled.is_set():
+            return
+        has_changes = self.committer.has_changes(repo_path)
+        try:
+            mod_date = datetime.fromtimestamp(os.path.getmtime(repo_path)).strftime("%Y-%m-%d %H:%M")
+        except OSError:
+            mod_date = "❓ Inconnue"
+        self.push(('status', repo_path, has_changes, mod_date))
+
+# Filtre du moniteur affichant tous les statuts
+FILTER_ALL = "Tous les statuts"
+
+# Colonnes du moniteur (la colonne '#0' porte l'icône et le nom du dépôt)
+STATUS_COLUMNS = ('status', 'message', 'time')
+STATUS_HEADINGS = {'#0': "Dépôt", 'status': "Statut", 'message': "Message", 'time': "Heure"}
+
+# Statuts d'un dépôt dont le traitement est terminé pour la barre de progression
+DONE_STATUSES = {CommitStatus.SUCCESS, CommitStatus.FAILED, CommitStatus.TIMED_OUT, CommitStatus.SKIPPED}
+
+class StatusMonitor:
+    # Intervalle entre deux applications des mises à jour (ms)
+    TICK_MS = 100
+    
+    def __init__(self, parent):
+        self.parent = parent
+        self.batcher = StatusBatcher()
+        
+        # Dictionnaire pour stocker les statuts des repos
+        self.repo_statuses = {}
+        
+        # Compteurs par statut tenus à jour à chaque changement
+        self.status_counts = Counter()
+        self.latest_timestamp = None
+        
+        # Somme des avancements (0-100) des dépôts, pour la barre de progression
+        self.progress_sum = 0
+        
+        # Mesures du pipeline de statuts
+        self.last_batch_size = 0
+        self.last_apply_latency = 0.0
+        self.max_apply_latency = 0.0
+        
+        # Tri courant (None: ordre d'arrivée)
+        self.sort_column = None
+        self.sort_reverse = False
+        
+        self.setup_ui()
+        
+        # Vérifier les mises à jour de statut
+        self.check_status_updates()
+    
+    def setup_ui(self):
+        """Configure l'interface du moniteur de statut"""
+        # Frame principal
+        self.frame = ttk.LabelFrame(self.parent, text="📊 Moniteur de Statut des Commits")
+        self.frame.pack(fill='both', expand=True, padx=5, pady=5)
+        
+        # Filtre par statut
+        filter_frame = ttk.Frame(self.frame)
+        filter_frame.pack(fill='x', padx=5, pady=(5, 0))
+        
+        ttk.Label(filter_frame, text="Filtre:").pack(side='left')
+        self.filter_labels = {FILTER_ALL: None}
+        for status in CommitStatus:
+            self.filter_labels[f"{self.get_status_icon(status)} {self.get_status_label(status)}"] = status
+        self.filter_var = tk.StringVar(value=FILTER_ALL)
+        filter_box = ttk.Combobox(filter_frame, textvariable=self.filter_var, state='readonly',
+                                  values=list(self.filter_labels), width=18)
+        filter_box.pack(side='left', padx=5)
+        filter_box.bind('<<ComboboxSelected>>', lambda e: self.refresh_view())
+        
+        self.visible_label = ttk.Label(filter_frame, text="", font=('Arial', 8), foreground='gray')
+        self.visible_label.pack(side='right')
+        
+        # Liste des statuts: Treeview, seules les lignes visibles sont dessinées
+        tree_frame = ttk.Frame(self.frame)
+        tree_frame.pack(fill='both', expand=True, padx=5, pady=5)
+        
+        self.tree = ttk.Treeview(tree_frame, columns=STATUS_COLUMNS, show='tree headings', height=8)
+        self.tree.column('#0', width=220, stretch=True)
+        self.tree.column('status', width=110, stretch=False)
+        self.tree.column('message', width=260, stretch=True)
+        self.tree.column('time', width=70, stretch=False, anchor='center')
+        for column in ('#0',) + STATUS_COLUMNS:
+            self.tree.heading(column, command=lambda c=column: self.sort_by(c))
+        self.update_headings()
+        
+        # Une étiquette par statut porte la couleur de get_status_color
+        for status in CommitStatus:
+            self.tree.tag_configure(status.value, foreground=self.get_status_color(status))
+        
+        scrollbar = ttk.Scrollbar(tree_frame, orient='vertical', command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.tree.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        # Message initial, affiché par-dessus la liste vide
+        self.initial_label = ttk.Label(tree_frame, text="🔄 En attente du premier commit...", 
+                                       font=('Arial', 10, 'italic'))
+        self.initial_label.place(relx=0.5, rely=0.5, anchor='center')
+        self.placeholder_visible = True
+        
+        # Avancement du run: dépôts terminés et progression des push en cours
+        progress_frame = ttk.Frame(self.frame)
+        progress_frame.pack(fill='x', padx=5)
+        
+        self.progress_bar = ttk.Progressbar(progress_frame, mode='determinate', maximum=100)
+        self.progress_bar.pack(side='left', fill='x', expand=True)
+        self.progress_label = ttk.Label(progress_frame, text="", font=('Arial', 8), width=6, anchor='e')
+        self.progress_label.pack(side='right')
+        
+        # Statistiques globales
+        stats_frame = ttk.Frame(self.frame)
+        stats_frame.pack(fill='x', padx=5, pady=5)
+        
+        self.stats_label = ttk.Label(stats_frame, text="📈 Statistiques: 0 dépôts", 
+                                   font=('Arial', 9, 'bold'))
+        self.stats_label.pack(side='left')
+        
+        self.last_run_label = ttk.Label(stats_frame, text="⏰ Dernier run: Jamais", 
+                                      font=('Arial', 9))
+        self.last_run_label.pack(side='right')
+        
+        # Dépôts les plus lents du dernier run
+        self.slowest_label = ttk.Label(self.frame, text="", font=('Arial', 8),
+                                       foreground='gray', wraplength=320, justify='left')
+        self.slowest_label.pack(fill='x', padx=5, pady=(0, 5))
+        
+        # Profondeur du tampon et latence d'application des mises à jour
+        self.pipeline_label = ttk.Label(self.frame, text="", font=('Arial', 8), foreground='gray')
+        self.pipeline_label.pack(fill='x', padx=5, pady=(0, 5))
+    
+    def get_status_icon(self, status):
+        """Retourne l'icône correspondant au statut"""
+        icons = {
+            CommitStatus.PENDING: "⏳",
+            CommitStatus.IN_PROGRESS: "🔄",
+            CommitStatus.PUSH_PENDING: "📤",
+            CommitStatus.SUCCESS: "✅",
+            CommitStatus.FAILED: "❌",
+            CommitStatus.TIMED_OUT: "⏱️",
+            CommitStatus.SKIPPED: "⏭️"
+        }
+        return icons.get(status, "❓")
+    
+    def get_status_color(self, status):
+        """Retourne la couleur correspondant au statut"""
+        colors = {
+            CommitStatus.PENDING: "#FFA500",  # Orange
+            CommitStatus.IN_PROGRESS: "#1E90FF",  # Bleu
+            CommitStatus.PUSH_PENDING: "#9370DB",  # Violet
+            CommitStatus.SUCCESS: "#32CD32",  # Vert
+            CommitStatus.FAILED: "#FF4500",  # Rouge
+            CommitStatus.TIMED_OUT: "#B22222",  # Rouge foncé
+            CommitStatus.SKIPPED: "#696969"  # Gris
+        }
+        return colors.get(status, "#000000")
+    
+    def add_status_update(self, update):
+        """Ajoute une mise à jour de statut au tampon (appelé depuis les workers)"""
+        self.batcher.put(update)
+    
+    def add_run_metrics(self, run):
+        """Ajoute les mesures d'un run terminé au tampon"""
+        self.batcher.put_run(run)
+    
+    def check_status_updates(self):
+        """Applique en un seul lot les mises à jour reçues depuis le dernier tick"""
+        updates, runs, first_enqueued = self.batcher.drain()
+        if updates:
+            created = False
+            for update in updates:
+                created |= self.update_repo_status(update)
+            self.update_global_stats()
+            # Tri et filtre sont réappliqués une fois par lot
+            if self.sort_column is not None or self.get_filter_status() is not None:
+                self.refresh_view()
+            else:
+                self.update_visible_count(len(self.repo_statuses))
+                if created:
+                    self.tree.yview_moveto(1.0)
+        for run in runs:
+            self.update_slowest_repos(run)
+        
+        if first_enqueued is not None:
+            self.last_batch_size = len(updates)
+            self.last_apply_latency = time.perf_counter() - first_enqueued
+            self.max_apply_latency = max(self.max_apply_latency, self.last_apply_latency)
+            self.update_pipeline_stats()
+        
+        # Programmer la prochaine vérification
+        self.parent.after(self.TICK_MS, self.check_status_updates)
+    
+    def update_repo_status(self, update):
+        """Met à jour le statut d'un dépôt; retourne True si sa ligne a été créée"""
+        repo_name = update.repo_name
+        
+        # Mettre à jour le dictionnaire de statut et les compteurs
+        previous = self.repo_statuses.get(repo_name)
+        if previous is not None:
+            self.status_counts[previous.status] -= 1
+            self.progress_sum -= self.get_progress(previous)
+        self.status_counts[update.status] += 1
+        self.progress_sum += self.get_progress(update)
+        self.repo_statuses[repo_name] = update
+        if self.latest_timestamp is None or update.timestamp > self.latest_timestamp:
+            self.latest_timestamp = update.timestamp
+        
+        # Masquer le message initial si nécessaire
+        if self.placeholder_visible:
+            self.initial_label.place_forget()
+            self.placeholder_visible = False
+        
+        # Créer ou mettre à jour la ligne de ce repo
+        row = self.get_row(update)
+        if previous is None:
+            self.tree.insert('', 'end', iid=repo_name, **row)
+            return True
+        self.tree.item(repo_name, **row)
+        return False
+    
+    def get_progress(self, update):
+        """Avancement (0-100) d'un dépôt: terminé, ou pourcentage de sa commande git en cours"""
+        if update.status in DONE_STATUSES:
+            return 100
+        return update.progress or 0
+    
+    def get_status_label(self, status):
+        return status.value.replace('_', ' ').title()
+    
+    def get_row(self, update):
+        """Texte, colonnes et étiquette de couleur d'une ligne du moniteur"""
+        return {
+            'text': f"{self.get_status_icon(update.status)} {update.repo_name}",
+            'values': (self.get_status_label(update.status), update.message or "",
+                       update.timestamp.strftime("%H:%M:%S")),
+            'tags': (update.status.value,)
+        }
+    
+    def get_filter_status(self):
+        return self.filter_labels.get(self.filter_var.get())
+    
+    def sort_by(self, column):
+        """Trie par colonne; un second clic inverse l'ordre, un troisième revient à l'ordre d'arrivée"""
+        if self.sort_column != column:
+            self.sort_column, self.sort_reverse = column, False
+        elif not self.sort_reverse:
+            self.sort_reverse = True
+        else:
+            self.sort_column, self.sort_reverse = None, False
+        self.update_headings()
+        self.refresh_view()
+    
+    def update_headings(self):
+        for column in ('#0',) + STATUS_COLUMNS:
+            text = STATUS_HEADINGS[column]
+            if column == self.sort_column:
+                text += " ▼" if self.sort_reverse else " ▲"
+            self.tree.heading(column, text=text)
+    
+    def get_sort_key(self, column):
+        status_order = {status: index for index, status in enumerate(CommitStatus)}
+        keys = {
+            '#0': lambda update: update.repo_name.lower(),
+            'status': lambda update: status_order[update.status],
+            'message': lambda update: update.message or "",
+            'time': lambda update: update.timestamp
+        }
+        return keys[column]
+    
+    def refresh_view(self):
+        """Réordonne les lignes selon le tri et détache celles exclues par le filtre"""
+        filter_status = self.get_filter_status()
+        updates = [update for update in self.repo_statuses.values()
+                   if filter_status is None or update.status == filter_status]
+        if self.sort_column is not None:
+            updates.sort(key=self.get_sort_key(self.sort_column), reverse=self.sort_reverse)
+        
+        visible = {update.repo_name for update in updates}
+        hidden = [repo_name for repo_name in self.repo_statuses if repo_name not in visible]
+        if hidden:
+            self.tree.detach(*hidden)
+        for index, update in enumerate(updates):
+            self.tree.move(update.repo_name, '', index)
+        self.update_visible_count(len(updates))
+    
+    def update_visible_count(self, visible):
+        total = len(self.repo_statuses)
+        self.visible_label.config(text=f"{visible}/{total} affichés" if visible != total else "")
+    
+    def update_global_stats(self):
+        """Met à jour les statistiques globales à partir des compteurs"""
+        total = len(self.repo_statuses)
+        success = self.status_counts[CommitStatus.SUCCESS]
+        failed = self.status_counts[CommitStatus.FAILED]
+        timed_out = self.status_counts[CommitStatus.TIMED_OUT]
+        in_progress = self.status_counts[CommitStatus.IN_PROGRESS]
+        push_pending = self.status_counts[CommitStatus.PUSH_PENDING]
+        
+        stats_text = f"📈 Total: {total} | ✅ Succès: {success} | ❌ Échecs: {failed}"
+        if timed_out > 0:
+            stats_text += f" | ⏱️ Délais dépassés: {timed_out}"
+        if in_progress > 0:
+            stats_text += f" | 🔄 En cours: {in_progress}"
+        if push_pending > 0:
+            stats_text += f" | 📤 Push en attente: {push_pending}"
+        
+        self.stats_label.config(text=stats_text)
+        
+        progress = self.progress_sum / total if total else 0
+        self.progress_bar['value'] = progress
+        self.progress_label.config(text=f"{progress:.0f}%")
+        
+        # Mettre à jour l'heure du dernier run
+        if self.latest_timestamp is not None:
+            self.last_run_label.config(text=f"⏰ Dernier run: {self.latest_timestamp.strftime('%H:%M:%S')}")
+    
+    def update_pipeline_stats(self):
+        """Affiche la taille du dernier lot, le tampon restant et la latence d'application"""
+        self.pipeline_label.config(
+            text=f"🧮 Lot: {self.last_batch_size} | En attente: {self.batcher.depth()} | "
+                 f"Fusionnées: {self.batcher.coalesced}/{self.batcher.received} | "
+                 f"⚡ Latence: {self.last_apply_latency * 1000:.0f} ms "
+                 f"(max {self.max_apply_latency * 1000:.0f} ms)"
+        )
+    
+    def update_slowest_repos(self, run):
+        """Affiche les dépôts les plus lents du dernier run"""
+        slowest = [repo for repo in run.slowest(3) if repo.duration > 0]
+        if not slowest:
+            self.slowest_label.config(text="")
+            return
+        details = ", ".join(f"{repo.repo_name} ({repo.duration:.1f}s)" for repo in slowest)
+        self.slowest_label.config(text=f"🐢 Plus lents: {details} | ⏱️ Run: {run.wall_time:.1f}s")
+    
+    def clear_status(self):
+        """Efface tous les statuts"""
+        # Les lignes masquées par le filtre sont détachées mais existent toujours
+        if self.repo_statuses:
+            self.tree.delete(*self.repo_statuses)
+        # Les mises à jour en attente concernent les statuts effacés
+        self.batcher.drain()
+        self.repo_statuses.clear()
+        self.status_counts.clear()
+        self.progress_sum = 0
+        self.latest_timestamp = None
+        self.update_visible_count(0)
+        
+        # Remettre le message initial
+        if not self.placeholder_visible:
+            self.initial_label.place(relx=0.5, rely=0.5, anchor='center')
+            self.placeholder_visible = True
+        
+        self.stats_label.config(text="📈 Statistiques: 0 dépôts")
+        self.progress_bar['value'] = 0
+        self.progress_label.config(text="")
+        self.last_run_label.config(text="⏰ Dernier run: Jamais")
+        self.slowest_label.config(text="")
+
+# Périodes proposées dans l'onglet Historique (libellé, jours) et nombre de runs affichés
+HISTORY_PERIODS = [("24 heures", 1), ("7 jours", 7), ("30 jours", 30), ("90 jours", 90)]
+HISTORY_RUNS_SHOWN = 20
+
+# Lecture du fichier de log par pages (octets) et lignes conservées en suivant la fin
+LOG_PAGE_BYTES = 64 * 1024
+LOG_BUFFER_LINES = 5000
+
+LOG_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+LOG_LEVEL_FILTERS = [("Tous les niveaux", 0), ("⚠️ Avertissements et erreurs", 30), ("❌ Erreurs", 40)]
+
+class LogTail:
+    """Lecture incrémentale d'un fichier de log par positions en octets
+    
+    Seules la fin du fichier puis les lignes ajoutées sont lues; les pages
+    plus anciennes sont relues à la demande par seek, jamais le fichier entier.
+    Chaque ligne est retournée avec sa position: (offset, texte).
+    """
+    
+    def __init__(self, path, page_bytes=LOG_PAGE_BYTES):
+        self.path = path
+        self.page_bytes = page_bytes
+        self.inode = None
+        # Début de la plus ancienne ligne chargée et fin de la dernière ligne complète lue
+        self.start = 0
+        self.end = 0
+    
+    def split_lines(self, offset, data):
+        lines = []
+        pos = 0
+        while pos < len(data):
+            newline = data.find(b'\n', pos)
+            if newline < 0:
+                newline = len(data)
+            lines.append((offset + pos, data[pos:newline].decode('utf-8', errors='replace').rstrip('\r')))
+            pos = newline + 1
+        return lines
+    
+    def open_tail(self):
+        """Se positionne sur la dernière page du fichier et retourne ses lignes"""
+        stat = os.stat(self.path)
+        self.inode = stat.st_ino
+        self.start = self.end = stat.st_size
+        lines = self.read_older()
+        # Une dernière ligne en cours d'écriture sera lue en entier par read_new
+        if lines and stat.st_size:
+            with open(self.path, 'rb') as f:
+                f.seek(stat.st_size - 1)
+                if f.read(1) != b'\n':
+                    self.end = lines.pop()[0]
+        return lines
+    
+    def read_new(self):
+        """Retourne les lignes complètes ajoutées depuis la dernière lecture
+        
+        Retourne None si le fichier a été remplacé ou tronqué (rotation):
+        la lecture doit alors reprendre avec open_tail.
+        """
+        stat = os.stat(self.path)
+        if stat.st_ino != self.inode or stat.st_size < self.end:
+            return None
+        if stat.st_size == self.end:
+            return []
+        with open(self.path, 'rb') as f:
+            f.seek(self.end)
+            data = f.read(stat.st_size - self.end)
+        data = data[:data.rfind(b'\n') + 1]
+        lines = self.split_lines(self.end, data)
+        self.end += len(data)
+        return lines
+    
+    def read_older(self):
+        """Retourne la page de lignes précédant la plus ancienne ligne chargée"""
+        if self.start == 0:
+            return []
+        size = self.page_bytes
+        with open(self.path, 'rb') as f:
+            while True:
+                offset = max(0, self.start - size)
+                f.seek(offset)
+                data = f.read(self.start - offset)
+                if offset == 0:
+                    break
+                # Le début de la page appartient à une ligne commencée plus tôt;
+                # le saut de ligne final de la page ne compte pas
+                cut = data.find(b'\n', 0, len(data) - 1)
+                if cut >= 0:
+                    offset += cut + 1
+                    data = data[cut + 1:]
+                    break
+                size *= 2
+        lines = self.split_lines(offset, data)
+        self.start = offset
+        return lines
+
+class LogViewer:
+    """Onglet des logs: suit la fin du fichier et filtre par niveau et dépôt"""
+    
+    # Intervalle de lecture des nouvelles lignes (ms)
+    POLL_MS = 1000
+    
+    def __init__(self, parent, log_file):
+        self.parent = parent
+        self.tail = LogTail(log_file)
+        self.opened = False
+        
+        # Lignes chargées: (offset, texte, niveau), bornées tant que l'on suit la fin du fichier
+        self.lines = deque()
+        
+        self.setup_ui()
+        self.open_log()
+        self.render()
+        self.parent.after(self.POLL_MS, self.poll)
+    
+    def setup_ui(self):
+        filter_frame = ttk.Frame(self.parent)
+        filter_frame.pack(fill='x', padx=10, pady=5)
+        
+        ttk.Label(filter_frame, text="📝 Niveau:").pack(side='left')
+        self.level_var = tk.StringVar(value=LOG_LEVEL_FILTERS[0][0])
+        level_box = ttk.Combobox(filter_frame, textvariable=self.level_var, state='readonly',
+                                 values=[label for label, _ in LOG_LEVEL_FILTERS], width=22)
+        level_box.pack(side='left', padx=5)
+        level_box.bind('<<ComboboxSelected>>', lambda e: self.render())
+        
+        ttk.Label(filter_frame, text="Dépôt:").pack(side='left', padx=(10, 0))
+        self.repo_var = tk.StringVar()
+        self.repo_var.trace_add('write', lambda *args: self.render())
+        ttk.Entry(filter_frame, textvariable=self.repo_var, width=20).pack(side='left', padx=5)
+        
+        self.info_label = ttk.Label(filter_frame, text="", font=('Arial', 8), foreground='gray')
+        self.info_label.pack(side='right')
+        
+        self.text = scrolledtext.ScrolledText(self.parent, height=20)
+        self.text.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        # Arrivé en haut de la zone, le défilement charge la page précédente
+        self.text.vbar.configure(command=self.on_scrollbar)
+        for event in ('<MouseWheel>', '<Button-4>'):
+            self.text.bind(event, lambda e: self.text.after_idle(self.check_top), add='+')
+        
+        buttons = ttk.Frame(self.parent)
+        buttons.pack(pady=5)
+        ttk.Button(buttons, text="⬆️ Logs plus anciens", command=self.load_older).pack(side='left', padx=5)
+        ttk.Button(buttons, text="🔄 Actualiser les logs", command=self.refresh).pack(side='left', padx=5)
+    
+    def parse_level(self, text, previous_level):
+        """Niveau d'une ligne 'date - NIVEAU - message'; les lignes de suite héritent du précédent"""
+        parts = text.split(' - ', 2)
+        if len(parts) == 3 and parts[1] in LOG_LEVELS:
+            return LOG_LEVELS[parts[1]]
+        return previous_level
+    
+    def format_line(self, text):
+        """Affiche les lignes du format JSON (log_format) comme celles du format texte"""
+        if not text.startswith('{'):
+            return text
+        try:
+            entry = json.loads(text)
+            return f"{entry['time'].replace('T', ' ')} - {entry['level']} - {entry['message']}"
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return text
+    
+    def make_entries(self, lines, previous_level=0):
+        entries = []
+        for offset, text in lines:
+            text = self.format_line(text)
+            previous_level = self.parse_level(text, previous_level)
+            entries.append((offset, text, previous_level))
+        return entries
+    
+    def matches(self, entry):
+        min_level = dict(LOG_LEVEL_FILTERS).get(self.level_var.get(), 0)
+        repo_filter = self.repo_var.get().strip().lower()
+        return entry[2] >= min_level and (not repo_filter or repo_filter in entry[1].lower())
+    
+    def is_following(self):
+        return self.text.yview()[1] >= 0.999
+    
+    def render(self):
+        """Réaffiche les lignes chargées selon les filtres (sans relire le fichier)"""
+        self.text.delete('1.0', tk.END)
+        if not self.opened:
+            self.text.insert('1.0', "📝 Aucun fichier de log trouvé.")
+            return
+        visible = [entry[1] for entry in self.lines if self.matches(entry)]
+        if visible:
+            self.text.insert('1.0', "\n".join(visible) + "\n")
+        self.text.see(tk.END)
+        self.update_info()
+    
+    def update_info(self):
+        loaded = self.tail.end - self.tail.start
+        self.info_label.config(text=f"{len(self.lines)} lignes chargées ({loaded / 1024:.0f} Ko)"
+                                    + (" | début du fichier" if self.tail.start == 0 else ""))
+    
+    def open_log(self):
+        """(Re)lit la fin du fichier, au démarrage ou après une rotation"""
+        try:
+            lines = self.tail.open_tail()
+        except FileNotFoundError:
+            self.opened = False
+            self.lines.clear()
+            return
+        self.opened = True
+        self.lines = deque(self.make_entries(lines))
+        self.trim()
+    
+    def trim(self):
+        """Supprime les lignes les plus anciennes au-delà de LOG_BUFFER_LINES; retourne le nombre affiché supprimé"""
+        removed = 0
+        while len(self.lines) > LOG_BUFFER_LINES:
+            entry = self.lines.popleft()
+            removed += self.matches(entry)
+        if self.lines:
+            self.tail.start = self.lines[0][0]
+        return removed
+    
+    def poll(self):
+        self.refresh()
+        self.parent.after(self.POLL_MS, self.poll)
+    
+    def refresh(self):
+        """Ajoute les nouvelles lignes du fichier à la fin de la zone de texte"""
+        if not self.opened:
+            self.open_log()
+            if self.opened:
+                self.render()
+            return
+        
+        try:
+            lines = self.tail.read_new()
+        except FileNotFoundError:
+            lines = None
+        if lines is None:
+            self.open_log()
+            self.render()
+            return
+        if not lines:
+            return
+        
+        following = self.is_following()
+        previous_level = self.lines[-1][2] if self.lines else 0
+        entries = self.make_entries(lines, previous_level)
+        self.lines.extend(entries)
+        visible = [entry[1] for entry in entries if self.matches(entry)]
+        if visible:
+            self.text.insert(tk.END, "\n".join(visible) + "\n")
+        
+        # L'historique chargé à la main est conservé tant que l'on ne suit pas la fin
+        if following:
+            removed = self.trim()
+            if removed:
+                self.text.delete('1.0', f'{removed + 1}.0')
+            self.text.see(tk.END)
+        self.update_info()
+    
+    def on_scrollbar(self, *args):
+        self.text.yview(*args)
+        self.check_top()
+    
+    def check_top(self):
+        if self.opened and self.tail.start > 0 and self.text.yview()[0] <= 0.0:
+            self.load_older()
+    
+    def load_older(self):
+        """Insère en tête la page précédente du fichier, en conservant la position affichée"""
+        if not self.opened:
+            return
+        try:
+            lines = self.tail.read_older()
+        except FileNotFoundError:
+            return
+        if not lines:
+            return
+        entries = self.make_entries(lines)
+        self.lines.extendleft(reversed(entries))
+        visible = [entry[1] for entry in entries if self.matches(entry)]
+        if visible:
+            self.text.insert('1.0', "\n".join(visible) + "\n")
+            self.text.yview_scroll(len(visible), 'units')
+        self.update_info()
+
+class GitCommitterGUI:
+    def __init__(self):
+        self.root = tk.Tk()
+        self.root.title("Auto Git Committer - Configuration")
+        self.root.geometry("1000x700")
+        self.root.resizable(True, True)
+        
+        # Style
+        style = ttk.Style()
+        style.theme_use('vista')
+        
+        # Initialiser le committer avec callback
+        self.committer = AutoGitCommitter(status_callback=self.handle_status_update,
+                                          run_callback=self.handle_run_metrics,
+                                          config_callback=self.handle_config_reload)
+        
+        self.setup_ui()
+        self.load_config_to_ui()
+        
+        # Configuration sauvegardée pendant un run, appliquée à sa fin
+        self.pending_config = None
+        
+        # Reprise d'un run interrompu par la fermeture précédente
+        self.root.after(500, self.resume_interrupted_run)
+        
+        # Gestionnaire de fermeture
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+    
+    def handle_status_update(self, update):
+        """Gestionnaire des mises à jour de statut"""
+        self.status_monitor.add_status_update(update)
+    
+    def handle_config_reload(self, changes):
+        """Gestionnaire du rechargement de config.json (appelé hors du thread tkinter)"""
+        self.root.after(0, self.on_config_reloaded)
+    
+    def on_config_reloaded(self):
+        # Sans cela, une sauvegarde depuis l'interface écraserait le fichier modifié
+        self.update_config_widgets()
+        if self.committer.running:
+            self.update_service_status()
+    
+    def handle_run_metrics(self, run):
+        """Gestionnaire des mesures de fin de run"""
+        self.status_monitor.add_run_metrics(run)
+        self.root.after(0, self.refresh_history)
+        if self.committer.running:
+            self.root.after(0, self.update_service_status)
+    
+    def setup_ui(self):
+        """Configure l'interface utilisateur"""
+        # Titre principal
+        title_frame = ttk.Frame(self.root)
+        title_frame.pack(fill='x', padx=10, pady=10)
+        
+        ttk.Label(title_frame, text="Auto Git Committer", 
+                 font=('Arial', 16, 'bold')).pack()
+        ttk.Label(title_frame, text="Configuration des commits automatiques", 
+                 font=('Arial', 10)).pack()
+        
+        # Frame principal divisé en deux colonnes
+        main_frame = ttk.Frame(self.root)
+        main_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        
+        # Colonne gauche - Configuration
+        left_frame = ttk.Frame(main_frame)
+        left_frame.pack(side='left', fill='both', expand=True, padx=(0, 5))
+        
+        # Notebook pour les onglets
+        notebook = ttk.Notebook(left_frame)
+        notebook.pack(fill='both', expand=True)
+        
+        # Onglet Configuration
+        config_frame = ttk.Frame(notebook)
+        notebook.add(config_frame, text="⚙️ Configuration")
+        self.setup_config_tab(config_frame)
+        
+        # Onglet Dépôts
+        repos_frame = ttk.Frame(notebook)
+        notebook.add(repos_frame, text="📁 Dépôts Git")
+        self.setup_repos_tab(repos_frame)
+        
+        # Onglet Logs
+        logs_frame = ttk.Frame(notebook)
+        notebook.add(logs_frame, text="📝 Logs")
+        self.setup_logs_tab(logs_frame)
+        
+        # Onglet Historique
+        history_frame = ttk.Frame(notebook)
+        notebook.add(history_frame, text="📜 Historique")
+        self.setup_history_tab(history_frame)
+        
+        # Colonne droite - Moniteur de statut
+        right_frame = ttk.Frame(main_frame, width=350)
+        right_frame.pack(side='right', fill='both', padx=(5, 0))
+        right_frame.pack_propagate(False)
+        
+        # Créer le moniteur de statut
+        self.status_monitor = StatusMonitor(right_frame)
+        
+        # Boutons de contrôle
+        control_frame = ttk.Frame(self.root)
+        control_frame.pack(fill='x', padx=10, pady=5)
+        
+        ttk.Button(control_frame, text="💾 Sauvegarder Config", 
+                  command=self.save_config).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="🔧 Test Commit Manuel", 
+                  command=self.manual_commit).pack(side='left', padx=5)
+        ttk.Button(control_frame, text="🗑️ Effacer Statuts", 
+                  command=self.clear_status).pack(side='left', padx=5)
+        
+        self.start_button = ttk.Button(control_frame, text="▶️ Démarrer Service", 
+                                      command=self.toggle_service)
+        self.start_button.pack(side='right', padx=5)
+        
+        # Status bar
+        self.status_var = tk.StringVar()
+        self.status_var.set("🔴 Service arrêté")
+        status_bar = ttk.Label(self.root, textvariable=self.status_var, 
+                              relief='sunken', anchor='w')
+        status_bar.pack(fill='x', side='bottom')
+    
+    def setup_config_tab(self, parent):
+        """Configure l'onglet de configuration"""
+        # Frame pour les heures
+        time_frame = ttk.LabelFrame(parent, text="⏰ Heures de Commit")
+        time_frame.pack(fill='x', padx=10, pady=5)
+        
+        # Liste des heures
+        self.times_listbox = tk.Listbox(time_frame, height=4)
+        self.times_listbox.pack(fill='x', padx=5, pady=5)
+        
+        # Contrôles pour ajouter/supprimer des heures
+        time_controls = ttk.Frame(time_frame)
+        time_controls.pack(fill='x', padx=5, pady=5)
+        
+        ttk.Label(time_controls, text="Nouvelle heure (HH:MM, every 30m ou cron):").pack(side='left')
+        self.time_entry = ttk.Entry(time_controls, width=18)
+        self.time_entry.pack(side='left', padx=5)
+        ttk.Button(time_controls, text="➕ Ajouter", 
+                  command=self.add_time).pack(side='left', padx=2)
+        ttk.Button(time_controls, text="➖ Supprimer", 
+                  command=self.remove_time).pack(side='left', padx=2)
+        
+        # Frame pour le message de commit
+        msg_frame = ttk.LabelFrame(parent, text="💬 Message de Commit")
+        msg_frame.pack(fill='x', padx=10, pady=5)
+        
+        ttk.Label(msg_frame, text="Modèle de message ({date} sera remplacé par la date):").pack(anchor='w', padx=5, pady=2)
+        self.msg_entry = ttk.Entry(msg_frame)
+        self.msg_entry.pack(fill='x', padx=5, pady=5)
+        
+        # Options
+        options_frame = ttk.LabelFrame(parent, text="⚙️ Options")
+        options_frame.pack(fill='x', padx=10, pady=5)
+        
+        self.auto_push_var = tk.BooleanVar()
+        ttk.Checkbutton(options_frame, text="🚀 Push automatique vers GitHub", 
+                       variable=self.auto_push_var).pack(anchor='w', padx=5, pady=2)
+        
+        self.adaptive_var = tk.BooleanVar()
+        ttk.Checkbutton(options_frame, text="📈 Planification adaptative (rythme propre à chaque dépôt)",
+                       variable=self.adaptive_var).pack(anchor='w', padx=5, pady=2)
+        
+        workers_frame = ttk.Frame(options_frame)
+        workers_frame.pack(anchor='w', padx=5, pady=2)
+        ttk.Label(workers_frame, text="🧵 Dépôts traités en parallèle:").pack(side='left')
+        self.max_workers_var = tk.IntVar()
+        ttk.Spinbox(workers_frame, from_=1, to=64, width=5,
+                    textvariable=self.max_workers_var).pack(side='left', padx=5)
+    
+    def setup_repos_tab(self, parent):
+        """Configure l'onglet des dépôts"""
+        ttk.Label(parent, text="📁 Dépôts Git détectés dans le dossier:").pack(anchor='w', padx=10, pady=5)
+        
+        self.repos_tree = ttk.Treeview(parent, columns=('Status', 'Dernière modification'), show='tree headings')
+        self.repos_tree.heading('#0', text='Nom du dépôt')
+        self.repos_tree.heading('Status', text='Status')
+        self.repos_tree.heading('Dernière modification', text='Dernière modification')
+        
+        scrollbar = ttk.Scrollbar(parent, orient='vertical', command=self.repos_tree.yview)
+        self.repos_tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.repos_tree.pack(fill='both', expand=True, padx=10, pady=5)
+        scrollbar.pack(side='right', fill='y')
+        
+        repos_buttons = ttk.Frame(parent)
+        repos_buttons.pack(fill='x', padx=10, pady=5)
+        
+        ttk.Button(repos_buttons, text="🔄 Actualiser la liste", 
+                  command=self.refresh_repos).pack(side='left')
+        self.cancel_refresh_button = ttk.Button(repos_buttons, text="⏹️ Annuler",
+                                                command=self.cancel_refresh, state='disabled')
+        self.cancel_refresh_button.pack(side='left', padx=5)
+        
+        self.refresh_progress_label = ttk.Label(repos_buttons, text="", font=('Arial', 8), foreground='gray')
+        self.refresh_progress_label.pack(side='right')
+        
+        # Actualisation en cours et lignes de l'arbre par chemin de dépôt
+        self.repo_refresh = None
+        self.repo_rows = {}
+        self.repos_checked = 0
+    
+    def setup_logs_tab(self, parent):
+        """Configure l'onglet des logs"""
+        self.log_viewer = LogViewer(parent, self.committer.log_file)
+    
+    def setup_history_tab(self, parent):
+        """Configure l'onglet de l'historique des runs"""
+        controls = ttk.Frame(parent)
+        controls.pack(fill='x', padx=10, pady=5)
+        
+        ttk.Label(controls, text="📜 Période:").pack(side='left')
+        self.history_period_var = tk.StringVar(value=HISTORY_PERIODS[1][0])
+        period_box = ttk.Combobox(controls, textvariable=self.history_period_var, state='readonly',
+                                  values=[label for label, _ in HISTORY_PERIODS], width=12)
+        period_box.pack(side='left', padx=5)
+        period_box.bind('<<ComboboxSelected>>', lambda e: self.refresh_history())
+        
+        ttk.Button(controls, text="🔄 Actualiser", command=self.refresh_history).pack(side='left', padx=5)
+        
+        self.history_info_label = ttk.Label(controls, text="", font=('Arial', 8), foreground='gray')
+        self.history_info_label.pack(side='right')
+        
+        # Runs récents
+        ttk.Label(parent, text="⏱️ Derniers runs:").pack(anchor='w', padx=10)
+        self.runs_tree = ttk.Treeview(parent, columns=('Durée', 'Dépôts', 'Succès', 'Échecs', 'Ignorés'),
+                                      show='tree headings', height=6)
+        self.runs_tree.heading('#0', text='Date')
+        for column in ('Durée', 'Dépôts', 'Succès', 'Échecs', 'Ignorés'):
+            self.runs_tree.heading(column, text=column)
+            self.runs_tree.column(column, width=70, anchor='center')
+        self.runs_tree.tag_configure('failed', foreground='#FF4500')
+        self.runs_tree.pack(fill='x', padx=10, pady=5)
+        
+        # Statistiques par dépôt sur la période
+        ttk.Label(parent, text="📊 Statistiques par dépôt:").pack(anchor='w', padx=10)
+        stats_columns = ('Runs', 'Échecs', 'Moyenne', 'p95', 'p95 push', 'Fichiers', 'Poussé')
+        self.repo_stats_tree = ttk.Treeview(parent, columns=stats_columns, show='tree headings')
+        self.repo_stats_tree.heading('#0', text='Dépôt')
+        for column in stats_columns:
+            self.repo_stats_tree.heading(column, text=column)
+            self.repo_stats_tree.column(column, width=65, anchor='center')
+        self.repo_stats_tree.tag_configure('failed', foreground='#FF4500')
+        
+        scrollbar = ttk.Scrollbar(parent, orient='vertical', command=self.repo_stats_tree.yview)
+        self.repo_stats_tree.configure(yscrollcommand=scrollbar.set)
+        self.repo_stats_tree.pack(side='left', fill='both', expand=True, padx=(10, 0), pady=5)
+        scrollbar.pack(side='right', fill='y', pady=5)
+    
+    def refresh_history(self):
+        """Recharge l'historique (requêtes indexées, exécutées directement)"""
+        self.runs_tree.delete(*self.runs_tree.get_children())
+        self.repo_stats_tree.delete(*self.repo_stats_tree.get_children())
+        try:
+            history = self.committer.get_run_history()
+            if history is None:
+                self.history_info_label.config(text="Historique désactivé (history_file)")
+                return
+            days = dict(HISTORY_PERIODS)[self.history_period_var.get()]
+            runs = history.recent_runs(HISTORY_RUNS_SHOWN)
+            statistics = history.repo_statistics(days)
+        except Exception as e:
+            self.history_info_label.config(text=f"❌ Erreur: {str(e)[:60]}")
+            return
+        
+        for run in runs:
+            self.runs_tree.insert('', 'end', text=run["started_at"].strftime("%Y-%m-%d %H:%M:%S"),
+                                  values=(f"{run['wall_time']:.1f}s", run["repositories"], run["succeeded"],
+                                          run["failed"], run["skipped"]),
+                                  tags=('failed',) if run["failed"] else ())
+        
+        # Dépôts les plus souvent en échec d'abord
+        for entry in sorted(statistics, key=lambda entry: (-entry["failed"], entry["repo"])):
+            p95_push = f"{entry['p95_push']:.2f}s" if entry["p95_push"] is not None else "-"
+            self.repo_stats_tree.insert('', 'end', text=f"📁 {entry['repo']}",
+                                        values=(entry["runs"], entry["failed"],
+                                                f"{entry['avg_duration']:.2f}s", f"{entry['p95_duration']:.2f}s",
+                                                p95_push, entry["files_changed"],
+                                                format_bytes(entry["bytes_pushed"])),
+                                        tags=('failed',) if entry["failed"] else ())
+        self.history_info_label.config(text=f"{len(statistics)} dépôts sur la période")
+    
+    def load_config_to_ui(self):
+        """Charge la configuration dans l'interface"""
+        self.update_config_widgets()
+        
+        # Actualiser la liste des dépôts
+        self.refresh_repos()
+        
+        # Charger les logs
+        self.refresh_logs()
+        
+        # Charger l'historique
+        self.refresh_history()
+    
+    def update_config_widgets(self):
+        """Affiche la configuration courante dans l'onglet Configuration"""
+        # Heures de commit
+        self.times_listbox.delete(0, tk.END)
+        for time_str in self.committer.config["commit_times"]:
+            self.times_listbox.insert(tk.END, time_str)
+        
+        # Message de commit
+        self.msg_entry.delete(0, tk.END)
+        self.msg_entry.insert(0, self.committer.config["commit_message"])
+        
+        # Auto push
+        self.auto_push_var.set(self.committer.config["auto_push"])
+        self.adaptive_var.set(self.committer.config["adaptive_schedule"])
+        
+        # Parallélisme
+        self.max_workers_var.set(self.committer.config["max_workers"])
+    
+    def add_time(self):
+        """Ajoute une nouvelle heure de commit"""
+        time_str = self.time_entry.get().strip()
+        if not time_str:
+            return
+        
+        # Validation: HH:MM, intervalle ou expression cron. La liste n'est
+        # appliquée qu'à la sauvegarde, jamais pendant un run
+        try:
+            parse_schedule_expression(time_str)
+            times = list(self.times_listbox.get(0, tk.END))
+            if time_str not in times:
+                times = sorted(times + [time_str])
+                self.times_listbox.insert(times.index(time_str), time_str)
+                self.time_entry.delete(0, tk.END)
+        except ValueError as e:
+            messagebox.showerror("Erreur", f"{e}\nExemples: 09:30, every 2h, */15 9-18 * * 1-5")
+    
+    def remove_time(self):
+        """Supprime l'heure sélectionnée"""
+        selection = self.times_listbox.curselection()
+        if selection:
+            self.times_listbox.delete(selection[0])
+    
+    def save_config(self):
+        """Sauvegarde la configuration"""
+        # Valeurs de l'interface, vérifiées avant d'être appliquées
+        config = copy.deepcopy(self.committer.config)
+        config["commit_times"] = list(self.times_listbox.get(0, tk.END))
+        config["commit_message"] = self.msg_entry.get()
+        config["auto_push"] = self.auto_push_var.get()
+        config["adaptive_schedule"] = self.adaptive_var.get()
+        try:
+            config["max_workers"] = max(1, self.max_workers_var.get())
+        except tk.TclError:
+            messagebox.showerror("Erreur", "Nombre de workers invalide.")
+            return
+        errors = validate_config(config)
+        if errors:
+            messagebox.showerror("Erreur", "❌ Configuration invalide:\n" + "\n".join(errors.values()))
+            return
+        if not self.committer.save_config(config):
+            messagebox.showerror("Erreur", "❌ Erreur lors de la sauvegarde de la configuration")
+            return
+        
+        # Comme pour le rechargement de config.json, un run en cours se termine
+        # avec sa configuration: la nouvelle est appliquée à sa fin
+        self.pending_config = config
+        if self.apply_pending_config():
+            messagebox.showinfo("Succès", "💾 Configuration sauvegardée avec succès!")
+        else:
+            messagebox.showinfo("Succès", "💾 Configuration sauvegardée, appliquée à la fin du run en cours.")
+    
+    def apply_pending_config(self):
+        """Applique la configuration sauvegardée, retentée tant qu'un run est en cours"""
+        if self.pending_config is None:
+            return True
+        if not self.committer.update_config(self.pending_config):
+            self.root.after(1000, self.apply_pending_config)
+            return False
+        self.pending_config = None
+        if self.committer.running:
+            self.update_service_status()
+        return True
+    
+    def refresh_repos(self):
+        """Actualise la liste des dépôts en arrière-plan
+        
+        Les lignes apparaissent dès la découverte terminée, puis leur statut
+        est complété au fil des git status. Une actualisation en cours est
+        annulée et remplacée.
+        """
+        if self.repo_refresh is not None:
+            self.repo_refresh.cancel()
+        
+        # Vider la liste
+        self.repos_tree.delete(*self.repos_tree.get_children())
+        self.repo_rows = {}
+        self.repos_checked = 0
+        
+        self.repo_refresh = RepositoryRefresh(self.committer, self.committer.config["max_workers"])
+        self.repo_refresh.start()
+        self.cancel_refresh_button.config(state='normal')
+        self.refresh_progress_label.config(text="🔍 Recherche des dépôts...")
+        self.root.after(100, self.poll_repo_refresh, self.repo_refresh)
+    
+    def poll_repo_refresh(self, refresh):
+        """Insère dans l'arbre les résultats reçus depuis le dernier passage"""
+        # Résultats d'une actualisation remplacée entre-temps
+        if refresh is not self.repo_refresh:
+            return
+        
+        results, done = refresh.drain()
+        for result in results:
+            if result[0] == 'repos':
+                for repo_path, repo_name in result[1]:
+                    self.repo_rows[repo_path] = self.repos_tree.insert(
+                        '', 'end', text=f"📁 {repo_name}", values=("⏳ Vérification...", ""))
+            else:
+                _, repo_path, has_changes, mod_date = result
+                status = "🔄 Changements détectés" if has_changes else "✅ À jour"
+                self.repos_tree.item(self.repo_rows[repo_path], values=(status, mod_date))
+                self.repos_checked += 1
+        
+        total = len(self.repo_rows)
+        if not done:
+            if total:
+                self.refresh_progress_label.config(text=f"🔍 {self.repos_checked}/{total} vérifiés")
+            self.root.after(100, self.poll_repo_refresh, refresh)
+            return
+        
+        self.cancel_refresh_button.config(state='disabled')
+        if refresh.cancelled.is_set():
+            for repo_path, item in self.repo_rows.items():
+                if self.repos_tree.set(item, 'Status') == "⏳ Vérification...":
+                    self.repos_tree.set(item, 'Status', "⏹️ Annulé")
+            self.refresh_progress_label.config(text=f"⏹️ Annulé ({self.repos_checked}/{total} vérifiés)")
+        elif refresh.error:
+            self.refresh_progress_label.config(text=f"❌ Erreur: {refresh.error[:80]}")
+        else:
+            self.refresh_progress_label.config(text=f"✅ {total} dépôts")
+    
+    def cancel_refresh(self):
+        """Annule l'actualisation en cours; les git status déjà lancés se terminent"""
+        if self.repo_refresh is not None:
+            self.repo_refresh.cancel()
+            self.cancel_refresh_button.config(state='disabled')
+            self.refresh_progress_label.config(text="⏹️ Annulation...")
+    
+    def refresh_logs(self):
+        """Actualise les logs (seules les nouvelles lignes sont lues)"""
+        self.log_viewer.refresh()
+    
+    def manual_commit(self):
+        """Effectue un commit manuel"""
+        if self.committer.is_run_in_progress():
+            messagebox.showwarning("Attention", "⏳ Un run est déjà en cours.")
+            return
+        
+        # Effacer les anciens statuts avant de commencer
+        self.status_monitor.clear_status()
+        
+        # Démarrer le commit dans un thread séparé pour ne pas bloquer l'UI
+        thread = threading.Thread(target=self._manual_commit_worker, daemon=True)
+        thread.start()
+    
+    def _manual_commit_worker(self):
+        """Worker pour le commit manuel"""
+        self.committer.commit_all_repositories(full_scan=True)
+        # Actualiser l'interface dans le thread principal
+        self.root.after(0, self._post_manual_commit)
+    
+    def _post_manual_commit(self):
+        """Actions post-commit manuel"""
+        self.refresh_repos()
+        self.refresh_logs()
+        messagebox.showinfo("Terminé", "✅ Commit manuel effectué. Consultez les statuts et logs pour les détails.")
+    
+    def resume_interrupted_run(self):
+        """Termine en arrière-plan les dépôts d'un run interrompu, s'il y en a un"""
+        if self.committer.has_interrupted_run():
+            thread = threading.Thread(target=self._resume_worker, daemon=True)
+            thread.start()
+    
+    def _resume_worker(self):
+        if self.committer.resume_interrupted_run() is not None:
+            self.root.after(0, self.refresh_repos)
+    
+    def clear_status(self):
+        """Efface tous les statuts du moniteur"""
+        self.status_monitor.clear_status()
+        messagebox.showinfo("Information", "🗑️ Statuts effacés.")
+    
+    def toggle_service(self):
+        """Active/désactive le service"""
+        if self.committer.running:
+            self.committer.stop_worker()
+            self.start_button.config(text="▶️ Démarrer Service")
+            self.status_var.set("🔴 Service arrêté")
+        else:
+            if not self.committer.has_schedule():
+                messagebox.showwarning("Attention", "⚠️ Aucune heure de commit configurée!")
+                return
+            
+            self.committer.start_worker()
+            self.start_button.config(text="⏸️ Arrêter Service")
+            self.update_service_status()
+    
+    def update_service_status(self):
+        """Affiche la prochaine échéance du service actif"""
+        next_run = self.committer.get_next_run()
+        if self.committer.config["adaptive_schedule"]:
+            next_text = next_run.strftime("%d/%m %H:%M") if next_run else "découverte des dépôts"
+            self.status_var.set(f"🟢 Service actif (adaptatif) - Prochaine vérification: {next_text}")
+            return
+        next_text = next_run.strftime("%d/%m %H:%M") if next_run else "aucun (planification invalide)"
+        self.status_var.set(f"🟢 Service actif - Prochain commit: {next_text}")
+    
+    def on_closing(self):
+        """Gestionnaire de fermeture de l'application"""
+        if self.committer.is_run_in_progress():
+            message = ("⏳ Un run est en cours. Les dépôts non terminés seront repris au prochain "
+                       "démarrage. Voulez-vous vraiment fermer l'application?")
+        elif self.committer.running:
+            message = "⚠️ Le service est actif. Voulez-vous vraiment fermer l'application?"
+        else:
+            message = None
+        if message is None or messagebox.askokcancel("Fermeture", message):
+            if self.committer.is_run_in_progress():
+                # Tue les processus git du run avant que la fenêtre ne disparaisse
+                self.committer.cancel_run()
+            if self.committer.running:
+                self.committer.stop_worker()
+            self.root.destroy()
+    
+    def run(self):
+        """Lance l'interface graphique"""
+        self.root.mainloop()
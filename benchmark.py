@@ -0,0 +1,314 @@
+"""Benchmarks d'Auto Git Committer sur des dépôts locaux générés
+
+Usage:
+    python benchmark.py pipeline --repos 100 --files 50 --dirty 0.3 --output results.json
+    python benchmark.py compare baseline.json results.json
+    python benchmark.py backends --repos 50 --files 20 --dirty 0.5
+    python benchmark.py exclusions --paths 200000 --pattern 'build/' --pattern '!keep.log'
+"""
+import os
+import sys
+import json
+import shutil
+import random
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import time
+from datetime import datetime
+
+from auto_git_committer import (AutoGitCommitter, PushScheduler, GIT_BACKENDS, DEFAULT_CONFIG,
+                                ExclusionMatcher, legacy_exclusion_patterns, percentile)
+
+PERCENTILES = (50, 90, 95, 99)
+
+def git(args, cwd):
+    subprocess.run(['git'] + args, cwd=cwd, check=True, capture_output=True)
+
+def write_file(path, size, rng):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(rng.randbytes(size))
+
+def create_workspace(root, repo_count, file_count, dirty_ratio, file_size, seed=0, remotes_dir=None):
+    """Crée repo_count dépôts de file_count fichiers, dont une part dirty_ratio modifiée
+    
+    Si remotes_dir est fourni, chaque dépôt reçoit un dépôt nu local comme origin.
+    """
+    rng = random.Random(seed)
+    dirty_repos = set(rng.sample(range(repo_count), int(repo_count * dirty_ratio)))
+    repositories = []
+
+    for i in range(repo_count):
+        repo_path = os.path.join(root, f"repo{i:04d}")
+        os.makedirs(repo_path)
+        git(['init', '-q'], repo_path)
+        git(['config', 'user.email', 'bench@example.com'], repo_path)
+        git(['config', 'user.name', 'bench'], repo_path)
+        for j in range(file_count):
+            write_file(os.path.join(repo_path, f"dir{j % 5}", f"file{j}.bin"), file_size, rng)
+        git(['add', '-A'], repo_path)
+        git(['commit', '-q', '-m', 'init'], repo_path)
+
+        if remotes_dir:
+            remote_path = os.path.join(remotes_dir, f"repo{i:04d}.git")
+            git(['init', '-q', '--bare', remote_path], root)
+            git(['remote', 'add', 'origin', remote_path], repo_path)
+            git(['push', '-q', '-u', 'origin', 'HEAD'], repo_path)
+
+        if i in dirty_repos:
+            # Quelques fichiers modifiés, un supprimé et un nouveau fichier
+            for j in rng.sample(range(file_count), max(1, file_count // 10)):
+                write_file(os.path.join(repo_path, f"dir{j % 5}", f"file{j}.bin"), file_size, rng)
+            if file_count > 1:
+                os.remove(os.path.join(repo_path, "dir1", "file1.bin"))
+            write_file(os.path.join(repo_path, "new", "added.bin"), file_size, rng)
+        repositories.append(repo_path)
+
+    return repositories
+
+def create_committer(workspace, **config):
+    committer = AutoGitCommitter(base_dir=workspace)
+    committer.config.update(config)
+    return committer
+
+def summarize(durations):
+    """Statistiques d'une liste de durées (secondes)"""
+    summary = {"count": len(durations), "total": sum(durations),
+               "max": max(durations) if durations else 0.0}
+    for pct in PERCENTILES:
+        summary[f"p{pct}"] = percentile(durations, pct)
+    return summary
+
+def print_summary(phases):
+    header = f"{'phase':<16} {'n':>5} {'total (s)':>10}" + "".join(f" {f'p{p} (ms)':>10}" for p in PERCENTILES)
+    print(header + f" {'max (ms)':>10}")
+    for phase, summary in phases.items():
+        line = f"{phase:<16} {summary['count']:>5} {summary['total']:>10.3f}"
+        line += "".join(f" {summary[f'p{p}'] * 1000:>10.1f}" for p in PERCENTILES)
+        print(line + f" {summary['max'] * 1000:>10.1f}")
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def benchmark_pipeline(args):
+    """Mesure découverte, status, commit et push sur des dépôts générés"""
+    root = tempfile.mkdtemp(prefix="agc-bench-")
+    try:
+        workspace = os.path.join(root, "workspace")
+        print(f"Génération de {args.repos} dépôts ({args.files} fichiers de {args.size} octets, "
+              f"{args.dirty:.0%} modifiés) avec dépôts distants locaux...")
+        create_workspace(workspace, args.repos, args.files, args.dirty, args.size, args.seed,
+                         remotes_dir=os.path.join(root, "remotes"))
+
+        committer = create_committer(workspace, git_backend=args.backend, auto_push=True,
+                                     max_workers=args.workers, push_retry_delay=0)
+        durations = {}
+
+        # Découverte: premier passage sans index, puis passages avec index
+        if os.path.exists(committer.index_file):
+            os.remove(committer.index_file)
+        _, cold = timed(committer.find_git_repositories)
+        durations["discovery_cold"] = [cold]
+        durations["discovery_warm"] = [timed(committer.find_git_repositories)[1]
+                                       for _ in range(args.iterations)]
+        repositories = committer.find_git_repositories()
+
+        durations["status"] = [timed(committer.has_changes, repo_path)[1] for repo_path in repositories]
+
+        # Commits locaux seuls (le push est différé), puis phase de push
+        scheduler = PushScheduler(committer, per_remote_limit=args.workers, retry_delay=0)
+        durations["commit"] = [timed(committer.commit_repository, repo_path, scheduler)[1]
+                               for repo_path in repositories]
+        push_results, push_wall = timed(scheduler.run, args.workers)
+        durations["push"] = [duration for _, duration in push_results.values()]
+
+        phases = {phase: summarize(values) for phase, values in durations.items()}
+        phases["push"]["wall"] = push_wall
+        print_summary(phases)
+
+        if args.output:
+            results = {
+                "timestamp": datetime.now().isoformat(timespec="seconds"),
+                "version": get_version(),
+                "platform": platform.platform(),
+                "python": platform.python_version(),
+                "params": {key: value for key, value in vars(args).items() if key != "func"},
+                "phases": phases
+            }
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump(results, f, indent=4)
+            print(f"Résultats écrits dans {args.output}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+def get_version():
+    """Commit courant du code mesuré, pour identifier les résultats"""
+    try:
+        result = subprocess.run(['git', 'describe', '--always', '--dirty'],
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                capture_output=True, text=True, check=True)
+        return result.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "inconnue"
+
+def compare_results(args):
+    """Compare deux fichiers de résultats phase par phase"""
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    with open(args.current, 'r', encoding='utf-8') as f:
+        current = json.load(f)
+
+    print(f"Référence: {baseline.get('version')} | Actuel: {current.get('version')}")
+    print(f"{'phase':<16} {'métrique':<8} {'référence':>12} {'actuel':>12} {'écart':>9}")
+    regressions = 0
+    for phase, summary in current["phases"].items():
+        reference = baseline["phases"].get(phase)
+        if reference is None:
+            continue
+        for metric in ("p50", "p95", "total"):
+            before, after = reference[metric], summary[metric]
+            delta = (after - before) / before if before else 0.0
+            flag = " !" if delta > args.threshold else ""
+            regressions += bool(flag)
+            print(f"{phase:<16} {metric:<8} {before * 1000:>10.1f}ms {after * 1000:>10.1f}ms "
+                  f"{delta:>+8.0%}{flag}")
+    return 1 if regressions else 0
+
+def benchmark_backends(args):
+    """Compare les backends git disponibles sur le même jeu de dépôts"""
+    template = tempfile.mkdtemp(prefix="agc-bench-")
+    try:
+        print(f"Génération de {args.repos} dépôts ({args.files} fichiers, {args.dirty:.0%} modifiés)...")
+        create_workspace(os.path.join(template, "workspace"), args.repos, args.files,
+                         args.dirty, args.size, args.seed)
+
+        print(f"{'backend':<12} {'status (s)':>11} {'commit (s)':>11} {'total (s)':>10}")
+        for name in GIT_BACKENDS:
+            workspace = os.path.join(template, name)
+            shutil.copytree(os.path.join(template, "workspace"), workspace, symlinks=True)
+            committer = create_committer(workspace, git_backend=name, auto_push=False,
+                                         max_workers=args.workers)
+            backend = committer.get_git_backend()
+            if backend.name != name:
+                print(f"{name:<12} indisponible")
+                continue
+
+            repositories = committer.find_git_repositories()
+            start = time.perf_counter()
+            for repo_path in repositories:
+                committer.has_changes(repo_path)
+            status_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            committer.commit_all_repositories()
+            commit_time = time.perf_counter() - start
+            print(f"{name:<12} {status_time:>11.3f} {commit_time:>11.3f} {status_time + commit_time:>10.3f}")
+    finally:
+        shutil.rmtree(template, ignore_errors=True)
+
+def generate_paths(count, rng, files_per_dir=20):
+    """Chemins relatifs réalistes: arborescence profonde, plusieurs fichiers par dossier"""
+    folders = ["src", "lib", "docs", "tests", "build", "assets", "node_modules", "__pycache__", "vendor"]
+    extensions = [".py", ".js", ".md", ".log", ".png", ".exe", ".json", ".txt", ".c", ".h"]
+    directories = [""]
+    for i in range(max(1, count // files_per_dir)):
+        parent = rng.choice(directories)
+        if parent.count('/') < 6:
+            name = rng.choice(folders) + (str(i) if rng.random() < 0.7 else "")
+            directories.append(f"{parent}{name}/")
+    return [f"{rng.choice(directories)}file{i}{rng.choice(extensions)}" for i in range(count)]
+
+def legacy_is_excluded(path, excluded_folders, excluded_files):
+    """Test d'exclusion d'origine (listes parcourues à chaque appel), comme référence"""
+    parts = path.split('/')
+    return (any(part in excluded_folders for part in parts[:-1]) or
+            parts[-1].endswith(tuple(excluded_files)))
+
+def benchmark_exclusions(args):
+    """Compare le test d'exclusion d'origine et les règles compilées sur une liste de chemins"""
+    rng = random.Random(args.seed)
+    paths = generate_paths(args.paths, rng)
+    excluded_folders = DEFAULT_CONFIG["excluded_folders"] + [f"generated{i}" for i in range(args.extra)]
+    excluded_files = DEFAULT_CONFIG["excluded_files"] + [f".ext{i}" for i in range(args.extra)]
+    patterns = legacy_exclusion_patterns(excluded_folders, excluded_files) + (args.pattern or [])
+    print(f"{len(paths)} chemins, {len(patterns)} règles")
+    
+    start = time.perf_counter()
+    legacy = [legacy_is_excluded(path, excluded_folders, excluded_files) for path in paths]
+    legacy_time = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    matcher = ExclusionMatcher(patterns)
+    compile_time = time.perf_counter() - start
+    start = time.perf_counter()
+    compiled = [matcher.is_excluded(path) for path in paths]
+    cold_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for path in paths:
+        matcher.is_excluded(path)
+    warm_time = time.perf_counter() - start
+    
+    print(f"{'méthode':<24} {'total (ms)':>11} {'ns/chemin':>10} {'exclus':>8}")
+    for name, duration, excluded in (("listes (origine)", legacy_time, legacy),
+                                     ("compilé, cache froid", cold_time, compiled),
+                                     ("compilé, cache chaud", warm_time, compiled)):
+        print(f"{name:<24} {duration * 1000:>11.1f} {duration / len(paths) * 1e9:>10.0f} {sum(excluded):>8}")
+    print(f"Compilation des règles: {compile_time * 1000:.2f} ms")
+    if not args.pattern and legacy != compiled:
+        # Sans motif supplémentaire, les deux méthodes doivent donner le même résultat
+        print("Résultats différents entre les deux méthodes")
+        return 1
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks d'Auto Git Committer")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    pipeline = subparsers.add_parser("pipeline", help="Mesure chaque phase du processus de commit")
+    pipeline.add_argument("--repos", type=int, default=100, help="Nombre de dépôts générés")
+    pipeline.add_argument("--files", type=int, default=50, help="Fichiers par dépôt")
+    pipeline.add_argument("--dirty", type=float, default=0.3, help="Part des dépôts modifiés")
+    pipeline.add_argument("--size", type=int, default=1024, help="Taille des fichiers (octets)")
+    pipeline.add_argument("--workers", type=int, default=4, help="Push simultanés")
+    pipeline.add_argument("--backend", default="subprocess", choices=list(GIT_BACKENDS))
+    pipeline.add_argument("--iterations", type=int, default=5, help="Passages de découverte avec index")
+    pipeline.add_argument("--seed", type=int, default=0)
+    pipeline.add_argument("--output", help="Fichier JSON de résultats")
+    pipeline.set_defaults(func=benchmark_pipeline)
+
+    compare = subparsers.add_parser("compare", help="Compare deux fichiers de résultats")
+    compare.add_argument("baseline", help="Résultats de référence (JSON)")
+    compare.add_argument("current", help="Résultats à comparer (JSON)")
+    compare.add_argument("--threshold", type=float, default=0.10,
+                         help="Écart relatif signalé comme régression")
+    compare.set_defaults(func=compare_results)
+
+    backends = subparsers.add_parser("backends", help="Compare les backends git")
+    backends.add_argument("--repos", type=int, default=50, help="Nombre de dépôts générés")
+    backends.add_argument("--files", type=int, default=20, help="Fichiers par dépôt")
+    backends.add_argument("--dirty", type=float, default=0.5, help="Part des dépôts modifiés")
+    backends.add_argument("--size", type=int, default=1024, help="Taille des fichiers (octets)")
+    backends.add_argument("--workers", type=int, default=1, help="Dépôts traités en parallèle")
+    backends.add_argument("--seed", type=int, default=0)
+    backends.set_defaults(func=benchmark_backends)
+
+    exclusions = subparsers.add_parser("exclusions", help="Mesure le test d'exclusion des chemins")
+    exclusions.add_argument("--paths", type=int, default=200000, help="Nombre de chemins générés")
+    exclusions.add_argument("--extra", type=int, default=20,
+                            help="Dossiers et extensions exclus ajoutés aux valeurs par défaut")
+    exclusions.add_argument("--pattern", action="append", help="Motif supplémentaire (répétable)")
+    exclusions.add_argument("--seed", type=int, default=0)
+    exclusions.set_defaults(func=benchmark_exclusions)
+    
+    args = parser.parse_args()
+    # Les logs du committer noieraient les résultats
+    logging.basicConfig(level=logging.WARNING)
+    return args.func(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
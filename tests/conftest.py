@@ -0,0 +1,40 @@
+"""Fixtures communes: dépôt git temporaire et instance du committer"""
+import subprocess
+
+import pytest
+
+import auto_git_committer as agc
+
+
+def run_git(repo_path, *args):
+    """Lance une commande git dans le dépôt et retourne sa sortie"""
+    return subprocess.run(['git', *args], cwd=repo_path, check=True,
+                          capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def git():
+    return run_git
+
+
+@pytest.fixture
+def git_repo(tmp_path):
+    """Dépôt git avec un premier commit (README.md) sur la branche main"""
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    run_git(repo, 'init', '-q', '-b', 'main')
+    run_git(repo, 'config', 'user.email', 'tests@example.com')
+    run_git(repo, 'config', 'user.name', 'Tests')
+    run_git(repo, 'config', 'commit.gpgsign', 'false')
+    (repo / "README.md").write_text("initial\n")
+    run_git(repo, 'add', 'README.md')
+    run_git(repo, 'commit', '-q', '-m', 'initial')
+    return str(repo)
+
+
+@pytest.fixture
+def committer(tmp_path):
+    """Committer dont config.json, logs et journal sont dans un dossier temporaire"""
+    base_dir = tmp_path / "base"
+    base_dir.mkdir()
+    return agc.AutoGitCommitter(base_dir=str(base_dir), console_log=False)
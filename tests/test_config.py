@@ -0,0 +1,152 @@
+"""Vérification (validate_config) et comparaison (diff_config) de la configuration"""
+import copy
+import json
+
+import pytest
+
+from auto_git_committer import (DEFAULT_CONFIG, FLOAT_KEYS, AutoGitCommitter, diff_config, read_config_file,
+                                unknown_config_keys, validate_config, validate_setting)
+
+
+def config_with(**changes):
+    config = copy.deepcopy(DEFAULT_CONFIG)
+    config.update(changes)
+    return config
+
+
+def test_default_config_is_valid():
+    assert validate_config(DEFAULT_CONFIG) == {}
+
+
+def test_missing_keys_use_defaults():
+    assert validate_config({}) == {}
+
+
+@pytest.mark.parametrize("key", ["push_max_retries", "max_workers", "discovery_depth", "log_backup_count",
+                                 "max_commit_size", "prometheus_port"])
+@pytest.mark.parametrize("value", [2.5, True, "3", None])
+def test_integer_settings_reject_other_types(key, value):
+    assert set(validate_config(config_with(**{key: value}))) == {key}
+
+
+@pytest.mark.parametrize("key", sorted(FLOAT_KEYS))
+def test_duration_settings_accept_decimals(key):
+    assert validate_setting(key, 1.5) is None
+    assert validate_setting(key, 2) is None
+    assert validate_setting(key, False) is not None
+
+
+@pytest.mark.parametrize("key, value", [
+    ("push_max_retries", -1), ("max_workers", 0), ("discovery_workers", 0), ("push_per_remote_limit", 0),
+    ("prometheus_port", 65536), ("prometheus_port", -1), ("config_reload_interval", 0), ("timeout_push", -5),
+])
+def test_out_of_range_values(key, value):
+    assert "hors limites" in validate_setting(key, value)
+
+
+@pytest.mark.parametrize("key, value", [("prometheus_port", 0), ("prometheus_port", 65535), ("max_workers", 1),
+                                        ("timeout_push", 0)])
+def test_range_bounds_are_inclusive(key, value):
+    assert validate_setting(key, value) is None
+
+
+@pytest.mark.parametrize("key, value", [
+    ("auto_push", 1), ("log_format", "xml"), ("watch_backend", "fsevents"), ("git_backend", "svn"),
+    ("excluded_folders", ["ok", 3]), ("excluded_folders", "node_modules"), ("history_file", 0),
+    ("commit_times", ["09:00", "every 0m"]), ("commit_times", ["* * *"]),
+    ("commit_message", "Commit {date"), ("commit_message", "Commit {author}"),
+    ("exclude_patterns", ["[z-a].txt"]),
+])
+def test_invalid_values(key, value):
+    assert set(validate_config(config_with(**{key: value}))) == {key}
+
+
+@pytest.mark.parametrize("roots", [
+    ["projets", {"path": "~/travail", "name": "travail", "commit_times": ["every 1h"], "auto_push": False}],
+    [],
+])
+def test_valid_workspace_roots(roots):
+    assert validate_setting("workspace_roots", roots) is None
+
+
+@pytest.mark.parametrize("roots", [
+    "projets", [""], [3], [{"name": "sans chemin"}], [{"path": "a", "name": 3}],
+    [{"path": "a", "log_format": "json"}], [{"path": "a", "max_workers": 1.5}],
+    ["a/projets", "b/projets"],
+])
+def test_invalid_workspace_roots(roots):
+    assert validate_setting("workspace_roots", roots) is not None
+
+
+def test_unknown_keys():
+    assert unknown_config_keys(config_with(max_worker=3, autopush=False)) == ["autopush", "max_worker"]
+    assert unknown_config_keys(DEFAULT_CONFIG) == []
+
+
+def test_diff_config():
+    old = config_with()
+    new = config_with(max_workers=8, commit_times=["every 1h"])
+    del new["log_compress"]
+    new["extra"] = 1
+    
+    assert diff_config(old, new) == {
+        "commit_times": (DEFAULT_CONFIG["commit_times"], ["every 1h"]),
+        "extra": (None, 1),
+        "log_compress": (True, None),
+        "max_workers": (4, 8),
+    }
+    assert diff_config(old, copy.deepcopy(old)) == {}
+
+
+def test_read_config_file_fills_defaults(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text(json.dumps({"max_workers": 2}), encoding='utf-8')
+    
+    config = read_config_file(str(config_file))
+    
+    assert config["max_workers"] == 2
+    assert config["commit_times"] == DEFAULT_CONFIG["commit_times"]
+
+
+def test_read_config_file_rejects_non_object(tmp_path):
+    config_file = tmp_path / "config.json"
+    config_file.write_text("[]", encoding='utf-8')
+    
+    with pytest.raises(ValueError):
+        read_config_file(str(config_file))
+
+
+def test_reload_rejects_invalid_config(committer):
+    with open(committer.config_file, 'w', encoding='utf-8') as f:
+        json.dump(config_with(push_max_retries=2.5, max_workers=8), f)
+    
+    assert committer.reload_config() is True
+    assert committer.config["max_workers"] == DEFAULT_CONFIG["max_workers"]
+
+
+def test_reload_applies_valid_config(committer):
+    with open(committer.config_file, 'w', encoding='utf-8') as f:
+        json.dump(config_with(max_workers=8), f)
+    
+    assert committer.reload_config() is True
+    assert committer.config["max_workers"] == 8
+
+
+def test_reload_deferred_during_run(committer):
+    with open(committer.config_file, 'w', encoding='utf-8') as f:
+        json.dump(config_with(max_workers=8), f)
+    
+    with committer.run_lock:
+        assert committer.reload_config() is False
+    assert committer.config["max_workers"] == DEFAULT_CONFIG["max_workers"]
+
+
+def test_invalid_values_replaced_at_load(tmp_path):
+    (tmp_path / "config.json").write_text(json.dumps({"push_max_retries": 2.5, "max_workers": 2}),
+                                          encoding='utf-8')
+    
+    committer = AutoGitCommitter(base_dir=str(tmp_path), console_log=False)
+    
+    assert committer.config["push_max_retries"] == DEFAULT_CONFIG["push_max_retries"]
+    assert committer.config["max_workers"] == 2
+    assert any("push_max_retries" in error for error in committer.config_errors)
@@ -0,0 +1,110 @@
+"""Règles d'exclusion (ExclusionMatcher) comparées à git check-ignore"""
+import os
+import subprocess
+
+import pytest
+
+from auto_git_committer import ExclusionMatcher
+
+TREE = [
+    "app.log", "keep.log", "src/app.py", "src/debug.log", "src/keep.log",
+    "build/out.o", "build/keep.log", "src/build/gen.c", "build.txt",
+    "dist/pkg.tar", "src/dist/pkg.tar", "docs/a/b/c.tmp", "docs/c.tmp", "c.tmp",
+    "abc", "a1c", "abbc", "src/abc/x.txt", "1file.txt", "x1.txt",
+    "cache/data", "src/deep/cache/data", "foo/bar/baz.txt", "foo.txt",
+    "logs/debug.txt", "logs/important.txt", "root.txt", "src/root.txt",
+    "sub/readme.md", "sub/deeper/readme.md", "readme.md", "node_modules/pkg/index.js",
+    "a b/c d.txt", "weird[1].txt",
+]
+
+PATTERN_SETS = [
+    ["*.log", "!keep.log"],
+    ["build/", "/dist", "docs/**/*.tmp"],
+    ["a?c", "[0-9]*.txt"],
+    ["**/cache", "foo/**"],
+    ["logs/", "!logs/important.txt"],
+    ["/root.txt", "sub/*.md"],
+    ["node_modules", "*.log", "!src/*.log", "src/debug.log"],
+    ["# commentaire", "", "a b/", "weird\\[1\\].txt"],
+    ["*", "!*.txt", "!*/"],
+    ["src/**/", "!src/build/"],
+    ["/*.txt", "src/*/x.txt", "**/build/**"],
+    ["?", "*.[ot]*", "!*.txt"],
+]
+
+
+def tree_paths():
+    """Chemins de TREE et de tous leurs dossiers, avec leur type"""
+    entries = {}
+    for path in TREE:
+        entries[path] = False
+        parts = path.split('/')
+        for depth in range(1, len(parts)):
+            entries['/'.join(parts[:depth])] = True
+    return sorted(entries.items())
+
+
+def git_ignored(repo_path, patterns, entries):
+    """Chemins que git considère ignorés avec ces motifs dans .git/info/exclude"""
+    with open(os.path.join(repo_path, '.git', 'info', 'exclude'), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(patterns) + '\n')
+    stdin = '\0'.join(path for path, _ in entries) + '\0'
+    result = subprocess.run(['git', 'check-ignore', '--no-index', '--stdin', '-z'], cwd=repo_path,
+                            input=stdin.encode('utf-8'), capture_output=True)
+    # Code 1: aucun chemin ignoré
+    assert result.returncode in (0, 1), result.stderr
+    return {path.decode('utf-8').rstrip('/') for path in result.stdout.split(b'\0') if path}
+
+
+@pytest.fixture
+def tree_repo(git_repo):
+    for path in TREE:
+        full_path = os.path.join(git_repo, *path.split('/'))
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'w', encoding='utf-8') as f:
+            f.write(path)
+    return git_repo
+
+
+@pytest.mark.parametrize("patterns", PATTERN_SETS, ids=lambda patterns: " ".join(patterns))
+def test_matches_git_check_ignore(tree_repo, patterns):
+    entries = tree_paths()
+    expected = git_ignored(tree_repo, patterns, entries)
+    matcher = ExclusionMatcher(patterns)
+    
+    excluded = {path for path, is_dir in entries if matcher.is_excluded(path, is_dir)}
+    
+    assert excluded == expected
+
+
+def test_nothing_reincluded_under_excluded_directory():
+    matcher = ExclusionMatcher(["logs/", "!logs/important.txt"])
+    
+    assert matcher.is_excluded("logs/important.txt")
+    assert not matcher.is_excluded("other/important.txt")
+
+
+def test_last_matching_rule_wins():
+    matcher = ExclusionMatcher(["!keep.log", "*.log"])
+    
+    assert matcher.is_excluded("keep.log")
+    assert not ExclusionMatcher(["*.log", "!keep.log"]).is_excluded("keep.log")
+
+
+def test_directory_only_rule_ignores_files():
+    matcher = ExclusionMatcher(["build/"])
+    
+    assert matcher.is_excluded("build", is_dir=True)
+    assert not matcher.is_excluded("build")
+    assert matcher.is_excluded("src/build/gen.c")
+
+
+def test_directory_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(ExclusionMatcher, "CACHE_SIZE", 10)
+    matcher = ExclusionMatcher(["tmp/"])
+    
+    for index in range(50):
+        matcher.is_excluded(f"dir{index}/file.txt")
+    
+    assert len(matcher.dir_cache) <= 10
+    assert matcher.is_excluded("a/tmp/file.txt")
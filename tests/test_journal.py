@@ -0,0 +1,147 @@
+"""Journal des runs (RunJournal) et reprise d'un run interrompu"""
+import json
+import os
+import time
+
+import pytest
+
+from auto_git_committer import RunJournal
+
+
+def write_journal(journal_file, started_at, phases, finished=False):
+    """Écrit le journal d'un run: dépôts dans l'ordre de phases, puis leurs transitions"""
+    with open(journal_file, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({"event": "start", "time": started_at, "repos": list(phases)}) + "\n")
+        for repo_path, phase in phases.items():
+            if phase != "pending":
+                f.write(json.dumps({"repo": repo_path, "phase": phase}) + "\n")
+        if finished:
+            f.write(json.dumps({"event": "end", "time": time.time()}) + "\n")
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return RunJournal(str(tmp_path / "run_journal.jsonl"))
+
+
+def test_no_journal_file(journal):
+    assert journal.load_interrupted() is None
+
+
+def test_finished_run_is_not_interrupted(journal):
+    journal.begin(["/a", "/b"])
+    journal.record("/a", "add")
+    journal.record("/a", "done")
+    journal.finish()
+    
+    assert journal.load_interrupted() is None
+    assert journal.interrupted_started_at is None
+
+
+def test_interrupted_run_keeps_last_phase(journal):
+    journal.begin(["/a", "/b", "/c"])
+    journal.record("/a", "add")
+    journal.record("/a", "commit")
+    journal.record("/b", "committed")
+    journal.close()
+    
+    assert journal.load_interrupted() == {"/a": "commit", "/b": "committed", "/c": "pending"}
+    assert journal.interrupted_started_at is not None
+
+
+def test_truncated_last_line_is_ignored(journal):
+    journal.begin(["/a"])
+    journal.record("/a", "add")
+    journal.close()
+    with open(journal.journal_file, 'a', encoding='utf-8') as f:
+        f.write('{"repo": "/a", "pha')
+    
+    assert journal.load_interrupted() == {"/a": "add"}
+
+
+def test_new_run_replaces_previous_journal(journal):
+    journal.begin(["/a"])
+    journal.close()
+    journal.begin(["/b"])
+    journal.finish()
+    
+    assert journal.load_interrupted() is None
+
+
+@pytest.fixture
+def interrupted(committer, git_repo, tmp_path, git):
+    """Journal d'un run interrompu il y a une heure, sur des copies du dépôt de test"""
+    repos = {}
+    for name in ("staging", "committed", "done", "pending"):
+        clone = str(tmp_path / name)
+        git(tmp_path, 'clone', '-q', git_repo, clone)
+        repos[name] = clone
+    phases = {repos["staging"]: "add", repos["committed"]: "committed", repos["done"]: "done",
+              repos["pending"]: "pending", str(tmp_path / "removed"): "add"}
+    write_journal(committer.get_run_journal().journal_file, time.time() - 3600, phases)
+    return repos
+
+
+def test_recover_sorts_unfinished_repositories(committer, interrupted):
+    to_commit, to_push = committer.recover_interrupted_run()
+    
+    assert sorted(to_commit) == sorted([interrupted["staging"], interrupted["pending"]])
+    assert to_push == [interrupted["committed"]]
+
+
+def test_recover_skips_pushes_when_auto_push_disabled(committer, interrupted):
+    committer.config["auto_push"] = False
+    
+    _, to_push = committer.recover_interrupted_run()
+    
+    assert to_push == []
+
+
+def test_recover_resets_partial_staging(committer, interrupted, git):
+    repo_path = interrupted["staging"]
+    with open(os.path.join(repo_path, "new.txt"), 'w') as f:
+        f.write("new\n")
+    git(repo_path, 'add', 'new.txt')
+    
+    committer.recover_interrupted_run()
+    
+    # L'index est vidé, le fichier de travail reste en place
+    assert git(repo_path, 'status', '--porcelain') == "?? new.txt\n"
+
+
+def lock_index(repo_path, age):
+    lock_file = os.path.join(repo_path, '.git', 'index.lock')
+    open(lock_file, 'w').close()
+    locked_at = time.time() - age
+    os.utime(lock_file, (locked_at, locked_at))
+    return lock_file
+
+
+def test_recover_removes_lock_left_by_interrupted_run(committer, interrupted):
+    lock_file = lock_index(interrupted["staging"], age=1800)
+    
+    committer.recover_interrupted_run()
+    
+    assert not os.path.exists(lock_file)
+
+
+@pytest.mark.parametrize("age", [
+    # Trop récent: une commande git peut encore le détenir
+    10,
+    # Antérieur au run interrompu
+    7200,
+])
+def test_recover_keeps_lock_it_cannot_attribute(committer, interrupted, age):
+    lock_file = lock_index(interrupted["staging"], age)
+    
+    committer.recover_interrupted_run()
+    
+    assert os.path.exists(lock_file)
+
+
+def test_lock_of_repository_outside_staging_is_kept(committer, interrupted):
+    lock_file = lock_index(interrupted["pending"], age=1800)
+    
+    committer.recover_interrupted_run()
+    
+    assert os.path.exists(lock_file)
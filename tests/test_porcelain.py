@@ -0,0 +1,82 @@
+"""Lecture de git status --porcelain=v2 -z (SubprocessGitBackend.parse_status)"""
+import io
+import os
+
+from auto_git_committer import FileChange
+
+
+class FakeProcess:
+    """Processus git simulé: sortie standard fournie d'avance"""
+    
+    def __init__(self, stdout):
+        self.stdout = io.BytesIO(stdout)
+        self.stderr = io.BytesIO(b'')
+    
+    def wait(self):
+        return 0
+
+
+def status(committer, repo_path):
+    return sorted(committer.get_git_backend().iter_status(repo_path))
+
+
+def test_clean_repository(committer, git_repo):
+    assert status(committer, git_repo) == []
+
+
+def test_modified_deleted_and_untracked(committer, git_repo, git):
+    with open(os.path.join(git_repo, "kept.txt"), 'w') as f:
+        f.write("kept\n")
+    git(git_repo, 'add', 'kept.txt')
+    git(git_repo, 'commit', '-q', '-m', 'kept')
+    with open(os.path.join(git_repo, "README.md"), 'a') as f:
+        f.write("modified\n")
+    os.remove(os.path.join(git_repo, "kept.txt"))
+    os.makedirs(os.path.join(git_repo, "new dir", "sub"))
+    with open(os.path.join(git_repo, "new dir", "sub", "a file.txt"), 'w') as f:
+        f.write("new\n")
+    
+    assert status(committer, git_repo) == [
+        FileChange('1', '.D', 'kept.txt', None),
+        FileChange('1', '.M', 'README.md', None),
+        FileChange('?', '??', 'new dir/sub/a file.txt', None),
+    ]
+
+
+def test_staged_rename_keeps_original_path(committer, git_repo, git):
+    git(git_repo, 'mv', 'README.md', 'renamed with spaces.md')
+    
+    assert status(committer, git_repo) == [
+        FileChange('2', 'R.', 'renamed with spaces.md', 'README.md')
+    ]
+
+
+def test_staged_deletion(committer, git_repo, git):
+    git(git_repo, 'rm', '-q', 'README.md')
+    
+    assert status(committer, git_repo) == [FileChange('1', 'D.', 'README.md', None)]
+
+
+def test_records_split_across_reads(committer):
+    # Un renommage (deux enregistrements) à cheval sur la limite de lecture de 64 Kio
+    padding = []
+    while sum(len(record) + 1 for record in padding) < 64 * 1024 - 40:
+        padding.append(f"? {'x' * 100}{len(padding)}".encode())
+    rename = b"2 R. N... 100644 100644 100644 0123 4567 R100 nouveau.txt"
+    stdout = b'\0'.join(padding + [rename, b"ancien.txt", b"? fin.txt"]) + b'\0'
+    assert stdout.index(rename) < 64 * 1024 < stdout.index(b"ancien.txt")
+    process = FakeProcess(stdout)
+    
+    changes = list(committer.get_git_backend().parse_status(process))
+    
+    assert len(changes) == len(padding) + 2
+    assert changes[-2] == FileChange('2', 'R.', 'nouveau.txt', 'ancien.txt')
+    assert changes[-1] == FileChange('?', '??', 'fin.txt', None)
+
+
+def test_undecodable_path_is_preserved(committer):
+    process = FakeProcess(b"? caf\xe9.txt\0")
+    
+    change, = committer.get_git_backend().parse_status(process)
+    
+    assert change.path.encode('utf-8', errors='surrogateescape') == b"caf\xe9.txt"
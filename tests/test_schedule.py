@@ -0,0 +1,103 @@
+"""Expressions de commit_times (parse_schedule_expression) et CommitScheduler"""
+from datetime import datetime, timedelta
+
+import pytest
+
+from auto_git_committer import (CommitScheduler, CronSchedule, DailySchedule, IntervalSchedule,
+                                parse_schedule_expression)
+
+# Vendredi 17 octobre 2025
+FRIDAY = datetime(2025, 10, 17, 12, 0)
+
+
+def test_daily_schedule():
+    schedule = parse_schedule_expression(" 09:30 ")
+    
+    assert isinstance(schedule, DailySchedule)
+    assert schedule.next_after(FRIDAY.replace(hour=8)) == datetime(2025, 10, 17, 9, 30)
+    # Échéance atteinte: la suivante est le lendemain
+    assert schedule.next_after(datetime(2025, 10, 17, 9, 30)) == datetime(2025, 10, 18, 9, 30)
+
+
+@pytest.mark.parametrize("expression, seconds", [
+    ("every 45s", 45), ("every 30m", 1800), ("Every 2H", 7200), ("every 1d", 86400)
+])
+def test_interval_units(expression, seconds):
+    schedule = parse_schedule_expression(expression)
+    
+    assert isinstance(schedule, IntervalSchedule)
+    assert schedule.interval == timedelta(seconds=seconds)
+
+
+def test_interval_is_aligned_on_anchor():
+    schedule = IntervalSchedule("every 30m", anchor=FRIDAY)
+    
+    assert schedule.next_after(FRIDAY - timedelta(hours=1)) == FRIDAY + timedelta(minutes=30)
+    assert schedule.next_after(FRIDAY) == FRIDAY + timedelta(minutes=30)
+    assert schedule.next_after(FRIDAY + timedelta(minutes=75)) == FRIDAY + timedelta(minutes=90)
+
+
+def test_cron_steps_and_ranges():
+    schedule = parse_schedule_expression("*/15 9-18 * * 1-5")
+    
+    assert isinstance(schedule, CronSchedule)
+    assert schedule.next_after(FRIDAY.replace(minute=1)) == FRIDAY.replace(minute=15)
+    # Après la dernière échéance du vendredi, la suivante est lundi à 9h
+    assert schedule.next_after(FRIDAY.replace(hour=18, minute=45)) == datetime(2025, 10, 20, 9, 0)
+
+
+def test_cron_day_of_month_or_weekday():
+    # Comme cron: le 13 du mois OU un vendredi
+    schedule = parse_schedule_expression("0 0 13 * 5")
+    
+    assert schedule.next_after(datetime(2025, 10, 11)) == datetime(2025, 10, 13)
+    assert schedule.next_after(datetime(2025, 10, 13, 1)) == datetime(2025, 10, 17)
+
+
+def test_cron_sunday_as_zero_or_seven():
+    for expression in ("30 8 * * 0", "30 8 * * 7"):
+        assert parse_schedule_expression(expression).next_after(FRIDAY) == datetime(2025, 10, 19, 8, 30)
+
+
+def test_cron_month_rollover():
+    schedule = parse_schedule_expression("0 6 1 1 *")
+    
+    assert schedule.next_after(FRIDAY) == datetime(2026, 1, 1, 6, 0)
+
+
+@pytest.mark.parametrize("expression", [
+    "25:00", "9h", "every 0m", "every 10x", "every m", "every",
+    "60 * * * *", "* * 0 * *", "*/0 * * * *", "5-1 * * * *", "a * * * *",
+    "0 0 31 2 *",
+])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        parse_schedule_expression(expression)
+
+
+def test_set_entries_keeps_pending_due_times():
+    scheduler = CommitScheduler(lambda due: None)
+    interval = IntervalSchedule("every 1h", anchor=datetime.now() - timedelta(minutes=50))
+    daily = parse_schedule_expression("12:00")
+    scheduler.set_entries([interval])
+    due = scheduler.next_due[interval]
+    
+    scheduler.set_entries([interval, daily])
+    
+    assert scheduler.next_due[interval] == due
+    assert daily in scheduler.next_due
+    assert scheduler.next_run() == min(due, scheduler.next_due[daily])
+
+
+def test_reload_reuses_unchanged_entries(committer):
+    committer.config["commit_times"] = ["every 1h", "12:00"]
+    committer.scheduler = CommitScheduler(committer.run_scheduled)
+    committer.setup_schedule()
+    interval, daily = committer.scheduler.entries
+    
+    committer.config["commit_times"] = ["every 1h", "13:00"]
+    committer.setup_schedule()
+    
+    assert committer.scheduler.entries[0] is interval
+    assert committer.scheduler.entries[1] is not daily
+    assert committer.schedule_roots[interval] == [""]
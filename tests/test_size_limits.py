@@ -0,0 +1,133 @@
+"""Limites de taille avant l'indexation (apply_size_limits)"""
+import os
+
+import pytest
+
+from auto_git_committer import FileChange
+
+
+@pytest.fixture
+def limited(committer):
+    committer.config.update(max_file_size=1000, max_binary_file_size=500, max_commit_size=2500,
+                            large_files_lfs=False)
+    return committer
+
+
+def write_files(repo_path, sizes, binary=()):
+    """Crée les fichiers non suivis demandés et retourne leurs FileChange, dans l'ordre"""
+    changes = []
+    for path, size in sizes:
+        content = b'\0' * size if path in binary else b'x' * size
+        with open(os.path.join(repo_path, path), 'wb') as f:
+            f.write(content)
+        changes.append(FileChange('?', '??', path, None))
+    return changes
+
+
+def paths(changes):
+    return [change.path for change in changes]
+
+
+def skipped_reasons(skipped):
+    return [(entry.change.path, entry.size, entry.reason, entry.deferred) for entry in skipped]
+
+
+def test_files_within_limits_are_kept(limited, git_repo):
+    changes = write_files(git_repo, [("a.txt", 100), ("b.txt", 200)])
+    
+    selected, skipped = limited.apply_size_limits(git_repo, changes)
+    
+    assert paths(selected) == ["a.txt", "b.txt"]
+    assert skipped == []
+
+
+def test_large_and_binary_files_are_skipped(limited, git_repo):
+    changes = write_files(git_repo, [("big.txt", 1500), ("text.txt", 800), ("image.bin", 800)],
+                          binary={"image.bin"})
+    
+    selected, skipped = limited.apply_size_limits(git_repo, changes)
+    
+    assert paths(selected) == ["text.txt"]
+    assert skipped_reasons(skipped) == [
+        ("big.txt", 1500, "trop volumineux", False),
+        ("image.bin", 800, "binaire trop volumineux", False),
+    ]
+
+
+def test_commit_budget_defers_later_files(limited, git_repo):
+    changes = write_files(git_repo, [("a.txt", 900), ("b.txt", 900), ("c.txt", 900), ("d.txt", 100)])
+    
+    selected, skipped = limited.apply_size_limits(git_repo, changes)
+    
+    # Ordre de git status conservé; un petit fichier passe encore après un report
+    assert paths(selected) == ["a.txt", "b.txt", "d.txt"]
+    assert skipped_reasons(skipped) == [("c.txt", 900, "budget du commit atteint", True)]
+
+
+def test_first_file_may_exceed_budget_alone(limited, git_repo):
+    limited.config["max_commit_size"] = 500
+    changes = write_files(git_repo, [("a.txt", 900), ("b.txt", 10)])
+    
+    selected, skipped = limited.apply_size_limits(git_repo, changes)
+    
+    assert paths(selected) == ["a.txt"]
+    assert skipped_reasons(skipped) == [("b.txt", 10, "budget du commit atteint", True)]
+
+
+def test_deletions_and_conflicts_do_not_count(limited, git_repo):
+    limited.config["max_commit_size"] = 100
+    changes = write_files(git_repo, [("a.txt", 100)])
+    os.remove(os.path.join(git_repo, "README.md"))
+    changes += [FileChange('1', '.D', 'README.md', None), FileChange('u', 'UU', 'conflict.txt', None)]
+    
+    selected, skipped = limited.apply_size_limits(git_repo, changes)
+    
+    assert paths(selected) == ["a.txt", "README.md", "conflict.txt"]
+    assert skipped == []
+
+
+def test_limits_disabled_with_zero(limited, git_repo):
+    limited.config.update(max_file_size=0, max_binary_file_size=0, max_commit_size=0)
+    changes = write_files(git_repo, [("big.bin", 5000), ("other.txt", 5000)], binary={"big.bin"})
+    
+    selected, skipped = limited.apply_size_limits(git_repo, changes)
+    
+    assert paths(selected) == ["big.bin", "other.txt"]
+    assert skipped == []
+
+
+def test_lfs_files_count_against_budget(limited, git_repo, monkeypatch):
+    limited.config["large_files_lfs"] = True
+    monkeypatch.setattr(limited, "is_lfs_available", lambda: True)
+    routed = []
+    monkeypatch.setattr(limited, "track_with_lfs", lambda repo_path, changes: (routed.extend(changes) or changes, []))
+    changes = write_files(git_repo, [("big1.dat", 2000), ("big2.dat", 2000), ("small.txt", 400)])
+    
+    selected, skipped = limited.apply_size_limits(git_repo, changes)
+    
+    assert paths(routed) == ["big1.dat"]
+    assert paths(selected) == ["small.txt", "big1.dat"]
+    assert skipped_reasons(skipped) == [("big2.dat", 2000, "budget du commit atteint", True)]
+
+
+def test_lfs_failure_reports_computed_size(limited, git_repo, monkeypatch):
+    limited.config["large_files_lfs"] = True
+    monkeypatch.setattr(limited, "is_lfs_available", lambda: True)
+    monkeypatch.setattr(limited, "track_with_lfs", lambda repo_path, changes: ([], changes))
+    changes = write_files(git_repo, [("big.dat", 2000), ("small.txt", 100)])
+    
+    selected, skipped = limited.apply_size_limits(git_repo, changes)
+    
+    assert paths(selected) == ["small.txt"]
+    assert skipped_reasons(skipped) == [("big.dat", 2000, "LFS indisponible", False)]
+
+
+def test_large_files_skipped_without_lfs_do_not_use_budget(limited, git_repo, monkeypatch):
+    limited.config["large_files_lfs"] = True
+    monkeypatch.setattr(limited, "is_lfs_available", lambda: False)
+    changes = write_files(git_repo, [("big.dat", 3000), ("small.txt", 100)])
+    
+    selected, skipped = limited.apply_size_limits(git_repo, changes)
+    
+    assert paths(selected) == ["small.txt"]
+    assert skipped_reasons(skipped) == [("big.dat", 3000, "trop volumineux", False)]